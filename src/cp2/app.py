@@ -149,7 +149,7 @@ class ColorPickerApp(wal.Application, UCApplication):
         LOG.info('Palette reloaded from scratch')
 
     def _normalize_colors(self, doc):
-        doc.model.colors = [self.default_cms.get_rgb_color(color)
+        doc.model.colors = [self.default_cms.get_rgb_color(color).to_list()
                             for color in doc.model.colors]
 
     def _get_doc_form_file(self, filepath=None, win=None, title=None):
@@ -20,7 +20,9 @@ import os
 from uc2 import uc2const
 from uc2.uc2const import COLOR_DISPLAY
 
-from uc2.cms import ColorManager, CS, libcms, val_255
+from uc2.cms import ColorManager, CS, ProfileRegistry
+from uc2.cms.cache import TRANSFORM_CACHE
+from uc2.cms.catalog import update_app_profiles
 from cp2 import config, events
 
 
@@ -31,6 +33,8 @@ class AppColorManager(ColorManager):
     def __init__(self, app):
         self.app = app
         self.color_mngrs = []
+        if config.cms_profile_catalog:
+            update_app_profiles(config, app.appdata.app_config_dir)
         ColorManager.__init__(self)
         events.connect(events.CONFIG_MODIFIED, self.config_changed)
 
@@ -44,7 +48,7 @@ class AppColorManager(ColorManager):
             self.app.current_doc.canvas.force_redraw()
 
     def update(self):
-        self.handles = {}
+        self.handles = ProfileRegistry()
         self.clear_transforms()
         profiles = [config.cms_rgb_profile,
                     config.cms_cmyk_profile,
@@ -59,18 +63,13 @@ class AppColorManager(ColorManager):
         index = 0
         profile_dir = self.app.appdata.app_color_profile_dir
         for item in CS + [COLOR_DISPLAY, ]:
-            path = None
             profile = profiles[index]
             if profile and profile in profile_dicts[index]:
                 profile_filename = profile_dicts[index][profile]
                 path = os.path.join(profile_dir, profile_filename)
-            if path:
-                self.handles[item] = libcms.cms_open_profile_from_file(path)
+                self.handles.register(item, path)
             else:
-                profile_dir = self.app.appdata.app_color_profile_dir
-                filename = 'built-in_%s.icm' % item
-                path = os.path.join(profile_dir, filename)
-                self.handles[item] = libcms.cms_open_profile_from_file(path)
+                self.handles.register_default(item)
             index += 1
         self.use_cms = config.cms_use
         self.use_display_profile = config.cms_use_display_profile
@@ -81,8 +80,17 @@ class AppColorManager(ColorManager):
         self.alarm_codes = config.cms_alarmcodes
         self.gamutcheck = config.cms_gamutcheck
         if self.gamutcheck:
-            libcms.cms_set_alarm_codes(*val_255(self.alarm_codes))
+            self.apply_alarm_codes()
         self.proof_for_spot = config.cms_proof_for_spot
+        self.bitmap_workers = config.cms_bitmap_workers
+        self.precision = config.cms_precision
+        TRANSFORM_CACHE.set_maxsize(config.cms_transform_cache_size)
+        if config.cms_devicelink_cache:
+            path = os.path.join(self.app.appdata.app_config_dir, 'devicelinks')
+            TRANSFORM_CACHE.set_disk_cache(
+                path, config.cms_devicelink_cache_size)
+        else:
+            TRANSFORM_CACHE.set_disk_cache()
         if self.proofing:
             self.flags = self.flags | uc2const.cmsFLAGS_SOFTPROOFING
         if self.gamutcheck:
@@ -102,7 +110,7 @@ class AppColorManager(ColorManager):
     def apply_cm_settings(self, cm):
         if self.use_display_profile:
             cm.use_display_profile = True
-            cm.handles[COLOR_DISPLAY] = self.handles[COLOR_DISPLAY]
+            cm.handles.link(COLOR_DISPLAY, self.handles)
         else:
             cm.use_display_profile = False
         cm.use_cms = self.use_cms
@@ -111,8 +119,12 @@ class AppColorManager(ColorManager):
         cm.flags = self.flags
         cm.alarm_codes = self.alarm_codes
         cm.gamutcheck = self.gamutcheck
+        if cm.gamutcheck and cm.context is not None:
+            cm.apply_alarm_codes()
         cm.proofing = self.proofing
         cm.proof_for_spot = self.proof_for_spot
+        cm.bitmap_workers = self.bitmap_workers
+        cm.precision = self.precision
         cm.clear_transforms()
 
     def update_mngrs(self):
@@ -522,7 +522,7 @@ class ColorGrid(CanvasObj):
             self.change_color(self.canvas.selection[0])
 
     def change_color(self, cell):
-        clr0 = [] + cell.color[1]
+        clr0 = list(cell.color[1])
         clr = wal.color_dialog(self.canvas.mw, _('Change color'), clr0)
         if clr and clr0 != clr:
             color = [uc2const.COLOR_RGB, clr, 1.0, cell.color[3], '']
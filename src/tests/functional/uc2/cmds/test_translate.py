@@ -0,0 +1,76 @@
+from uc2 import uc2const
+from uc2.cmds import convert
+from uc2.formats import get_loader, is_lossless_transcoding, iter_colors, \
+    open_palette_writer, transcode
+
+
+def write_palette(path, colors):
+    with open_palette_writer(path) as writer:
+        writer.palette_name = 'Test palette'
+        writer.write_colors(colors)
+
+
+def read_data(path):
+    with open(path, 'rb') as fileptr:
+        return fileptr.read()
+
+
+def test_lossless_transcoding():
+    assert is_lossless_transcoding(uc2const.ASE, uc2const.ACO)
+    assert is_lossless_transcoding(uc2const.GPL, uc2const.JCW)
+    assert not is_lossless_transcoding(uc2const.ACO, uc2const.GPL)
+    assert not is_lossless_transcoding(uc2const.SK2, uc2const.ACO)
+
+
+def test_transcode(tmp_path, appdata, palette_colors):
+    src = str(tmp_path / 'palette.ase')
+    write_palette(src, palette_colors)
+    dst = str(tmp_path / 'palette.gpl')
+    assert transcode(src, dst) == len(palette_colors)
+    doc = get_loader(dst)(appdata, dst, convert=True)
+    assert doc.model.name == 'palette'
+    assert [item[3] for item in doc.model.colors] == \
+        [item[3] for item in palette_colors]
+    doc.close()
+
+
+def test_convert_transcoding(tmp_path, appdata, palette_colors):
+    src = str(tmp_path / 'palette.ase')
+    write_palette(src, palette_colors)
+    for fid in uc2const.BARE_PALETTES:
+        ext = uc2const.FORMAT_EXTENSION[fid][0]
+        direct = str(tmp_path / ('direct.' + ext))
+        convert(appdata, (src, direct), {})
+        models = str(tmp_path / ('models.' + ext))
+        convert(appdata, (src, models), {'transcode': False})
+        assert read_data(direct) == read_data(models)
+
+
+def test_convert_jcw_non_latin_names(tmp_path, appdata, palette_colors):
+    colors = [list(item) for item in palette_colors]
+    colors[0][3] = u'Красный цвет очень длинного названия'
+    colors[1][3] = u'Grün'
+    src = str(tmp_path / 'palette.ase')
+    write_palette(src, colors)
+    direct = str(tmp_path / 'direct.jcw')
+    convert(appdata, (src, direct), {})
+    models = str(tmp_path / 'models.jcw')
+    convert(appdata, (src, models), {'transcode': False})
+    assert read_data(direct) == read_data(models)
+    assert [item[3] for item in iter_colors(models)][1] == u'Grün'
+
+
+def test_convert_forced_transcoding(tmp_path, appdata, palette_colors):
+    src = str(tmp_path / 'palette.ase')
+    write_palette(src, palette_colors)
+    dst = str(tmp_path / 'palette.skp')
+    convert(appdata, (src, dst), {'transcode': True})
+    assert list(iter_colors(dst)) == list(iter_colors(src))
+
+
+def test_convert_format_option(tmp_path, appdata, palette_colors):
+    src = str(tmp_path / 'palette.ase')
+    write_palette(src, palette_colors)
+    dst = str(tmp_path / 'palette.txt')
+    convert(appdata, (src, dst), {'format': 'GPL'})
+    assert get_loader(dst, return_id=True)[1] == uc2const.GPL
@@ -0,0 +1,232 @@
+import os
+import threading
+
+from uc2 import uc2const
+from uc2.cms import ProfileRegistry, libcms
+from uc2.cms.cache import TRANSFORM_CACHE, TransformCache, \
+    get_file_profile_id, get_header_profile_id, get_transform_key
+
+_pkgdir = os.path.abspath(os.path.dirname(__file__))
+
+
+def get_filepath(filename):
+    return os.path.join(_pkgdir, 'cms_data', filename)
+
+
+def get_profiles():
+    return (libcms.cms_open_profile_from_file(get_filepath('sRGB.icm')),
+            libcms.cms_open_profile_from_file(get_filepath('GenericCMYK.icm')))
+
+
+def test_transform_is_shared_between_profile_handles():
+    cache = TransformCache()
+    rgb, cmyk = get_profiles()
+    transform = cache.get_transform(
+        rgb, uc2const.TYPE_RGBA_8, cmyk, uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_PERCEPTUAL, uc2const.cmsFLAGS_NOTPRECALC)
+    rgb, cmyk = get_profiles()
+    assert transform is cache.get_transform(
+        rgb, uc2const.TYPE_RGBA_8, cmyk, uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_PERCEPTUAL, uc2const.cmsFLAGS_NOTPRECALC)
+    assert transform is not cache.get_transform(
+        rgb, uc2const.TYPE_RGBA_8, cmyk, uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_SATURATION, uc2const.cmsFLAGS_NOTPRECALC)
+    assert 1 == cache.hits
+    assert 2 == cache.misses
+
+
+def test_lru_eviction():
+    cache = TransformCache(2)
+    rgb, cmyk = get_profiles()
+    for intent in (0, 1, 0, 2):
+        cache.get_transform(rgb, uc2const.TYPE_RGBA_8,
+                            cmyk, uc2const.TYPE_CMYK_8, intent, 0)
+    assert 2 == len(cache)
+    cache.get_transform(rgb, uc2const.TYPE_RGBA_8,
+                        cmyk, uc2const.TYPE_CMYK_8, 0, 0)
+    assert 2 == cache.hits
+
+
+def test_devicelink_cache(tmp_path):
+    rgb, cmyk = get_profiles()
+    colors = [[0, 0, 0, 0], [255, 255, 255, 0], [100, 190, 150, 0]]
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path))
+    transform = cache.get_transform(
+        rgb, uc2const.TYPE_RGBA_8, cmyk, uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_PERCEPTUAL, 0)
+    assert 1 == len(os.listdir(str(tmp_path)))
+
+    key = get_transform_key(
+        libcms.cms_get_profile_id(rgb), uc2const.TYPE_RGBA_8,
+        libcms.cms_get_profile_id(cmyk), uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_PERCEPTUAL, 0)
+    loaded = TransformCache().load(key, uc2const.TYPE_RGBA_8,
+                                   uc2const.TYPE_CMYK_8, 0)
+    assert loaded is None
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path))
+    loaded = cache.load(key, uc2const.TYPE_RGBA_8, uc2const.TYPE_CMYK_8, 0)
+    assert loaded is not None
+    expected = libcms.cms_do_transform_many(transform, colors)
+    result = libcms.cms_do_transform_many(loaded, colors)
+    for vals0, vals1 in zip(expected, result):
+        assert all(abs(x - y) <= 1 for x, y in zip(vals0, vals1))
+
+
+def test_devicelink_cache_stores_not_precalculated_transforms(tmp_path):
+    rgb, cmyk = get_profiles()
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path))
+    cache.get_transform(
+        rgb, uc2const.TYPE_RGBA_8, cmyk, uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_PERCEPTUAL, uc2const.cmsFLAGS_NOTPRECALC)
+    assert 1 == len(os.listdir(str(tmp_path)))
+
+
+def test_devicelink_cache_skips_gamut_check_transforms(tmp_path):
+    rgb, cmyk = get_profiles()
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path))
+    cache.get_transform(
+        rgb, uc2const.TYPE_RGBA_8, cmyk, uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_PERCEPTUAL, uc2const.cmsFLAGS_GAMUTCHECK)
+    assert not os.listdir(str(tmp_path))
+
+
+def test_file_profile_id():
+    path = get_filepath('sRGB.icm')
+    profile_id = get_file_profile_id(path)
+    assert profile_id == get_file_profile_id(path)
+    with open(path, 'rb') as fileptr:
+        header_id = get_header_profile_id(fileptr.read())
+    if header_id is None:
+        assert os.path.abspath(path) == profile_id[1]
+    else:
+        assert header_id == profile_id
+
+
+def get_registry_transform(cache, registry):
+    return cache.get_transform(
+        registry.get_profile(uc2const.COLOR_RGB), uc2const.TYPE_RGBA_8,
+        registry.get_profile(uc2const.COLOR_CMYK), uc2const.TYPE_CMYK_8,
+        uc2const.INTENT_PERCEPTUAL, uc2const.cmsFLAGS_NOTPRECALC,
+        profile_ids=(registry.get_id(uc2const.COLOR_RGB),
+                     registry.get_id(uc2const.COLOR_CMYK)))
+
+
+def test_devicelink_cache_hit_opens_no_profiles(tmp_path):
+    registry = ProfileRegistry()
+    registry.register(uc2const.COLOR_RGB, get_filepath('sRGB.icm'))
+    registry.register(uc2const.COLOR_CMYK, get_filepath('GenericCMYK.icm'))
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path))
+    get_registry_transform(cache, registry)
+    assert 2 == len(registry.get_used())
+
+    # new process: empty in-memory cache and not opened profiles
+    registry.register(uc2const.COLOR_RGB, get_filepath('sRGB.icm'))
+    registry.register(uc2const.COLOR_CMYK, get_filepath('GenericCMYK.icm'))
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path))
+    transform = get_registry_transform(cache, registry)
+    assert [] == registry.get_used()
+    out = libcms.cms_do_transform_many(transform, [[255, 0, 0, 0]])
+    assert out[0][1] > 200
+
+
+def test_app_color_manager_stores_devicelinks_by_default(app):
+    app.config.cms_devicelink_cache = True
+    cms = app.default_cms
+    cms.update()
+    assert cms.flags & uc2const.cmsFLAGS_NOTPRECALC
+    cms.get_cmyk_color([uc2const.COLOR_RGB, [1.0, 0.0, 0.0], 1.0, ''])
+    TRANSFORM_CACHE.set_disk_cache()
+    path = os.path.join(app.appdata.app_config_dir, 'devicelinks')
+    assert os.listdir(path)
+
+
+def test_transforms_are_built_concurrently():
+    cache = TransformCache()
+    barrier = threading.Barrier(2, timeout=5)
+    results = {}
+
+    def factory():
+        # fails if other transform is not built at the same time
+        barrier.wait()
+        return object()
+
+    def build(key):
+        results[key] = cache.build(key, uc2const.TYPE_RGB_8,
+                                   uc2const.TYPE_CMYK_8, 0, factory)
+
+    threads = [threading.Thread(target=build, args=(key,))
+               for key in ('first', 'second')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 2 == len(set(map(id, results.values())))
+    assert results['first'] is cache.get('first')
+
+
+def test_transform_is_built_once_for_waiting_threads():
+    cache = TransformCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def factory():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    def build():
+        results.append(cache.build('key', uc2const.TYPE_RGB_8,
+                                   uc2const.TYPE_CMYK_8, 0, factory))
+
+    threads = [threading.Thread(target=build) for _i in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert 1 == len(calls)
+    assert 4 == len(results)
+    assert all(item is results[0] for item in results)
+
+
+def test_devicelink_cache_skips_high_precision_transforms(tmp_path):
+    rgb, cmyk = get_profiles()
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path))
+    for suffix in (';16', ';DBL'):
+        cache.get_transform(
+            rgb, uc2const.TYPE_RGB_8 + suffix, cmyk,
+            uc2const.TYPE_CMYK_8 + suffix, uc2const.INTENT_PERCEPTUAL,
+            uc2const.cmsFLAGS_NOTPRECALC)
+    assert not os.listdir(str(tmp_path))
+
+
+def test_devicelink_cache_removes_oldest_entries(tmp_path):
+    rgb, cmyk = get_profiles()
+    cache = TransformCache()
+    cache.set_disk_cache(str(tmp_path), maxsize=2)
+    for intent in range(3):
+        cache.get_transform(rgb, uc2const.TYPE_RGBA_8,
+                            cmyk, uc2const.TYPE_CMYK_8, intent, 0)
+        # file modification time resolution
+        for filename in os.listdir(str(tmp_path)):
+            path = os.path.join(str(tmp_path), filename)
+            stat = os.stat(path)
+            os.utime(path, (stat.st_atime - 10, stat.st_mtime - 10))
+    assert 2 == len(os.listdir(str(tmp_path)))
+    key = get_transform_key(
+        libcms.cms_get_profile_id(rgb), uc2const.TYPE_RGBA_8,
+        libcms.cms_get_profile_id(cmyk), uc2const.TYPE_CMYK_8, 0, 0)
+    assert cache.load(key, uc2const.TYPE_RGBA_8,
+                      uc2const.TYPE_CMYK_8, 0) is None
@@ -0,0 +1,146 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from uc2 import uc2const
+from uc2.cms import catalog
+
+_pkgdir = os.path.abspath(os.path.dirname(__file__))
+
+
+def get_filepath(filename):
+    return os.path.join(_pkgdir, 'cms_data', filename)
+
+
+def make_profile_dir(path):
+    os.makedirs(os.path.join(path, 'sub'))
+    shutil.copy(get_filepath('sRGB.icm'), os.path.join(path, 'sRGB.icm'))
+    shutil.copy(get_filepath('GenericCMYK.icm'),
+                os.path.join(path, 'sub', 'cmyk.ICC'))
+    shutil.copy(get_filepath('empty.icm'), os.path.join(path, 'empty.icm'))
+    with open(os.path.join(path, 'readme.txt'), 'w') as fileptr:
+        fileptr.write('not a profile')
+
+
+def test_catalog_scan(tmp_path):
+    profile_dir = str(tmp_path / 'profiles')
+    make_profile_dir(profile_dir)
+    profiles = catalog.ProfileCatalog(workers=2).scan([profile_dir])
+    assert len(profiles) == 2
+    rgb, cmyk = profiles
+    assert rgb.name == 'sRGB IEC61966-2.1'
+    assert rgb.colorspace == uc2const.COLOR_RGB
+    assert rgb.device_class == catalog.CLASS_DISPLAY
+    assert len(rgb.profile_id) == 32
+    assert cmyk.colorspace == uc2const.COLOR_CMYK
+    assert cmyk.device_class == catalog.CLASS_OUTPUT
+
+
+def test_catalog_index(tmp_path, monkeypatch):
+    profile_dir = str(tmp_path / 'profiles')
+    index_path = str(tmp_path / 'profiles.json')
+    make_profile_dir(profile_dir)
+    profiles = catalog.ProfileCatalog(index_path)
+    profiles.scan([profile_dir])
+    rgb_path = os.path.join(profile_dir, 'sRGB.icm')
+    rgb = profiles.get(rgb_path)
+
+    read_files = []
+    read_profile_info = catalog.read_profile_info
+
+    def read_info(path, stat=None):
+        read_files.append(path)
+        return read_profile_info(path, stat)
+
+    monkeypatch.setattr(catalog, 'read_profile_info', read_info)
+    profiles = catalog.ProfileCatalog(index_path)
+    assert profiles.get_by_name(rgb.name) == rgb
+    assert profiles.get_by_id(rgb.profile_id) == rgb
+    assert profiles.get_profile_dict(uc2const.COLOR_RGB) == \
+        {rgb.name: rgb_path}
+    profiles.scan([profile_dir])
+    assert profiles.get(os.path.join(profile_dir, 'empty.icm')) is None
+    assert not read_files
+
+    shutil.copy(get_filepath('GenericCMYK.icm'), rgb_path)
+    os.remove(os.path.join(profile_dir, 'sub', 'cmyk.ICC'))
+    profiles.scan([profile_dir])
+    assert read_files == [rgb_path]
+    assert len(profiles) == 1
+    assert profiles.get(rgb_path).colorspace == uc2const.COLOR_CMYK
+    assert profiles.get_by_name(rgb.name) is None
+
+
+class ProfileConfig(object):
+    cms_display_profiles = {}
+    cms_rgb_profiles = {}
+    cms_cmyk_profiles = {}
+    cms_lab_profiles = {}
+    cms_gray_profiles = {}
+    cms_catalog_profiles = []
+
+
+def test_update_app_profiles_keeps_user_entries(tmp_path, monkeypatch):
+    profile_dir = str(tmp_path / 'profiles')
+    make_profile_dir(profile_dir)
+    monkeypatch.setattr(catalog, 'get_system_profile_dirs',
+                        lambda: [profile_dir])
+    user_path = os.path.join(str(tmp_path), 'user.icm')
+    config = ProfileConfig()
+    config.cms_rgb_profiles = {'User RGB': user_path}
+    profiles = catalog.ProfileCatalog()
+    catalog.update_app_profiles(config, str(tmp_path), profiles)
+    rgb_path = os.path.join(profile_dir, 'sRGB.icm')
+    assert config.cms_rgb_profiles == {'User RGB': user_path,
+                                       'sRGB IEC61966-2.1': rgb_path}
+    assert rgb_path in config.cms_catalog_profiles
+    assert user_path not in config.cms_catalog_profiles
+    assert not ProfileConfig.cms_rgb_profiles
+
+    os.remove(rgb_path)
+    catalog.update_app_profiles(config, str(tmp_path), profiles)
+    assert config.cms_rgb_profiles == {'User RGB': user_path}
+    assert rgb_path not in config.cms_catalog_profiles
+
+
+APP_SCRIPT = '''
+import json, sys
+from uc2 import app_cms
+from uc2.application import UCApplication
+from uc2.cms import catalog
+
+reads = []
+read_profile_info = catalog.read_profile_info
+catalog.read_profile_info = lambda *args: reads.append(args) or \\
+    read_profile_info(*args)
+app = UCApplication(cfgdir=sys.argv[1])
+app.config.cms_profile_catalog = True
+app.default_cms = app_cms.AppColorManager(app)
+json.dump({'reads': len(reads),
+           'rgb': app.config.cms_rgb_profiles,
+           'display': app.config.cms_display_profiles}, sys.stdout)
+'''
+
+
+def run_app(tmp_path):
+    env = dict(os.environ, XDG_DATA_HOME=str(tmp_path / 'data'),
+               PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.check_output(
+        [sys.executable, '-c', APP_SCRIPT, str(tmp_path / 'config')],
+        env=env)
+    return json.loads(output.decode('utf-8').splitlines()[-1])
+
+
+def test_app_profiles_use_catalog_index(tmp_path):
+    make_profile_dir(str(tmp_path / 'data' / 'icc'))
+    result = run_app(tmp_path)
+    assert result['reads'] >= 3
+    path = result['rgb']['sRGB IEC61966-2.1']
+    assert os.path.isfile(path)
+    assert result['display']['sRGB IEC61966-2.1'] == path
+    # second process takes profiles from stored index
+    result = run_app(tmp_path)
+    assert result['reads'] == 0
+    assert result['rgb']['sRGB IEC61966-2.1'] == path
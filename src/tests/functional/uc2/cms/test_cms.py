@@ -0,0 +1,209 @@
+import copy
+import os
+
+from PIL import Image
+
+from uc2 import uc2const
+from uc2.cms import Color, ColorManager, ProfileRegistry, verbose_color
+from uc2.cms import metrics as cms_metrics
+from uc2.cms.cache import TRANSFORM_CACHE
+from uc2.formats import get_saver_by_id, iter_colors
+from uc2.formats.skp.skp_presenter import SKP_Presenter
+
+_pkgdir = os.path.abspath(os.path.dirname(__file__))
+
+
+def get_filepath(filename):
+    return os.path.join(_pkgdir, 'cms_data', filename)
+
+
+def test_profile_registry_opens_profiles_lazily():
+    registry = ProfileRegistry()
+    registry.register(uc2const.COLOR_RGB, get_filepath('sRGB.icm'))
+    registry.register(uc2const.COLOR_CMYK, get_filepath('empty.icm'))
+    assert uc2const.COLOR_CMYK in registry
+    assert [] == registry.get_used()
+    assert registry[uc2const.COLOR_RGB] is registry[uc2const.COLOR_RGB]
+    assert [uc2const.COLOR_RGB] == registry.get_used()
+
+
+def test_color_manager_opens_required_profiles_only():
+    # cached transforms are taken without opening profiles
+    TRANSFORM_CACHE.clear()
+    cms = ColorManager()
+    assert [] == cms.handles.get_used()
+    cms.get_cmyk_color([uc2const.COLOR_RGB, [1.0, 0.0, 0.0], 1.0, ''])
+    assert [uc2const.COLOR_RGB, uc2const.COLOR_CMYK] == cms.handles.get_used()
+
+
+def test_do_transform_many():
+    cms = ColorManager()
+    colors = [[uc2const.COLOR_RGB, [x / 10.0, 0.5, 1.0 - x / 10.0], 1.0, '']
+              for x in range(11)]
+    for cs in (uc2const.COLOR_CMYK, uc2const.COLOR_LAB, uc2const.COLOR_GRAY):
+        expected = [cms.do_transform(color, uc2const.COLOR_RGB, cs)
+                    for color in colors]
+        assert expected == cms.do_transform_many(colors,
+                                                 uc2const.COLOR_RGB, cs)
+
+
+def test_do_transform_many_without_cms():
+    cms = ColorManager()
+    cms.use_cms = False
+    colors = [[uc2const.COLOR_RGB, [x / 10.0, 0.5, 1.0 - x / 10.0], 1.0, '']
+              for x in range(11)]
+    for cs in (uc2const.COLOR_CMYK, uc2const.COLOR_LAB, uc2const.COLOR_GRAY):
+        expected = [cms.do_transform(color, uc2const.COLOR_RGB, cs)
+                    for color in colors]
+        result = cms.do_transform_many(colors, uc2const.COLOR_RGB, cs)
+        for vals0, vals1 in zip(expected, result):
+            assert all(abs(x - y) < 1e-9 for x, y in zip(vals0, vals1))
+
+
+def test_display_color_cache():
+    cms = ColorManager()
+    color = [uc2const.COLOR_CMYK, [0.0, 1.0, 1.0, 0.0], 1.0, '']
+    expected = cms.calc_display_color(color)
+    assert expected == cms.get_display_color(color)
+    assert expected == cms.get_display_color(color)
+    assert (1, 1) == (cms.display_cache_hits, cms.display_cache_misses)
+    cms.display_cache_size = 2
+    for value in (0.1, 0.2, 0.3):
+        cms.get_display_color([uc2const.COLOR_GRAY, [value], 1.0, ''])
+    assert 2 == len(cms.display_cache)
+    cms.clear_transforms()
+    assert 0 == len(cms.display_cache)
+    assert (0, 0) == (cms.display_cache_hits, cms.display_cache_misses)
+
+
+def test_gamut_check():
+    cms = ColorManager()
+    colors = [[uc2const.COLOR_RGB, [0.5, 0.5, 0.5], 1.0, ''],
+              [uc2const.COLOR_RGB, [0.0, 0.0, 1.0], 1.0, ''],
+              [uc2const.COLOR_CMYK, [0.0, 1.0, 1.0, 0.0], 1.0, ''],
+              [uc2const.COLOR_SPOT, [[0.0, 1.0, 0.0], []], 1.0, 'Green']]
+    mask, delta_e = cms.gamut_check(colors)
+    assert [True, False, True, False] == mask.tolist()
+    assert 0.0 == delta_e[2]
+    assert delta_e[1] > 10.0
+    mask, delta_e = cms.gamut_check([])
+    assert 0 == len(mask)
+
+
+def test_concurrent_transform_creation():
+    from concurrent.futures import ThreadPoolExecutor
+    cms = ColorManager(thread_safe=True)
+    color = [uc2const.COLOR_RGB, [1.0, 0.0, 0.0], 1.0, '']
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(
+            lambda _: (cms.get_transform(uc2const.COLOR_RGB,
+                                         uc2const.COLOR_LAB),
+                       cms.get_cmyk_color(color)[1],
+                       cms.get_display_color(color)), range(64)))
+    assert all(results[0][0] is item[0] for item in results)
+    assert all(results[0][1:] == item[1:] for item in results)
+
+
+def test_thread_safe_manager_alarm_codes():
+    cms0 = ColorManager(thread_safe=True)
+    cms1 = ColorManager(thread_safe=True)
+    assert cms0.context is not cms1.context
+    color = [uc2const.COLOR_LAB, [0.5, 0.55, 1.0], 1.0, '']
+    for cms, alarm_codes in ((cms0, (0.0, 1.0, 0.0)),
+                             (cms1, (1.0, 0.0, 1.0))):
+        cms.proofing = cms.gamutcheck = True
+        cms.flags |= uc2const.cmsFLAGS_SOFTPROOFING | \
+            uc2const.cmsFLAGS_GAMUTCHECK
+        cms.alarm_codes = alarm_codes
+        cms.apply_alarm_codes()
+    for cms, alarm_codes in ((cms0, [0, 1, 0]), (cms1, [1, 0, 1])):
+        result = cms.do_proof_transform(color, uc2const.COLOR_LAB)
+        assert alarm_codes == [round(x) for x in result]
+
+
+def test_thread_safe_managers_do_not_share_transforms():
+    cms = ColorManager()
+    cms0 = ColorManager(thread_safe=True)
+    cms1 = ColorManager(thread_safe=True)
+    transforms = [item.get_transform(uc2const.COLOR_RGB, uc2const.COLOR_CMYK)
+                  for item in (cms, cms0, cms1)]
+    assert len(set(map(id, transforms))) == 3
+    assert transforms[0] is ColorManager().get_transform(
+        uc2const.COLOR_RGB, uc2const.COLOR_CMYK)
+
+
+def test_color_record():
+    cms = ColorManager()
+    rgb = [uc2const.COLOR_RGB, [0.1, 0.2, 0.3], 1.0, 'name']
+    color = cms.get_rgb_color(rgb)
+    assert isinstance(color, Color)
+    assert color == rgb and rgb == color
+    assert str(color) == str(rgb)
+    assert color.to_list() == rgb
+    assert cms.get_rgb_color(color) is color
+    assert copy.deepcopy(color) is color
+    cs, values, alpha, name = cms.get_cmyk_color(color)
+    assert (cs, len(values), alpha, name) == (uc2const.COLOR_CMYK, 4, 1.0,
+                                              'name')
+    spot = [uc2const.COLOR_SPOT, [[], [0.0, 1.0, 0.0, 0.0]], 1.0, 'spot']
+    assert Color(*spot) == spot
+    assert cms.get_cmyk_color(spot) == [uc2const.COLOR_CMYK,
+                                        [0.0, 1.0, 0.0, 0.0], 1.0, 'spot']
+    assert cms.get_rgba_color255(rgb) == [26, 51, 76, 255]
+    try:
+        color[3] = ''
+    except TypeError:
+        return
+    assert False
+
+
+def test_palette_colors():
+    cms = ColorManager()
+    spot = [uc2const.COLOR_SPOT, [[1.0, 0.0, 0.0], []], 1.0, 'spot',
+            'Palette']
+    assert Color.from_color(spot) == spot
+    assert cms.get_rgb_color(spot) == [uc2const.COLOR_RGB, [1.0, 0.0, 0.0],
+                                       1.0, 'spot']
+    lab = cms.get_lab_color([uc2const.COLOR_RGB, [0.1, 0.2, 0.3], 1.0, ''])
+    assert verbose_color(lab).startswith('L ')
+
+
+def test_palette_colors_saving(tmp_path, app):
+    doc = SKP_Presenter(app.appdata)
+    lab = app.default_cms.get_lab_color(
+        [uc2const.COLOR_RGB, [0.1, 0.2, 0.3], 1.0, ''])
+    doc.model.colors = [
+        lab,
+        [uc2const.COLOR_SPOT, [[1.0, 0.0, 0.0], [0.0, 1.0, 1.0, 0.0]], 1.0,
+         'spot', 'Palette'],
+    ]
+    for fid in (uc2const.COREL_PAL, uc2const.GPL, uc2const.SOC,
+                uc2const.JCW):
+        path = str(tmp_path / ('palette_%s.%s' %
+                               (fid, uc2const.FORMAT_EXTENSION[fid][0])))
+        get_saver_by_id(fid)(doc, path, translate=False, convert=True)
+        assert len(list(iter_colors(path))) == 2
+
+
+def test_metrics():
+    cms = ColorManager()
+    assert cms.metrics is None
+    metrics = cms.enable_metrics()
+    color = [uc2const.COLOR_RGB, [1.0, 0.0, 0.0], 1.0, '']
+    cms.get_cmyk_color(color)
+    cms.get_cmyk_color(color)
+    cms.do_transform_many([color] * 10, uc2const.COLOR_RGB,
+                          uc2const.COLOR_LAB)
+    cms.do_bitmap_transform(Image.new(uc2const.IMAGE_RGB, (1000, 500)),
+                            uc2const.IMAGE_CMYK)
+    assert metrics.get_counter(cms_metrics.SINGLE_CALLS) == 2
+    assert metrics.get_counter(cms_metrics.BULK_CALLS) == 1
+    assert metrics.get_counter(cms_metrics.BULK_COLORS) == 10
+    assert metrics.get_counter(cms_metrics.BITMAP_MEGAPIXELS) == 0.5
+    # RGB-CMYK transform is shared by colors and bitmap
+    assert metrics.get_counter(cms_metrics.TRANSFORM_HITS) == 2
+    builds = metrics.get_timer(cms_metrics.TRANSFORM_BUILD)[0]
+    assert builds + metrics.get_counter(cms_metrics.TRANSFORM_CACHE_HITS) == 2
+    assert metrics.get_timer(cms_metrics.LCMS_CALL)[0] == 4
+    assert 'bulk_colors: 10' in metrics.to_text()
+    assert cms.enable_metrics(False) is None
@@ -0,0 +1,59 @@
+import numpy as np
+
+from uc2 import uc2const
+from uc2.cms import ColorManager, ColorArray
+from uc2.formats.skp.skp_model import SK1Palette
+
+
+def test_color_array_round_trip(mixed_colors):
+    colors = ColorArray(mixed_colors)
+    assert len(colors) == len(mixed_colors)
+    assert colors.to_list() == mixed_colors
+    assert colors == mixed_colors
+    assert colors[-2] == mixed_colors[-2]
+    assert colors[1:4] == mixed_colors[1:4]
+    assert colors.names == ['red', '', 'gray', 'PANTONE 2925 C', 'spot']
+
+
+def test_color_array_growth():
+    colors = ColorArray()
+    for index in range(100):
+        colors.append([uc2const.COLOR_GRAY, [index / 100.0], 1.0, ''])
+    assert len(colors) == 100
+    assert colors[99][1] == [0.99]
+    assert colors.nbytes < len(colors) * 64
+
+
+def test_color_array_group_values(mixed_colors):
+    groups = ColorArray(mixed_colors).group_values(uc2const.COLOR_CMYK)
+    assert groups[uc2const.COLOR_CMYK][0].tolist() == [1, 4, 5]
+    assert groups[uc2const.COLOR_CMYK][1].shape == (3, 4)
+    groups = ColorArray(mixed_colors).group_values()
+    assert groups[uc2const.COLOR_RGB][0].tolist() == [0, 4]
+    assert groups[uc2const.COLOR_CMYK][0].tolist() == [1, 5]
+
+
+def test_get_colors(mixed_colors):
+    cms = ColorManager()
+    colors = ColorArray(mixed_colors)
+    for cs in (uc2const.COLOR_RGB, uc2const.COLOR_CMYK, uc2const.COLOR_GRAY):
+        result = cms.get_colors(colors, cs)
+        assert isinstance(result, ColorArray)
+        assert result == cms.get_colors(mixed_colors, cs)
+        for color, ref in zip(result, mixed_colors):
+            assert color[0] == cs
+            assert color[2:] == ref[2:]
+            if ref[0] == uc2const.COLOR_LAB:
+                continue
+            expected = cms.get_color(ref, cs)[1]
+            assert np.allclose(color[1], expected, atol=0.02)
+
+
+def test_palette_pack(mixed_colors):
+    palette = SK1Palette('test', [] + mixed_colors)
+    palette.pack()
+    assert palette.is_packed()
+    assert palette.colors == mixed_colors
+    palette.unpack()
+    assert not palette.is_packed()
+    assert palette.colors == mixed_colors
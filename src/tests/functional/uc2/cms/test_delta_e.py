@@ -0,0 +1,37 @@
+import numpy as np
+
+from uc2 import uc2const
+from uc2.cms import delta_e
+
+# Sharma, Wu, Dalal CIEDE2000 test data
+LAB0 = [[50.0, 2.6772, -79.7751], [50.0, 0.0, 0.0], [50.0, 2.5, 0.0],
+        [60.2574, -34.0099, 36.2677], [2.0776, 0.0795, -1.135]]
+LAB1 = [[50.0, 0.0, -82.7485], [50.0, -1.0, 2.0], [73.0, 25.0, -18.0],
+        [60.4626, -34.1751, 39.4387], [0.9033, -0.0636, -0.5514]]
+CIEDE2000 = [2.0425, 2.3669, 27.1492, 1.2644, 0.9082]
+
+
+def test_ciede2000():
+    assert np.allclose(CIEDE2000, delta_e.ciede2000(LAB0, LAB1), atol=1e-4)
+
+
+def test_cie76_and_cie94():
+    assert np.allclose(np.sqrt(5.0), delta_e.cie76(LAB0[1], LAB1[1]))
+    assert np.allclose(np.sqrt(5.0), delta_e.cie94(LAB0[1], LAB1[1]))
+    assert np.allclose(1.3950, delta_e.cie94(LAB0[0], LAB1[0]), atol=1e-4)
+
+
+def test_delta_e_for_colors():
+    red = [uc2const.COLOR_RGB, [1.0, 0.0, 0.0], 1.0, '']
+    colors = [red,
+              [uc2const.COLOR_SPOT, [[1.0, 0.0, 0.0], []], 1.0, 'Red'],
+              [uc2const.COLOR_CMYK, [0.0, 1.0, 1.0, 0.0], 1.0, ''],
+              [uc2const.COLOR_LAB, [0.5, 0.5, 0.5], 1.0, '']]
+    for method in delta_e.METHODS:
+        assert 0.0 == delta_e.delta_e(red, colors[1], method)
+        many = delta_e.delta_e_many(red, colors, method)
+        matrix = delta_e.delta_e_matrix(colors, method=method)
+        assert (4, 4) == matrix.shape
+        assert np.allclose(many, matrix[0])
+        assert np.allclose(0.0, matrix.diagonal())
+        assert many[2] > 1.0
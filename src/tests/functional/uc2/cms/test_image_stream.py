@@ -0,0 +1,85 @@
+import io
+
+from PIL import Image
+
+from uc2 import uc2const
+from uc2.cms import ColorManager, image_stream
+
+
+def get_image():
+    band = Image.linear_gradient('L').resize((200, 150))
+    return Image.merge(uc2const.IMAGE_RGB,
+                       [band, band.transpose(Image.Transpose.ROTATE_180),
+                        band.transpose(Image.Transpose.FLIP_LEFT_RIGHT)])
+
+
+def test_convert_image_stream():
+    cms = ColorManager()
+    cms.strip_height = 40
+    img = get_image()
+    reader = image_stream.ImageStripReader(img)
+    for mode in (uc2const.IMAGE_CMYK, uc2const.IMAGE_LAB,
+                 uc2const.IMAGE_GRAY):
+        writer = image_stream.ImageStripWriter(mode, img.size)
+        cms.convert_image_stream(reader, writer, mode)
+        expected = cms.convert_image(img, mode)
+        assert expected.tobytes() == writer.image.tobytes()
+
+
+def test_raw_strip_reader(tmp_path):
+    cms = ColorManager()
+    cms.strip_height = 32
+    img = get_image()
+    expected = cms.convert_image(img, uc2const.IMAGE_CMYK).tobytes()
+    for ext in ('bmp', 'tif', 'ppm'):
+        path = str(tmp_path / ('image.' + ext))
+        img.save(path)
+        with image_stream.open_strip_reader(path) as reader:
+            assert isinstance(reader, image_stream.RawStripReader)
+            buff = bytearray(len(expected))
+            writer = image_stream.BufferStripWriter(buff, img.size[0] * 4)
+            cms.convert_image_stream(reader, writer, uc2const.IMAGE_CMYK)
+        assert expected == bytes(buff)
+
+
+def test_raw_strip_reader_chunks():
+    img = get_image()
+    width, height = img.size
+    stride = width * 3
+    top = img.crop((0, 0, width, 70)).tobytes()
+    # bottom-up rows
+    bottom = img.crop((0, 70, width, height)).transpose(
+        Image.Transpose.FLIP_TOP_BOTTOM).tobytes()
+    chunks = [(0, 70, 10, 'RGB', stride, 1),
+              (70, height - 70, 10 + len(top), 'RGB', stride, -1)]
+    fileptr = io.BytesIO(b'\0' * 10 + top + bottom)
+    reader = image_stream.RawStripReader(fileptr, img.mode, img.size, chunks)
+    writer = image_stream.ImageStripWriter(img.mode, img.size)
+    cms = ColorManager()
+    cms.strip_height = 32
+    cms.convert_image_stream(reader, writer, uc2const.IMAGE_RGB)
+    assert img.tobytes() == writer.image.tobytes()
+
+
+def test_raw_strip_writer():
+    cms = ColorManager()
+    cms.strip_height = 64
+    img = get_image()
+    fileptr = io.BytesIO()
+    reader = image_stream.ImageStripReader(img)
+    writer = image_stream.RawStripWriter(fileptr)
+    cms.convert_image_stream(reader, writer, uc2const.IMAGE_GRAY)
+    expected = cms.convert_image(img, uc2const.IMAGE_GRAY).tobytes()
+    assert expected == fileptr.getvalue()
+
+
+def test_convert_image_stream_rejects_bilevel_target():
+    img = get_image()
+    reader = image_stream.ImageStripReader(img)
+    writer = image_stream.ImageStripWriter(uc2const.IMAGE_MONO, img.size)
+    try:
+        ColorManager().convert_image_stream(reader, writer,
+                                            uc2const.IMAGE_MONO)
+    except ValueError:
+        return
+    assert False
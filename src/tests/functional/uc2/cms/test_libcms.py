@@ -1,4 +1,6 @@
+import array
 import os
+import sys
 
 import PIL
 
@@ -455,3 +457,174 @@ def test_get_embedded_profile():
             transform, img, uc2const.TYPE_RGB_8, uc2const.TYPE_RGB_8)
     except libcms.CmsError:
         assert False
+
+
+def test_do_transform_many():
+    colors = [[0, 0, 0, 0], [255, 255, 255, 0], [100, 190, 150, 0]]
+    result = libcms.cms_do_transform_many(TRANSFORM, colors)
+    assert len(colors) == len(result)
+    for rgb, cmyk in zip(colors, result):
+        expected = [0, 0, 0, 0]
+        libcms.cms_do_transform(TRANSFORM, rgb, expected)
+        assert expected == cmyk
+
+
+def test_do_transform_many_with_empty_input():
+    assert [] == libcms.cms_do_transform_many(TRANSFORM, [])
+
+
+def test_do_transform_many_with_incorrect_input_buffer():
+    try:
+        libcms.cms_do_transform_many(TRANSFORM, [[0, 0, 0]])
+    except libcms.CmsError:
+        return
+    assert False
+
+
+def test_do_buffer_transform():
+    rgb = bytes([0, 0, 0, 0, 255, 255, 255, 0, 100, 190, 150, 0])
+    cmyk = bytearray(len(rgb))
+    libcms.cms_do_buffer_transform(TRANSFORM, rgb, cmyk)
+    expected = libcms.cms_do_transform_many(
+        TRANSFORM, [list(rgb[i:i + 4]) for i in range(0, len(rgb), 4)])
+    assert sum(expected, []) == list(cmyk)
+
+
+def test_do_buffer_transform_in_place():
+    rgb = bytearray([100, 190, 150, 0] * 3)
+    cmyk = [0, 0, 0, 0]
+    libcms.cms_do_transform(TRANSFORM, [100, 190, 150, 0], cmyk)
+    libcms.cms_do_buffer_transform(TRANSFORM, rgb, rgb)
+    assert cmyk * 3 == list(rgb)
+
+
+def test_do_buffer_transform_with_small_output_buffer():
+    rgb = bytes(12)
+    cmyk = bytearray(8)
+    try:
+        libcms.cms_do_buffer_transform(TRANSFORM, rgb, cmyk)
+    except libcms.CmsError:
+        return
+    assert False
+
+
+def test_do_buffer_transform_with_readonly_output_buffer():
+    rgb = bytes(12)
+    try:
+        libcms.cms_do_buffer_transform(TRANSFORM, rgb, bytes(12))
+    except libcms.CmsError:
+        return
+    assert False
+
+
+def test_do_bitmap_transform_with_workers():
+    transform = libcms.cms_create_transform(
+        IN_PROFILE, uc2const.TYPE_RGBA_8, OUT_PROFILE,
+        uc2const.TYPE_CMYK_8, uc2const.INTENT_PERCEPTUAL,
+        uc2const.cmsFLAGS_NOCACHE)
+    in_image = PIL.Image.open(get_filepath('color100x100.png'))
+    in_image = in_image.resize((100, 400))
+    expected = libcms.cms_do_bitmap_transform(
+        transform, in_image, uc2const.TYPE_RGB_8, uc2const.TYPE_CMYK_8)
+    out_image = libcms.cms_do_bitmap_transform(
+        transform, in_image, uc2const.TYPE_RGB_8, uc2const.TYPE_CMYK_8, 4)
+    assert expected.tobytes() == out_image.tobytes()
+
+
+def test_bitmap_executor_is_shared():
+    executor = libcms.get_bitmap_executor(2)
+    assert executor is libcms.get_bitmap_executor(2)
+    assert executor is libcms.get_bitmap_executor(1)
+    workers = libcms.BITMAP_EXECUTOR_WORKERS
+    bigger = libcms.get_bitmap_executor(workers + 1)
+    assert bigger is not executor
+    assert bigger is libcms.get_bitmap_executor(workers)
+
+
+def test_do_buffer_transform_with_double_precision():
+    transform = libcms.cms_create_transform(
+        IN_PROFILE, 'RGB;DBL', OUT_PROFILE, 'CMYK;DBL',
+        uc2const.INTENT_PERCEPTUAL, uc2const.cmsFLAGS_NOTPRECALC)
+    rgb = array.array('d', [0.2, 0.5, 0.7])
+    cmyk = array.array('d', [0.0] * 4)
+    libcms.cms_do_buffer_transform(transform, rgb, cmyk, 1)
+    cmyk8 = [0, 0, 0, 0]
+    libcms.cms_do_transform(TRANSFORM, [51, 128, 178, 0], cmyk8)
+    assert all(abs(x * 2.55 - y) < 2.0 for x, y in zip(cmyk, cmyk8))
+
+
+def test_get_profile_id():
+    profile_id = libcms.cms_get_profile_id(IN_PROFILE)
+    assert 32 == len(profile_id)
+    assert profile_id == libcms.cms_get_profile_id(
+        libcms.cms_open_profile_from_file(get_filepath('sRGB.icm')))
+    assert profile_id != libcms.cms_get_profile_id(OUT_PROFILE)
+
+
+def test_create_default_profile():
+    for item in uc2const.COLORSPACES + [uc2const.COLOR_DISPLAY, ]:
+        data = libcms.get_default_profile_data(item)
+        assert data is libcms.get_default_profile_data(item)
+        profile = libcms.cms_create_default_profile(item)
+        assert libcms.cms_get_profile_id(profile) == libcms.cms_get_profile_id(
+            libcms.cms_open_profile_from_string(data))
+
+
+def test_create_default_profile_with_unsupported_colorspace():
+    try:
+        libcms.get_default_profile_data('HSV')
+    except libcms.CmsError:
+        return
+    assert False
+
+
+def test_create_transform_in_context():
+    context = libcms.cms_create_context()
+    transform = libcms.cms_create_transform(IN_PROFILE, uc2const.TYPE_RGB_8,
+                                            OUT_PROFILE, uc2const.TYPE_CMYK_8,
+                                            context=context)
+    out = [0, 0, 0, 0]
+    libcms.cms_do_transform(transform, [255, 0, 0, 0], out)
+    assert out[1] > 200
+    assert libcms.cms_get_context_error(context) is None
+    try:
+        libcms.cms_create_transform(IN_PROFILE, uc2const.TYPE_CMYK_8,
+                                    OUT_PROFILE, uc2const.TYPE_CMYK_8,
+                                    context=context)
+    except libcms.CmsError as e:
+        assert 'color space' in str(e)
+        return
+    assert False
+
+
+def test_get_context_error_with_wrong_handle():
+    try:
+        libcms.cms_get_context_error(IN_PROFILE)
+    except TypeError:
+        return
+    assert False
+
+
+def test_create_devicelink_transform_in_context():
+    context = libcms.cms_create_context()
+    refcount = sys.getrefcount(context)
+    transform = libcms.cms_create_transform(IN_PROFILE, uc2const.TYPE_RGB_8,
+                                            OUT_PROFILE, uc2const.TYPE_CMYK_8,
+                                            flags=0, context=context)
+    devicelink = libcms.cms_open_profile_from_string(
+        libcms.cms_save_devicelink(transform))
+    linked = libcms.cms_create_devicelink_transform(
+        devicelink, uc2const.TYPE_RGB_8, uc2const.TYPE_CMYK_8, context=context)
+    out = [0, 0, 0, 0]
+    libcms.cms_do_transform(linked, [255, 0, 0, 0], out)
+    assert out[1] > 200
+    assert sys.getrefcount(context) == refcount + 2
+    del transform, linked
+    assert sys.getrefcount(context) == refcount
+    try:
+        libcms.cms_create_devicelink_transform(
+            devicelink, uc2const.TYPE_CMYK_8, uc2const.TYPE_CMYK_8,
+            context=context)
+    except libcms.CmsError:
+        return
+    assert False
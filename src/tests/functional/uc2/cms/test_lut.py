@@ -0,0 +1,66 @@
+import numpy as np
+
+from uc2 import uc2const
+from uc2.cms import ColorManager, lut
+
+
+def test_lut_reproduces_grid_nodes():
+    grid = lut.get_grid(3, 5)
+    for interpolation in lut.INTERPOLATIONS:
+        color_lut = lut.ColorLUT.build(lambda arr: arr[:, ::-1], 3, 5,
+                                       interpolation)
+        assert np.allclose(grid[:, ::-1], color_lut(grid))
+
+
+def test_lut_interpolates_linear_function():
+    rng = np.random.default_rng(1)
+    values = rng.random((100, 4))
+    for interpolation in lut.INTERPOLATIONS:
+        color_lut = lut.ColorLUT.build(lambda arr: arr.sum(axis=1)[:, None],
+                                       4, 3, interpolation)
+        assert np.allclose(values.sum(axis=1)[:, None], color_lut(values))
+
+
+def test_lut_save_and_load(tmp_path):
+    path = str(tmp_path / 'rgb_cmyk.npz')
+    cms = ColorManager()
+    color_lut = cms.get_lut(uc2const.COLOR_RGB, uc2const.COLOR_CMYK)
+    color_lut.save(path)
+    loaded = lut.ColorLUT.load(path)
+    assert color_lut.interpolation == loaded.interpolation
+    assert np.array_equal(color_lut.table, loaded.table)
+
+
+def test_do_transform_many_with_lut():
+    cms = ColorManager()
+    cms.lut_sizes = dict(lut.GRID_SIZES)
+    cms.lut_sizes[uc2const.COLOR_RGB] = 17
+    assert cms.get_lut_error(uc2const.COLOR_RGB, uc2const.COLOR_CMYK) < 3.0
+    colors = [[uc2const.COLOR_RGB, [x / 10.0, 0.5, 1.0 - x / 10.0], 1.0, '']
+              for x in range(11)]
+    expected = cms.do_transform_many(colors, uc2const.COLOR_RGB,
+                                     uc2const.COLOR_CMYK)
+    cms.use_lut = True
+    result = cms.do_transform_many(colors, uc2const.COLOR_RGB,
+                                   uc2const.COLOR_CMYK)
+    assert 17 == cms.get_lut(uc2const.COLOR_RGB, uc2const.COLOR_CMYK).size
+    for vals0, vals1 in zip(expected, result):
+        assert all(abs(x - y) < 0.05 for x, y in zip(vals0, vals1))
+
+
+def test_do_transform_many_with_lut_and_spot_colors():
+    cms = ColorManager()
+    colors = [
+        [uc2const.COLOR_RGB, [0.2, 0.5, 0.8], 1.0, ''],
+        [uc2const.COLOR_SPOT, [[1.0, 0.0, 0.0], [0.0, 1.0, 1.0, 0.0]],
+         1.0, 'Spot'],
+        [uc2const.COLOR_SPOT, [[], [0.0, 0.0, 1.0, 0.0]], 1.0, 'CMYK spot'],
+        [uc2const.COLOR_LAB, [0.5, 0.4, 0.6], 1.0, ''],
+    ]
+    expected = [cms.get_cmyk_color(cms.get_rgb_color(color))[1]
+                for color in colors]
+    cms.use_lut = True
+    result = cms.do_transform_many(colors, uc2const.COLOR_RGB,
+                                   uc2const.COLOR_CMYK)
+    for vals0, vals1 in zip(expected, result):
+        assert all(abs(x - y) < 0.05 for x, y in zip(vals0, vals1))
@@ -0,0 +1,63 @@
+import math
+import random
+
+from uc2 import uc2const
+from uc2.cms.palette_index import PaletteIndex, get_index_path
+from uc2.formats.skp.skp_model import SK1Palette
+
+
+def get_palette(name, size, seed):
+    rnd = random.Random(seed)
+    colors = [[uc2const.COLOR_RGB, [rnd.random() for _ in range(3)], 1.0,
+               '%s %d' % (name, i)] for i in range(size)]
+    return SK1Palette(name, colors)
+
+
+def brute_force(index, lab):
+    return sorted(math.dist(lab, item.lab) for item in index)
+
+
+def test_nearest_and_within_queries():
+    index = PaletteIndex([get_palette('A', 300, 1), get_palette('B', 300, 2)])
+    assert 600 == len(index)
+    rnd = random.Random(3)
+    for _ in range(50):
+        lab = (rnd.uniform(0, 100), rnd.uniform(-100, 100),
+               rnd.uniform(-100, 100))
+        expected = brute_force(index, lab)
+        assert expected[:4] == [d for d, _ in index.nearest_lab(lab, 4)]
+        radius = rnd.uniform(0, 20)
+        assert len([d for d in expected if d <= radius]) == \
+            len(index.within_lab(lab, radius))
+
+
+def test_nearest_color():
+    palette = get_palette('A', 100, 1)
+    index = PaletteIndex(palette)
+    distance, item = index.nearest(palette.colors[10])[0]
+    assert distance < 1e-6
+    assert palette.colors[10] is item.color
+    assert 'A' == item.palette
+
+
+def test_insert_and_delete():
+    index = PaletteIndex()
+    assert [] == index.nearest_lab((50.0, 0.0, 0.0))
+    red = [uc2const.COLOR_RGB, [1.0, 0.0, 0.0], 1.0, 'Red']
+    item_id = index.insert(red)
+    index.insert([uc2const.COLOR_RGB, [0.0, 0.0, 1.0], 1.0, 'Blue'])
+    assert 'Red' == index.nearest(red)[0][1].color[3]
+    index.delete(item_id)
+    assert item_id not in index
+    assert 'Blue' == index.nearest(red)[0][1].color[3]
+
+
+def test_save_and_load(tmp_path):
+    path = get_index_path(str(tmp_path / 'palette.skp'))
+    index = PaletteIndex(get_palette('A', 100, 1))
+    index.save(path)
+    loaded = PaletteIndex.load(path)
+    assert len(index) == len(loaded)
+    lab = (50.0, 10.0, -10.0)
+    assert [(d, item.color) for d, item in index.nearest_lab(lab, 5)] == \
+        [(d, item.color) for d, item in loaded.nearest_lab(lab, 5)]
@@ -0,0 +1,55 @@
+import pytest
+
+from uc2 import app_cms, uc2const
+from uc2.application import UCApplication
+
+
+@pytest.fixture
+def app(tmp_path):
+    """UCApplication with color manager and config directory in tmp_path"""
+    app = UCApplication(cfgdir=str(tmp_path / 'config'))
+    app.default_cms = app_cms.AppColorManager(app)
+    return app
+
+
+@pytest.fixture
+def appdata(app):
+    return app.appdata
+
+
+@pytest.fixture
+def palette_colors():
+    """RGB and CMYK palette colors supported by all palette savers"""
+    return [
+        [uc2const.COLOR_RGB, [0.1, 0.2, 0.3], 1.0, 'RGB color'],
+        [uc2const.COLOR_CMYK, [0.1, 0.2, 0.3, 0.4], 1.0, 'CMYK color'],
+    ] + [[uc2const.COLOR_RGB, [i / 100.0, 0.5, 1.0 - i / 100.0], 1.0,
+          'Color %d' % i] for i in range(100)]
+
+
+@pytest.fixture
+def spot_color():
+    return [uc2const.COLOR_SPOT, [[1.0, 0.0, 0.0], [0.0, 1.0, 1.0, 0.0]],
+            1.0, 'Spot color']
+
+
+@pytest.fixture
+def no_spot_savers():
+    """Palette savers which cannot write spot colors"""
+    return uc2const.CPL, uc2const.JCW
+
+
+@pytest.fixture
+def mixed_colors():
+    """Colors of all colorspaces including spot colors
+    without RGB values
+    """
+    return [
+        [uc2const.COLOR_RGB, [0.1, 0.2, 0.3], 1.0, 'red'],
+        [uc2const.COLOR_CMYK, [0.1, 0.2, 0.3, 0.4], 0.5, ''],
+        [uc2const.COLOR_LAB, [0.5, 0.4, 0.6], 1.0, 'red'],
+        [uc2const.COLOR_GRAY, [0.7], 1.0, 'gray'],
+        [uc2const.COLOR_SPOT, [[0.0, 0.5, 1.0], [1.0, 0.5, 0.0, 0.0]], 1.0,
+         'PANTONE 2925 C'],
+        [uc2const.COLOR_SPOT, [[], [0.0, 1.0, 0.0, 0.0]], 1.0, 'spot'],
+    ]
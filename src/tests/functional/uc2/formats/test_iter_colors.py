@@ -0,0 +1,78 @@
+from uc2 import uc2const
+from uc2.formats import get_loader, get_saver_by_id, iter_colors
+from uc2.formats.skp.skp_presenter import SKP_Presenter
+
+COREL_PAL = '''<?xml version="1.0"?>
+<palette guid="guid" resid="p1">
+<colorspaces>
+<color name="spot" fixedID="1"><color cs="RGB" tints="1,0,0"/></color>
+</colorspaces>
+<colors><page>
+<color cs="RGB" name="RGB color" tints="0.1,0.2,0.3"/>
+<color cs="spot" name="spot" tints="1"/>
+<color cs="CMYK" resid="c1" tints="0,0,0,1"/>
+<color cs="RGB" name="Last color" tints="0.5,0.5,0.5"/>
+</page></colors>
+<localization>
+<resource id="p1"><EN>Localized palette</EN></resource>
+<resource id="c1"><EN>Localized black</EN></resource>
+</localization>
+</palette>
+'''
+
+
+def load_colors(appdata, path):
+    loader = get_loader(path)
+    doc = loader(appdata, path, convert=True)
+    colors = doc.model.colors
+    doc.close()
+    return colors
+
+
+def test_iter_colors(tmp_path, appdata, palette_colors, spot_color,
+                     no_spot_savers):
+    doc = SKP_Presenter(appdata)
+    doc.model.name = 'Test palette'
+    for fid in uc2const.PALETTE_SAVERS:
+        doc.model.colors = palette_colors if fid in no_spot_savers \
+            else palette_colors + [spot_color]
+        path = str(tmp_path / ('palette.' + uc2const.FORMAT_EXTENSION[fid][0]))
+        get_saver_by_id(fid)(doc, path, translate=False, convert=True)
+        assert get_loader(path, return_id=True)[1] == fid
+        colors = list(iter_colors(path))
+        assert len(colors) == len(doc.model.colors)
+        assert colors == load_colors(appdata, path)
+
+
+def test_iter_colors_deferred(tmp_path, appdata):
+    path = str(tmp_path / 'corel.xml')
+    with open(path, 'w') as fileptr:
+        fileptr.write(COREL_PAL)
+    colors = list(iter_colors(path))
+    assert colors == load_colors(appdata, path)
+    assert [item[3] for item in colors] == \
+        ['RGB color', 'spot', 'Localized black', 'Last color']
+    assert colors[1][4] == 'Localized palette'
+
+
+def test_iter_colors_aco1(tmp_path):
+    path = str(tmp_path / 'palette.aco')
+    with open(path, 'wb') as fileptr:
+        fileptr.write(b'\x00\x01\x00\x02'
+                      b'\x00\x00\xff\xff\x00\x00\x00\x00\x00\x00'
+                      b'\x00\x08\x13\x88\x00\x00\x00\x00\x00\x00')
+    colors = iter_colors(path)
+    assert next(colors)[:2] == [uc2const.COLOR_RGB, [1.0, 0.0, 0.0]]
+    assert next(colors)[:2] == [uc2const.COLOR_GRAY, [0.5]]
+    assert list(colors) == []
+
+
+def test_iter_colors_unknown(tmp_path):
+    path = str(tmp_path / 'unknown.txt')
+    with open(path, 'wb') as fileptr:
+        fileptr.write(b'\xff\xfe\x00 binary data')
+    try:
+        iter_colors(path)
+    except IOError:
+        return
+    assert False
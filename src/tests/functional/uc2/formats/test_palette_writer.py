@@ -0,0 +1,120 @@
+import io
+import os
+
+from uc2 import uc2const
+from uc2.formats import get_loader, get_saver_by_id, iter_colors, \
+    open_palette_writer
+from uc2.formats.skp.skp_presenter import SKP_Presenter
+
+
+class NotSeekableFile(io.FileIO):
+    def seekable(self):
+        return False
+
+
+def get_path(tmp_path, name, fid):
+    return str(tmp_path / (name + '.' + uc2const.FORMAT_EXTENSION[fid][0]))
+
+
+def load_doc(appdata, path):
+    return get_loader(path)(appdata, path, convert=True)
+
+
+def test_palette_writer(tmp_path, appdata, palette_colors, spot_color,
+                        no_spot_savers):
+    doc = SKP_Presenter(appdata)
+    doc.model.name = 'Test palette'
+    doc.model.source = 'Test source'
+    doc.model.comments = 'First line\nSecond line\n'
+    for fid in uc2const.PALETTE_SAVERS:
+        colors = palette_colors if fid in no_spot_savers \
+            else palette_colors + [spot_color]
+        doc.model.colors = colors
+        saved = get_path(tmp_path, 'saved', fid)
+        get_saver_by_id(fid)(doc, saved, translate=False, convert=True)
+
+        path = get_path(tmp_path, 'written', fid)
+        cms = appdata.app.default_cms
+        with open_palette_writer(path, fid, cms=cms) as writer:
+            writer.palette_name = doc.model.name
+            writer.source = doc.model.source
+            writer.comments = doc.model.comments
+            for color in colors:
+                writer.write_color(color)
+        written = list(iter_colors(path))
+        assert [item[3] for item in written] == [item[3] for item in colors]
+        saved_doc = load_doc(appdata, saved)
+        written_doc = load_doc(appdata, path)
+        assert written_doc.model.colors == saved_doc.model.colors
+        saved_doc.close()
+        written_doc.close()
+
+
+def test_palette_writer_properties(tmp_path, appdata, palette_colors):
+    path = str(tmp_path / 'palette.gpl')
+    with open_palette_writer(path) as writer:
+        writer.palette_name = 'Test palette'
+        writer.columns = 4
+        writer.comments = 'Comment'
+        writer.write_colors(palette_colors)
+    doc = load_doc(appdata, path)
+    assert doc.model.name == 'Test palette'
+    assert doc.model.columns == 4
+    assert doc.model.comments.startswith('Comment')
+    assert len(doc.model.colors) == len(palette_colors)
+    doc.close()
+
+
+def test_palette_writer_not_seekable(tmp_path, palette_colors):
+    for fid in (uc2const.ACO, uc2const.ASE, uc2const.CPL):
+        path = get_path(tmp_path, 'seekable', fid)
+        with open_palette_writer(path, fid) as writer:
+            writer.write_colors(palette_colors)
+        stream = get_path(tmp_path, 'stream', fid)
+        fileptr = NotSeekableFile(stream, 'wb')
+        with open_palette_writer(None, fid, fileptr=fileptr) as writer:
+            writer.write_colors(palette_colors)
+        with open(path, 'rb') as fileptr:
+            data = fileptr.read()
+        with open(stream, 'rb') as fileptr:
+            assert fileptr.read() == data
+
+
+def test_palette_writer_empty(tmp_path):
+    for fid in uc2const.PALETTE_SAVERS:
+        path = get_path(tmp_path, 'empty', fid)
+        open_palette_writer(path, fid).close()
+        assert list(iter_colors(path)) == []
+
+
+def test_palette_writer_max_colors(tmp_path, palette_colors):
+    writer = open_palette_writer(str(tmp_path / 'palette.aco'))
+    writer.max_colors = 1
+    writer.write_color(palette_colors[0])
+    try:
+        writer.write_color(palette_colors[1])
+    except ValueError:
+        writer.close()
+        return
+    assert False
+
+
+def test_palette_writer_discard_on_error(tmp_path, palette_colors):
+    for fid in (uc2const.GPL, uc2const.ACO):
+        path = get_path(tmp_path, 'failed', fid)
+        try:
+            with open_palette_writer(path, fid) as writer:
+                writer.write_colors(palette_colors)
+                raise RuntimeError('color source failed')
+        except RuntimeError:
+            pass
+        assert writer.closed
+        assert not os.path.exists(path)
+
+
+def test_palette_writer_unknown_format(tmp_path):
+    try:
+        open_palette_writer(str(tmp_path / 'palette.unknown'))
+    except IOError:
+        return
+    assert False
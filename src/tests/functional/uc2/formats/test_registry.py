@@ -0,0 +1,68 @@
+from uc2 import uc2const
+from uc2.formats import get_loader, registry, sniffer
+from uc2.formats.gpl import check_gpl, gpl_loader
+
+DEMO_SPEC = registry.FormatSpec(
+    'demo_pal', 'Demo palette', ('DPAL',), module='uc2.formats.gpl',
+    loader='gpl_loader', saver=None, checker='check_gpl',
+    signatures=[sniffer.Signature(b'DEMO PALETTE', 0, sniffer.CERTAIN)])
+
+
+class EntryPoint(object):
+
+    def __init__(self, name, obj):
+        self.name = name
+        self.obj = obj
+
+    def load(self):
+        if isinstance(self.obj, Exception):
+            raise self.obj
+        return self.obj
+
+
+def test_builtin_formats():
+    reg = registry.FormatRegistry(registry.get_builtin_specs())
+    assert reg.get_formats(registry.LOADER) == uc2const.LOADER_FORMATS
+    assert reg.get_formats(registry.SAVER) == uc2const.SAVER_FORMATS
+    assert uc2const.XML in reg.get_formats(registry.LOADER, True)
+    assert reg.get_by_extension('XML') == [uc2const.SCRIBUS_PAL,
+                                           uc2const.COREL_PAL, uc2const.XML]
+    assert reg.get_by_extension('unknown') == []
+    assert reg.get_loader(uc2const.GPL) is gpl_loader
+    assert reg.get_checker(uc2const.GPL) is check_gpl
+    assert reg.get_name(uc2const.GPL) == uc2const.FORMAT_NAMES[uc2const.GPL]
+    assert reg.is_palette(uc2const.ACO)
+    assert not reg.is_palette(uc2const.XML)
+
+
+def test_resolve_failure():
+    reg = registry.FormatRegistry(registry.get_builtin_specs())
+    assert reg.prewarm() == []
+    assert reg.prewarm([uc2const.MD, 'unknown']) == [uc2const.MD, 'unknown']
+    assert reg.get_loader(uc2const.MD) is None
+    assert (uc2const.MD, registry.LOADER) not in reg.resolved
+    reg.register(registry.FormatSpec(uc2const.MD, module='uc2.formats.gpl',
+                                     loader='gpl_loader'))
+    assert reg.get_loader(uc2const.MD) is gpl_loader
+
+
+def test_entry_points(tmp_path, monkeypatch):
+    entry_points = [EntryPoint('demo', lambda: [DEMO_SPEC]),
+                    EntryPoint('broken', ImportError('broken plugin'))]
+    monkeypatch.setattr(registry.metadata, 'entry_points',
+                        lambda **kw: entry_points)
+    monkeypatch.setattr(registry, 'REGISTRY', None)
+    reg = registry.get_registry()
+    assert reg is registry.get_registry()
+    assert reg.get_by_extension('dpal') == ['demo_pal']
+    assert 'demo_pal' in reg.get_formats(registry.LOADER)
+    assert 'demo_pal' not in reg.get_formats(registry.SAVER)
+    assert reg.get_saver('demo_pal') is None
+
+    path = str(tmp_path / 'palette.dpal')
+    with open(path, 'wb') as fileptr:
+        fileptr.write(b'DEMO PALETTE\n')
+    assert get_loader(path, return_id=True) == (gpl_loader, 'demo_pal')
+    reg.unregister('demo_pal')
+    assert reg.get_by_extension('dpal') == []
+    assert get_loader(path) is None
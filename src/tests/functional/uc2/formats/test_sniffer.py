@@ -0,0 +1,55 @@
+from uc2 import uc2const
+from uc2.formats import get_loader, sniffer
+
+ACO_DATA = b'\x00\x01\x00\x01\x00\x00\xff\xff\x00\x00\x00\x00\x00\x00'
+
+
+def test_sniff():
+    headers = [
+        (b'##sK1 palette\n', uc2const.SKP),
+        (b'GIMP Palette\nName: test\n', uc2const.GPL),
+        (b'ASEF\x00\x01\x00\x00', uc2const.ASE),
+        (b'JCW\x01', uc2const.JCW),
+        (b'<?xml version="1.0"?>\n<SCRIBUSCOLORS>', uc2const.SCRIBUS_PAL),
+        (b'<?xml version="1.0"?>\n<office:color-table>', uc2const.SOC),
+        (b'<?xml version="1.0"?>\n<palette name="test">',
+         uc2const.COREL_PAL),
+    ]
+    for data, fid in headers:
+        assert sniffer.get_confident(sniffer.sniff(data))[0] == fid
+
+
+def test_sniff_extension():
+    assert sniffer.get_confident(sniffer.sniff(ACO_DATA)) is None
+    fid, confidence = sniffer.get_confident(sniffer.sniff(ACO_DATA, 'aco'))
+    assert fid == uc2const.ACO
+    assert confidence == sniffer.CONFIDENT
+    assert sniffer.sniff(b'unknown data', 'aco') == []
+    assert sniffer.sniff(b'GIMP Palette\n', 'gpl') == [(uc2const.GPL, 1.0)]
+
+
+def test_sniff_ambiguous():
+    candidates = [(uc2const.ACO, 0.9), (uc2const.CPL, 0.9)]
+    assert sniffer.get_confident(candidates) is None
+    assert sniffer.get_confident([]) is None
+    assert sniffer.get_confident(candidates[:1]) == candidates[0]
+
+
+def test_get_loader(tmp_path):
+    files = [
+        ('palette.gpl', b'GIMP Palette\nName: test\n#\n0 0 0 Black\n',
+         uc2const.GPL),
+        ('palette.txt', b'GIMP Palette\nName: test\n#\n0 0 0 Black\n',
+         uc2const.GPL),
+        ('palette.aco', ACO_DATA, uc2const.ACO),
+        ('palette', ACO_DATA, uc2const.ACO),
+    ]
+    for filename, data, fid in files:
+        path = str(tmp_path / filename)
+        with open(path, 'wb') as fileptr:
+            fileptr.write(data)
+        assert get_loader(path, return_id=True)[1] == fid
+    path = str(tmp_path / 'unknown')
+    with open(path, 'wb') as fileptr:
+        fileptr.write(b'\xff\xfe\x00 binary data')
+    assert get_loader(path) is None
@@ -143,6 +143,9 @@ class UCApplication(object):
 
         self.default_cms = app_cms.AppColorManager(self)
         self.palettes = PaletteManager(self)
+        metrics_path = options.get('cms-metrics')
+        if metrics_path:
+            self.default_cms.enable_metrics()
 
         # EXECUTION ----------------------------
         status = 0
@@ -151,8 +154,21 @@ class UCApplication(object):
         except Exception:
             status = 1
 
+        if metrics_path:
+            self.dump_cms_metrics(metrics_path)
         if self.do_verbose:
             echo()
         sys.exit(status)
 
+    def dump_cms_metrics(self, path):
+        """Shows color management metrics or saves them as JSON
+        if file path is provided.
+        """
+        metrics = self.default_cms.metrics
+        if path is True:
+            echo()
+            echo(metrics.to_text())
+        else:
+            metrics.dump(str(path))
+
 
@@ -35,8 +35,12 @@ Example: color-picker-cmd drawing.cdr drawing.svg
  -v, --verbose   Show internal logs
  --log=          Logging level: DEBUG, INFO, WARN, ERROR (by default, INFO)
  --format=       Type of output file format (values provided below)
+ --transcode=    Direct palette transcoding without palette models:
+                 yes, no or auto (by default, auto - if it is lossless)
  --package-dir   Show installation directory (for import as Python package)
  --show-log      Show detailed log of previous run
+ --cms-metrics   Show color management metrics on exit
+ --cms-metrics=  Save color management metrics into JSON file on exit
  
 ---Bulk operations:---------------------------------
  
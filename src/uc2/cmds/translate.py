@@ -20,17 +20,24 @@ import glob
 import logging
 import os
 
-from uc2 import events, uc2const, msgconst
-from uc2.formats import get_loader, get_saver, get_saver_by_id
+from uc2 import events, msgconst
+from uc2.formats import get_loader, get_saver, get_saver_by_id, \
+    can_transcode, is_lossless_transcoding, transcode
+from uc2.formats.registry import SAVER, get_registry
 from uc2.utils.mixutils import echo
 
 LOG = logging.getLogger(__name__)
-SAVER_IDS = uc2const.PALETTE_SAVERS + uc2const.MODEL_SAVERS \
-            + uc2const.BITMAP_SAVERS
+
+TRANSCODE_AUTO = 'auto'
+
+
+def _is_saver_id(sid):
+    return sid in get_registry().get_formats(SAVER)
 
 
 def normalize_options(options):
-    for key in ('verbose', 'format', 'recursive', 'dry-run'):
+    for key in ('verbose', 'format', 'recursive', 'dry-run', 'cms-metrics',
+                'transcode'):
         if key in options:
             options.pop(key)
 
@@ -40,16 +47,33 @@ def normalize_options(options):
             options.pop(key)
 
 
+def _use_transcoding(mode, loader_id, saver_id):
+    """Defines translation pipeline by --transcode option value:
+    True (direct transcoding), False (translation through palette
+    models) or 'auto' (direct transcoding if it is lossless).
+    """
+    if mode is False:
+        return False
+    if mode is True:
+        if can_transcode(loader_id, saver_id):
+            return True
+        msg = 'Direct transcoding is not supported for this format pair'
+        events.emit(events.MESSAGES, msgconst.WARNING, msg)
+        return False
+    return is_lossless_transcoding(loader_id, saver_id)
+
+
 def convert(appdata, files, options):
     dry_run = bool(options.get('dry-run'))
+    sid = str(options.get('format', '')).lower()
+    transcoding = options.get('transcode', TRANSCODE_AUTO)
     normalize_options(options)
 
     msg = 'Translation of "%s" into "%s"' % (files[0], files[1])
     events.emit(events.MESSAGES, msgconst.JOB, msg)
 
     # Define saver -----------------------------------------
-    sid = options.get('format', '').lower()
-    if sid and sid in SAVER_IDS:
+    if sid and _is_saver_id(sid):
         saver_id = sid
         saver = get_saver_by_id(saver_id)
     else:
@@ -75,11 +99,32 @@ def convert(appdata, files, options):
     if dry_run:
         return
 
+    # Direct transcoding -----------------------------------
+    if _use_transcoding(transcoding, loader_id, saver_id):
+        msg = 'Direct transcoding is used'
+        events.emit(events.MESSAGES, msgconst.INFO, msg)
+        try:
+            transcode(files[0], files[1], loader_id, saver_id,
+                      cms=appdata.app.default_cms, **options)
+        except Exception:
+            msg = 'Error while transcoding "%s"' % files[0]
+            events.emit(events.MESSAGES, msgconst.ERROR, msg)
+
+            LOG.exception(msg)
+            msg2 = 'Translation is interrupted'
+            events.emit(events.MESSAGES, msgconst.STOP, msg2)
+            raise
+        msg = 'Translation is successful'
+        events.emit(events.MESSAGES, msgconst.OK, msg)
+        return
+
     # File loading -----------------------------------------
+    registry = get_registry()
+    palettes = registry.is_palette(loader_id) and \
+        registry.is_palette(saver_id)
     doc = None
     try:
-        if loader_id in uc2const.PALETTE_LOADERS and \
-                saver_id in uc2const.PALETTE_SAVERS:
+        if palettes:
             doc = loader(appdata, files[0], convert=True, **options)
         else:
             doc = loader(appdata, files[0], **options)
@@ -96,8 +141,7 @@ def convert(appdata, files, options):
     # File saving -----------------------------------------
     if doc is not None:
         try:
-            if loader_id in uc2const.PALETTE_LOADERS and \
-                    saver_id in uc2const.PALETTE_SAVERS:
+            if palettes:
                 saver(doc, files[1], translate=False, convert=True,
                       **options)
             else:
@@ -133,14 +177,14 @@ def _get_saver_extension(options):
         raise Exception(msg)
 
     sid = options.get('format', '').lower()
-    if sid not in SAVER_IDS:
+    if not _is_saver_id(sid):
         msg = 'Output file format is not supported.'
         events.emit(events.MESSAGES, msgconst.ERROR, msg)
 
         msg2 = 'Translation is interrupted'
         events.emit(events.MESSAGES, msgconst.STOP, msg2)
         raise Exception(msg)
-    return uc2const.FORMAT_EXTENSION[sid][0]
+    return get_registry().get_extensions(sid)[0]
 
 
 def _get_filelist(path, subpath, wildcard, recursive=False):
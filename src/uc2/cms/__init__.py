@@ -16,9 +16,26 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import copy
-from copy import deepcopy
-
-from . import libcms
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from functools import partial
+
+from . import metrics as cms_metrics
+
+try:
+    from . import cache as cms_cache
+    from . import libcms
+    from .cache import TRANSFORM_CACHE
+    from .catalog import PROFILE_CATALOG
+except ImportError:
+    libcms = cms_cache = TRANSFORM_CACHE = PROFILE_CATALOG = None
+
+try:
+    from . import lut, vectorized
+    from .color_array import ColorArray
+except ImportError:
+    lut = vectorized = ColorArray = None
 
 from uc2 import uc2const
 from uc2.uc2const import COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY, \
@@ -29,6 +46,68 @@ from uc2.uc2const import IMAGE_MONO, IMAGE_GRAY, IMAGE_RGB, IMAGE_CMYK, \
 
 CS = [COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY]
 
+# Max CIE76 color difference of colors considered as in-gamut ones
+GAMUT_THRESHOLD = 2.0
+
+
+class Color(namedtuple('Color', 'cs values alpha name')):
+    """
+    Immutable color record returned by color manager.
+    Record keeps [cs, values, alpha, name] layout, so item access,
+    unpacking, string representation and comparison with list
+    colors work as for regular colors. Trailing fields of list
+    colors (like palette name of spot colors) are ignored.
+    Records are shared instead of copying; use to_list() to get
+    mutable color.
+    """
+    __slots__ = ()
+
+    def __new__(cls, cs, values, alpha=1.0, name=''):
+        if cs == COLOR_SPOT:
+            values = tuple(tuple(item) for item in values)
+        else:
+            values = tuple(values)
+        return super().__new__(cls, cs, values, alpha, name)
+
+    @classmethod
+    def from_color(cls, color):
+        if isinstance(color, cls):
+            return color
+        return cls(*color[:4])
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            if len(other) < 4:
+                return False
+            try:
+                other = Color(*other[:4])
+            except TypeError:
+                return False
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self):
+        return repr(self.to_list())
+
+    __str__ = __repr__
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def to_list(self):
+        if self.cs == COLOR_SPOT:
+            values = [list(item) for item in self.values]
+        else:
+            values = list(self.values)
+        return [self.cs, values, self.alpha, self.name]
+
 
 def get_registration_black():
     return [COLOR_SPOT, [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0, 1.0]], 1.0, COLOR_REG]
@@ -38,14 +117,14 @@ def color_to_spot(color):
     if not color:
         return get_registration_black()
     if color[0] == COLOR_SPOT:
-        return deepcopy(color)
+        return Color.from_color(color).to_list()
     rgb = []
     cmyk = []
     name = ''
     if color[0] == COLOR_RGB:
-        rgb = deepcopy(color[1])
+        rgb = list(color[1])
     elif color[0] == COLOR_CMYK:
-        cmyk = deepcopy(color[1])
+        cmyk = list(color[1])
     elif color[0] == COLOR_GRAY:
         cmyk = gray_to_cmyk(color[1])
     if color[3]:
@@ -315,6 +394,17 @@ def do_simple_transform(color, cs_in, cs_out):
             return rgb_to_gray(lab_to_rgb(color))
 
 
+def do_simple_transform_many(values, cs_in, cs_out):
+    """
+    Emulates color management library transformation for list
+    of color values. Uses array based engine if NumPy is available.
+    """
+    if vectorized is None or \
+            (cs_in, cs_out) not in vectorized.TRANSFORMS:
+        return [do_simple_transform(item, cs_in, cs_out) for item in values]
+    return vectorized.do_simple_transform(values, cs_in, cs_out).tolist()
+
+
 def colorb(color=None, cmyk=False):
     """
     Emulates COLORB object from python-lcms.
@@ -368,11 +458,63 @@ def decode_colorb(colorb, color_type):
     return result
 
 
+CHANNELS = {COLOR_RGB: 3, COLOR_CMYK: 4, COLOR_LAB: 3, COLOR_GRAY: 1,
+            COLOR_DISPLAY: 3}
+
+# (array typecode, per channel (scale, offset)) for lcms 16-bit
+# and double precision formats
+PRECISION_FORMATS = {
+    uc2const.CMS_PRECISION_16: ('H', {
+        COLOR_RGB: ((65535.0, 0.0),) * 3,
+        COLOR_CMYK: ((65535.0, 0.0),) * 4,
+        COLOR_LAB: ((65535.0, 0.0),) * 3,
+        COLOR_GRAY: ((65535.0, 0.0),),
+    }),
+    uc2const.CMS_PRECISION_DBL: ('d', {
+        COLOR_RGB: ((1.0, 0.0),) * 3,
+        COLOR_CMYK: ((100.0, 0.0),) * 4,
+        COLOR_LAB: ((100.0, 0.0), (255.0, -128.0), (255.0, -128.0)),
+        COLOR_GRAY: ((1.0, 0.0),),
+    }),
+}
+
+
+def pack_colors(colors, cs, precision):
+    """
+    Packs color values into array of 16-bit or double precision
+    lcms pixels.
+    """
+    typecode, scales = PRECISION_FORMATS[precision]
+    scales = scales[COLOR_RGB if cs == COLOR_DISPLAY else cs]
+    vals = []
+    for color in colors:
+        values = color[1][0] if color[0] == COLOR_SPOT else color[1]
+        vals += [value * scale + offset
+                 for value, (scale, offset) in zip(values, scales)]
+    if typecode == 'H':
+        vals = [min(65535, max(0, int(round(value)))) for value in vals]
+    return array(typecode, vals)
+
+
+def unpack_colors(pixels, cs, precision):
+    """
+    Unpacks array of 16-bit or double precision lcms pixels
+    into list of generic color values.
+    """
+    scales = PRECISION_FORMATS[precision][1]
+    scales = scales[COLOR_RGB if cs == COLOR_DISPLAY else cs]
+    channels = len(scales)
+    vals = [min(1.0, max(0.0, (value - offset) / scale))
+            for value, (scale, offset) in zip(pixels, scales * (
+                len(pixels) // channels))]
+    return [vals[i:i + channels] for i in range(0, len(vals), channels)]
+
+
 def verbose_color(color):
     if not color:
         return 'No color'
     cs = color[0]
-    val = [] + color[1]
+    val = list(color[1])
     alpha = color[2]
     if cs == COLOR_CMYK:
         c, m, y, k = val_100(val)
@@ -408,55 +550,169 @@ def verbose_color(color):
 def get_profile_name(filepath):
     """Returns profile name.
     If file is not suitable profile or doesn't exist
-    returns None.
+    returns None. Metadata are cached by profile catalog.
     """
     try:
-        profile = libcms.cms_open_profile_from_file(filepath)
-        ret = libcms.cms_get_profile_name(profile)
+        return PROFILE_CATALOG.get(filepath).name
     except Exception:
-        ret = None
-    return ret
+        return None
 
 
 def get_profile_info(filepath):
     """Returns profile info.
     If file is not suitable profile or doesn't exist
-    returns None.
+    returns None. Metadata are cached by profile catalog.
     """
     try:
-        profile = libcms.cms_open_profile_from_file(filepath)
-        ret = libcms.cms_get_profile_info(profile)
+        return PROFILE_CATALOG.get(filepath).info
     except Exception:
-        ret = None
-    return ret
+        return None
 
 
 def get_profile_descr(filepath):
     """Returns profile description tuple (name, copyright, info).
     If file is not suitable profile or doesn't exist
-    returns None.
+    returns None. Metadata are cached by profile catalog.
     """
     try:
-        profile = libcms.cms_open_profile_from_file(filepath)
-        ret = (libcms.cms_get_profile_name(profile),)
-        ret += (libcms.cms_get_profile_copyright(profile),)
-        ret += (libcms.cms_get_profile_info(profile),)
+        info = PROFILE_CATALOG.get(filepath)
+        return info.name, info.copyright, info.info
     except Exception:
-        ret = ('', '', '')
-    return ret
+        return '', '', ''
+
+
+class ProfileRegistry(dict):
+    """Lazy registry of lcms profile handles.
+    Profiles are registered by colorspace with a source which is
+    either a profile file path or a callable returning profile handle.
+    Profile is opened on first access only, so unused profiles
+    are never parsed. Profile identifiers for transform cache keys
+    are also taken without opening profiles where possible.
+    """
+
+    sources = None
+    id_sources = None
+    ids = None
+
+    def __init__(self):
+        dict.__init__(self)
+        self.sources = {}
+        self.id_sources = {}
+        self.ids = {}
+
+    def __missing__(self, cs):
+        source = self.sources.get(cs)
+        if source is None:
+            raise KeyError(cs)
+        if callable(source):
+            handle = source()
+        else:
+            handle = libcms.cms_open_profile_from_file(source)
+        dict.__setitem__(self, cs, handle)
+        return handle
+
+    def __contains__(self, cs):
+        return dict.__contains__(self, cs) or cs in self.sources
+
+    def __setitem__(self, cs, handle):
+        self.sources.pop(cs, None)
+        self.id_sources.pop(cs, None)
+        self.ids.pop(cs, None)
+        dict.__setitem__(self, cs, handle)
+
+    def register(self, cs, source, id_source=None):
+        """
+        Registers profile source for colorspace. Previously opened
+        handle is dropped. Optional id_source callable returns
+        profile identifier without opening profile.
+        """
+        dict.pop(self, cs, None)
+        self.ids.pop(cs, None)
+        self.sources[cs] = source
+        if id_source is None:
+            self.id_sources.pop(cs, None)
+        else:
+            self.id_sources[cs] = id_source
+
+    def register_default(self, cs):
+        """
+        Registers built-in profile for colorspace.
+        """
+        self.register(cs, partial(libcms.cms_create_default_profile, cs),
+                      partial(cms_cache.get_default_profile_id, cs))
+
+    def link(self, cs, registry):
+        """
+        Shares colorspace profile of other registry
+        without opening it.
+        """
+        if dict.__contains__(registry, cs):
+            self[cs] = registry[cs]
+        else:
+            self.register(cs, lambda: registry[cs],
+                          lambda: registry.get_id(cs))
+
+    def get_profile(self, cs):
+        """
+        Returns callable which opens colorspace profile on demand.
+        """
+        if dict.__contains__(self, cs):
+            return dict.__getitem__(self, cs)
+        return partial(self.__getitem__, cs)
+
+    def get_id(self, cs):
+        """
+        Returns profile identifier of colorspace profile. Profile
+        is not opened if its source is a file or it has id_source.
+        """
+        profile_id = self.ids.get(cs)
+        if profile_id is None:
+            id_source = self.id_sources.get(cs)
+            source = self.sources.get(cs)
+            if id_source is not None:
+                profile_id = id_source()
+            elif isinstance(source, str):
+                profile_id = cms_cache.get_file_profile_id(source)
+            else:
+                profile_id = libcms.cms_get_profile_id(self[cs])
+            self.ids[cs] = profile_id
+        return profile_id
+
+    def is_opened(self, cs):
+        return dict.__contains__(self, cs)
+
+    def get_used(self):
+        """
+        Returns list of colorspaces which profiles were actually opened.
+        """
+        return [cs for cs in CS + [COLOR_DISPLAY, ] if self.is_opened(cs)]
 
 
 class ColorManager(object):
     """The class provides abstract color manager.
     On CM object instantiation default built-in profiles
     are used to create internal stuff.
+
+    Color conversion methods can be called from several threads.
+    Transforms and lookup tables are built once under manager lock
+    and display color cache is lock-protected. In thread-safe mode
+    manager also uses its own lcms context, so alarm codes and
+    lcms errors are isolated from other managers.
+
+    Manager activity can be measured by optional metrics object
+    (see enable_metrics()).
+
+    :param thread_safe: use own lcms context
     """
 
+    lock = None
+    thread_safe = False
+    context = None
     handles = None
     transforms = None
     proof_transforms = None
 
-    use_cms = True
+    use_cms = libcms is not None
     use_display_profile = False
     proofing = False
     gamutcheck = False
@@ -466,100 +722,471 @@ class ColorManager(object):
     rgb_intent = uc2const.INTENT_RELATIVE_COLORIMETRIC
     cmyk_intent = uc2const.INTENT_PERCEPTUAL
     flags = uc2const.cmsFLAGS_NOTPRECALC
-
-    def __init__(self):
+    bitmap_workers = 1
+    strip_height = 256
+    precision = uc2const.CMS_PRECISION_8
+
+    display_cache = None
+    display_cache_size = 16384
+    display_cache_hits = 0
+    display_cache_misses = 0
+
+    luts = None
+    use_lut = False
+    lut_sizes = None
+    lut_interpolation = 'tetrahedral'
+
+    metrics = None
+
+    def __init__(self, thread_safe=False):
+        self.lock = threading.RLock()
+        self.thread_safe = thread_safe
+        if thread_safe and libcms is not None:
+            self.context = libcms.cms_create_context()
         self.update()
 
     def update(self):
         """
         Sets color profile handles using built-in profiles
         """
-        self.handles = {}
+        self.handles = ProfileRegistry()
         self.clear_transforms()
+        if libcms is None:
+            return
         for item in CS:
-            self.handles[item] = libcms.cms_create_default_profile(item)
+            self.handles.register_default(item)
 
     def clear_transforms(self):
         self.transforms = {}
         self.proof_transforms = {}
+        self.luts = {}
+        self.clear_display_cache()
 
-    def get_transform(self, cs_in, cs_out):
+    def clear_display_cache(self):
+        with self.lock:
+            self.display_cache = OrderedDict()
+            self.display_cache_hits = self.display_cache_misses = 0
+
+    def enable_metrics(self, enable=True):
+        """
+        Enables or disables collecting of manager metrics.
+        Returns metrics object or None.
+        """
+        if not enable:
+            self.metrics = None
+        elif self.metrics is None:
+            self.metrics = cms_metrics.CmsMetrics()
+        return self.metrics
+
+    def count(self, name, value=1):
+        if self.metrics is not None:
+            self.metrics.count(name, value)
+
+    def call_lcms(self, func, *args):
+        """
+        Calls libcms function measuring its time if metrics are enabled.
+        """
+        if self.metrics is None:
+            return func(*args)
+        with self.metrics.timer(cms_metrics.LCMS_CALL):
+            return func(*args)
+
+    def call_bitmap_transform(self, transform, img, in_mode, out_mode):
+        if self.metrics is not None:
+            self.count_bitmap(img)
+        return self.call_lcms(libcms.cms_do_bitmap_transform, transform,
+                              img, in_mode, out_mode, self.bitmap_workers)
+
+    def count_bitmap(self, img):
+        width, height = img.size
+        self.count(cms_metrics.BITMAP_CALLS)
+        self.count(cms_metrics.BITMAP_MEGAPIXELS, width * height / 1e6)
+
+    def apply_alarm_codes(self):
+        """
+        Sets gamut check alarm codes into manager lcms context
+        or into global lcms context if manager is not thread-safe.
+        """
+        libcms.cms_set_alarm_codes(*val_255(self.alarm_codes),
+                                   context=self.context)
+
+    def get_flags(self):
+        """
+        Returns lcms flags for new transforms. Multithreaded bitmap
+        processing requires transforms without 1-pixel cache.
+        """
+        if self.bitmap_workers > 1:
+            return self.flags | uc2const.cmsFLAGS_NOCACHE
+        return self.flags
+
+    def get_transform(self, cs_in, cs_out,
+                      precision=uc2const.CMS_PRECISION_8):
         """
         Returns requested color transform using self.transforms dict.
-        If requested transform is not initialized yet, creates it.
+        If requested transform is not initialized yet, takes it from
+        process-wide transform cache or creates it.
+        Bitmap transforms are always 8-bit ones.
         """
-        tr_type = cs_in + cs_out
-        intent = self.rgb_intent
-        if cs_out == COLOR_CMYK:
-            intent = self.cmyk_intent
-        if tr_type not in self.transforms:
-            handle_in = self.handles[cs_in]
-            handle_out = self.handles[cs_out]
+        suffix = uc2const.CMS_PRECISION_SUFFIX[precision]
+        tr_type = cs_in + cs_out + suffix
+        tr = self.transforms.get(tr_type)
+        if tr is not None:
+            if self.metrics is not None:
+                self.count(cms_metrics.TRANSFORM_HITS)
+            return tr
+        with self.lock:
+            if tr_type in self.transforms:
+                return self.transforms[tr_type]
+            intent = self.rgb_intent
+            if cs_out == COLOR_CMYK:
+                intent = self.cmyk_intent
+            handles = self.handles
+            profile_ids = (handles.get_id(cs_in), handles.get_id(cs_out))
+            handle_in = handles.get_profile(cs_in)
+            handle_out = handles.get_profile(cs_out)
             if cs_out == COLOR_DISPLAY:
                 cs_out = COLOR_RGB
-            tr = libcms.cms_create_transform(handle_in, cs_in,
-                                             handle_out, cs_out,
-                                             intent, self.flags)
+            tr = TRANSFORM_CACHE.get_transform(handle_in, cs_in + suffix,
+                                               handle_out, cs_out + suffix,
+                                               intent, self.get_flags(),
+                                               self.context, self.metrics,
+                                               profile_ids)
             self.transforms[tr_type] = tr
-        return self.transforms[tr_type]
+            return tr
 
-    def get_proof_transform(self, cs_in):
+    def get_proof_transform(self, cs_in,
+                            precision=uc2const.CMS_PRECISION_8):
         """
         Returns requested proof transform using self.proof_transforms dict.
-        If requested transform is not initialized yet, creates it.
+        If requested transform is not initialized yet, takes it from
+        process-wide transform cache or creates it.
         """
-        tr_type = cs_in
-        if tr_type not in self.proof_transforms:
-            handle_in = self.handles[cs_in]
-            if self.use_display_profile and COLOR_DISPLAY in self.handles:
-                handle_out = self.handles[COLOR_DISPLAY]
-            else:
-                handle_out = self.handles[COLOR_RGB]
-            handle_proof = self.handles[COLOR_CMYK]
-            tr = libcms.cms_create_proofing_transform(handle_in, cs_in,
-                                                      handle_out, COLOR_RGB,
-                                                      handle_proof,
-                                                      self.cmyk_intent,
-                                                      self.rgb_intent,
-                                                      self.flags)
+        suffix = uc2const.CMS_PRECISION_SUFFIX[precision]
+        tr_type = cs_in + suffix
+        tr = self.proof_transforms.get(tr_type)
+        if tr is not None:
+            if self.metrics is not None:
+                self.count(cms_metrics.TRANSFORM_HITS)
+            return tr
+        with self.lock:
+            if tr_type in self.proof_transforms:
+                return self.proof_transforms[tr_type]
+            handles = self.handles
+            cs_out = COLOR_RGB
+            if self.use_display_profile and COLOR_DISPLAY in handles:
+                cs_out = COLOR_DISPLAY
+            profile_ids = (handles.get_id(cs_in), handles.get_id(cs_out),
+                           handles.get_id(COLOR_CMYK))
+            tr = TRANSFORM_CACHE.get_proofing_transform(
+                handles.get_profile(cs_in), cs_in + suffix,
+                handles.get_profile(cs_out), COLOR_RGB + suffix,
+                handles.get_profile(COLOR_CMYK), self.cmyk_intent,
+                self.rgb_intent, self.get_flags(), self.context,
+                self.metrics, profile_ids)
             self.proof_transforms[tr_type] = tr
-        return self.proof_transforms[tr_type]
+            return tr
 
     def do_transform(self, color, cs_in, cs_out):
         """
         Converts color between colorspaces.
         Returns list of color values.
         """
+        if self.metrics is not None:
+            self.count(cms_metrics.SINGLE_CALLS)
         if not self.use_cms:
+            self.count(cms_metrics.SIMPLE_TRANSFORMS)
             return do_simple_transform(color[1], cs_in, cs_out)
+        if not self.precision == uc2const.CMS_PRECISION_8:
+            transform = self.get_transform(cs_in, cs_out, self.precision)
+            return self.do_precise_transform(transform, [color, ],
+                                             cs_in, cs_out)[0]
         in_color = colorb(color)
         out_color = colorb()
         transform = self.get_transform(cs_in, cs_out)
-        libcms.cms_do_transform(transform, in_color, out_color)
+        self.call_lcms(libcms.cms_do_transform, transform, in_color, out_color)
         return decode_colorb(out_color, cs_out)
 
+    def get_colors_in(self, colors, cs):
+        """
+        Returns colors with values in provided colorspace.
+        Spot colors are replaced by their alternative values and colors
+        of other colorspaces are converted.
+        """
+        if all(color[0] == cs for color in colors):
+            return colors
+        return [color if color[0] == cs else self.get_color(color, cs)
+                for color in colors]
+
+    def do_transform_many(self, colors, cs_in, cs_out):
+        """
+        Converts list of colors between colorspaces using
+        single transform call. Colors which are not in cs_in colorspace
+        (spot colors or mixed input) are brought to cs_in first.
+        Returns list of color values lists.
+        """
+        if self.metrics is not None:
+            self.count(cms_metrics.BULK_CALLS)
+            self.count(cms_metrics.BULK_COLORS, len(colors))
+        colors = self.get_colors_in(colors, cs_in)
+        if self.use_lut and lut is not None:
+            self.count(cms_metrics.LUT_TRANSFORMS)
+            values = [color[1] for color in colors]
+            return self.get_lut(cs_in, cs_out)(values).tolist()
+        if not self.use_cms:
+            self.count(cms_metrics.SIMPLE_TRANSFORMS)
+            return do_simple_transform_many([color[1] for color in colors],
+                                            cs_in, cs_out)
+        if not self.precision == uc2const.CMS_PRECISION_8:
+            transform = self.get_transform(cs_in, cs_out, self.precision)
+            return self.do_precise_transform(transform, colors,
+                                             cs_in, cs_out)
+        in_colors = [colorb(color) for color in colors]
+        transform = self.get_transform(cs_in, cs_out)
+        out_colors = self.call_lcms(libcms.cms_do_transform_many, transform,
+                                    in_colors)
+        return [decode_colorb(color, cs_out) for color in out_colors]
+
+    def do_precise_transform(self, transform, colors, cs_in, cs_out):
+        """
+        Converts list of colors using 16-bit or double precision
+        transform according to self.precision.
+        Returns list of color values lists.
+        """
+        if not colors:
+            return []
+        src = pack_colors(colors, cs_in, self.precision)
+        dst = array(src.typecode, [0]) * (len(colors) * CHANNELS[cs_out])
+        self.call_lcms(libcms.cms_do_buffer_transform, transform, src, dst,
+                       len(colors))
+        return unpack_colors(dst, cs_out, self.precision)
+
+    def do_array_transform(self, arr, cs_in, cs_out):
+        """
+        Converts (N, channels) array of color values between colorspaces
+        using double precision transform or array based simple
+        transform if color management is off. Requires NumPy.
+        Returns new (N, channels) array.
+        """
+        arr = vectorized.to_array(arr, CHANNELS[cs_in])
+        if self.metrics is not None:
+            self.count(cms_metrics.BULK_CALLS)
+            self.count(cms_metrics.BULK_COLORS, len(arr))
+        if not self.use_cms:
+            self.count(cms_metrics.SIMPLE_TRANSFORMS)
+            if cs_out == COLOR_DISPLAY:
+                cs_out = COLOR_RGB
+            return vectorized.do_simple_transform(arr, cs_in, cs_out)
+        transform = self.get_transform(cs_in, cs_out,
+                                       uc2const.CMS_PRECISION_DBL)
+        return self.call_lcms(self.do_array_buffer_transform, transform,
+                              arr, cs_in, cs_out)
+
+    @staticmethod
+    def do_array_buffer_transform(transform, arr, cs_in, cs_out):
+        """
+        Converts (N, channels) array of color values using double
+        precision transform.
+        Returns new (N, channels) array.
+        """
+        scales = PRECISION_FORMATS[uc2const.CMS_PRECISION_DBL][1]
+        src = vectorized.pack_array(arr, scales[cs_in])
+        dst = vectorized.np.zeros((len(arr), CHANNELS[cs_out]))
+        if len(arr):
+            libcms.cms_do_buffer_transform(transform, src, dst, len(arr))
+        if cs_out == COLOR_DISPLAY:
+            cs_out = COLOR_RGB
+        return vectorized.unpack_array(dst, scales[cs_out])
+
+    @staticmethod
+    def group_colors(colors, spot_cs=COLOR_RGB):
+        """
+        Groups list of colors or ColorArray by colorspace for batched
+        processing. Spot colors are represented by spot_cs alternative
+        values if they are present or by other alternative values.
+        Returns dict of (color indexes, color values) tuples.
+        """
+        if ColorArray is not None and isinstance(colors, ColorArray):
+            return colors.group_values(spot_cs)
+        groups = {}
+        for index, color in enumerate(colors):
+            cs, values = color[0], color[1]
+            if cs == COLOR_SPOT:
+                rgb, cmyk = values
+                if spot_cs == COLOR_CMYK:
+                    cs, values = (COLOR_CMYK, cmyk) if cmyk \
+                        else (COLOR_RGB, rgb)
+                else:
+                    cs, values = (COLOR_RGB, rgb) if rgb \
+                        else (COLOR_CMYK, cmyk)
+            group = groups.setdefault(cs, ([], []))
+            group[0].append(index)
+            group[1].append(values)
+        return groups
+
+    def get_lab_array(self, colors):
+        """
+        Converts list of colors into L*a*b* colorspace using one
+        batched transform per colorspace. Requires NumPy.
+        Returns (N, 3) array of Lab color values.
+        """
+        lab = vectorized.np.zeros((len(colors), 3))
+        for cs, (indexes, values) in self.group_colors(colors).items():
+            arr = vectorized.to_array(values, CHANNELS[cs])
+            if not cs == COLOR_LAB:
+                arr = self.do_array_transform(arr, cs, COLOR_LAB)
+            lab[indexes] = arr
+        return lab
+
+    def get_colors(self, colors, cs=COLOR_RGB):
+        """
+        Converts list of colors or ColorArray into requested colorspace
+        using one batched transform per source colorspace.
+        Stores alpha channels and color names. Requires NumPy.
+        Returns ColorArray for ColorArray and list of colors otherwise.
+        """
+        is_array = isinstance(colors, ColorArray)
+        spot_cs = COLOR_CMYK if cs == COLOR_CMYK else COLOR_RGB
+        result = vectorized.np.zeros((len(colors), CHANNELS[cs]))
+        for cs_in, (indexes, values) in \
+                self.group_colors(colors, spot_cs).items():
+            arr = vectorized.to_array(values, CHANNELS[cs_in])
+            if not cs_in == cs:
+                arr = self.do_array_transform(arr, cs_in, cs)
+            result[indexes] = arr
+        if is_array:
+            names = [colors.get_name(i) for i in range(len(colors))]
+            return ColorArray.from_arrays(cs, result,
+                                          colors.alpha[:len(colors)], names)
+        return [[cs, values, color[2], color[3]]
+                for values, color in zip(result.tolist(), colors)]
+
+    def get_gamut_transform(self, cs_in, target_cs):
+        """
+        Returns double precision transform into Lab which simulates
+        reproduction of colors on target colorspace device.
+        """
+        tr_type = cs_in + target_cs + COLOR_LAB
+        tr = self.proof_transforms.get(tr_type)
+        if tr is not None:
+            if self.metrics is not None:
+                self.count(cms_metrics.TRANSFORM_HITS)
+            return tr
+        with self.lock:
+            if tr_type in self.proof_transforms:
+                return self.proof_transforms[tr_type]
+            suffix = uc2const.CMS_PRECISION_SUFFIX[uc2const.CMS_PRECISION_DBL]
+            intent = uc2const.INTENT_RELATIVE_COLORIMETRIC
+            flags = self.get_flags() | uc2const.cmsFLAGS_SOFTPROOFING
+            flags &= ~uc2const.cmsFLAGS_GAMUTCHECK
+            handles = self.handles
+            profile_ids = (handles.get_id(cs_in), handles.get_id(COLOR_LAB),
+                           handles.get_id(target_cs))
+            tr = TRANSFORM_CACHE.get_proofing_transform(
+                handles.get_profile(cs_in), cs_in + suffix,
+                handles.get_profile(COLOR_LAB), COLOR_LAB + suffix,
+                handles.get_profile(target_cs), intent, intent, flags,
+                self.context, self.metrics, profile_ids)
+            self.proof_transforms[tr_type] = tr
+            return tr
+
+    def gamut_check(self, colors, target_cs=COLOR_CMYK,
+                    threshold=GAMUT_THRESHOLD):
+        """
+        Checks whether colors are reproducible in target colorspace.
+        Colors are converted in batches by colorspace; color difference
+        is measured between colorimetric Lab value and Lab value
+        reproduced through target colorspace profile.
+        Returns tuple of boolean in-gamut mask and CIE76 color
+        difference arrays.
+        """
+        delta_e = vectorized.np.zeros(len(colors))
+        for cs, (indexes, values) in self.group_colors(colors).items():
+            if cs == target_cs:
+                continue
+            arr = vectorized.to_array(values, CHANNELS[cs])
+            lab = self.do_array_transform(arr, cs, COLOR_LAB)
+            if self.use_cms:
+                transform = self.get_gamut_transform(cs, target_cs)
+                reproduced = self.call_lcms(self.do_array_buffer_transform,
+                                            transform, arr, cs, COLOR_LAB)
+            else:
+                reproduced = self.do_array_transform(
+                    self.do_array_transform(arr, cs, target_cs),
+                    target_cs, COLOR_LAB)
+            delta_e[indexes] = vectorized.delta_e76(lab, reproduced)
+        return delta_e <= threshold, delta_e
+
+    def get_lut(self, cs_in, cs_out):
+        """
+        Returns lookup table for requested transform using self.luts dict.
+        If lookup table is not initialized yet, samples exact transform
+        onto grid of self.lut_sizes (or lut.GRID_SIZES) nodes per channel.
+        """
+        tr_type = cs_in + cs_out
+        color_lut = self.luts.get(tr_type)
+        if color_lut is not None:
+            return color_lut
+        with self.lock:
+            if tr_type in self.luts:
+                return self.luts[tr_type]
+            sizes = self.lut_sizes or lut.GRID_SIZES
+            func = partial(self.do_array_transform, cs_in=cs_in, cs_out=cs_out)
+            color_lut = lut.ColorLUT.build(func, CHANNELS[cs_in],
+                                           sizes[cs_in],
+                                           self.lut_interpolation)
+            self.luts[tr_type] = color_lut
+            return color_lut
+
+    def set_lut(self, cs_in, cs_out, color_lut):
+        """
+        Sets prepared (for example, loaded) lookup table for transform.
+        Lookup tables are dropped on transforms clearing.
+        """
+        self.luts[cs_in + cs_out] = color_lut
+
+    def get_lut_error(self, cs_in, cs_out, samples=10000):
+        """
+        Measures lookup table accuracy against exact transform
+        on random input colors.
+        Returns max CIE76 color difference.
+        """
+        rng = vectorized.np.random.default_rng(0)
+        arr = rng.random((samples, CHANNELS[cs_in]))
+        exact = self.do_array_transform(arr, cs_in, cs_out)
+        approx = self.get_lut(cs_in, cs_out)(arr)
+        if not cs_out == COLOR_LAB:
+            exact = self.do_array_transform(exact, cs_out, COLOR_LAB)
+            approx = self.do_array_transform(approx, cs_out, COLOR_LAB)
+        return lut.max_delta_e(exact, approx)
+
     def do_bitmap_transform(self, img, mode, cs_out=None):
         """
         Does image proof transform.
         Returns new image instance.
         """
         if not self.use_cms and not img.mode == IMAGE_LAB:
+            if self.metrics is not None:
+                self.count_bitmap(img)
             return img.convert(mode)
         cs_in = IMAGE_TO_COLOR[img.mode]
         if not cs_out:
             cs_out = IMAGE_TO_COLOR[mode]
         transform = self.get_transform(cs_in, cs_out)
-        return libcms.cms_do_bitmap_transform(transform, img, img.mode, mode)
+        return self.call_bitmap_transform(transform, img, img.mode, mode)
 
     def do_proof_transform(self, color, cs_in):
         """
         Does color proof transform.
         Returns list of color values.
         """
+        if not self.precision == uc2const.CMS_PRECISION_8:
+            transform = self.get_proof_transform(cs_in, self.precision)
+            return self.do_precise_transform(transform, [color, ],
+                                             cs_in, COLOR_RGB)[0]
         in_color = colorb(color)
         out_color = colorb()
         transform = self.get_proof_transform(cs_in)
-        libcms.cms_do_transform(transform, in_color, out_color)
+        self.call_lcms(libcms.cms_do_transform, transform, in_color, out_color)
         return decode_colorb(out_color, COLOR_RGB)
 
     def do_proof_bitmap_transform(self, img):
@@ -570,48 +1197,49 @@ class ColorManager(object):
         cs_in = IMAGE_TO_COLOR[img.mode]
         mode = IMAGE_RGB
         transform = self.get_proof_transform(cs_in)
-        return libcms.cms_do_bitmap_transform(transform, img, img.mode, mode)
+        return self.call_bitmap_transform(transform, img, img.mode, mode)
 
     # Color management API
     def get_rgb_color(self, color):
         """
         Convert color into RGB color.
         Stores alpha channel and color name.
+        Returns Color record.
         """
         if color[0] == COLOR_RGB:
-            return deepcopy(color)
+            return Color.from_color(color)
         if color[0] == COLOR_SPOT:
             if color[1][0]:
-                return [COLOR_RGB, [] + color[1][0], color[2], color[3]]
+                return Color(COLOR_RGB, color[1][0], color[2], color[3])
             else:
-                clr = [COLOR_CMYK, [] + color[1][1], color[2], color[3]]
+                clr = Color(COLOR_CMYK, color[1][1], color[2], color[3])
             return self.get_rgb_color(clr)
         res = self.do_transform(color, color[0], COLOR_RGB)
-        return [COLOR_RGB, res, color[2], color[3]]
+        return Color(COLOR_RGB, res, color[2], color[3])
 
     def get_rgb_color255(self, color):
         return val_255(self.get_rgb_color(color)[1])
 
     def get_rgba_color255(self, color):
         clr = self.get_rgb_color(color)
-        clr[1].append(clr[2])
-        return val_255(clr[1])
+        return val_255(list(clr[1]) + [clr[2]])
 
     def get_cmyk_color(self, color):
         """
         Convert color into CMYK color.
         Stores alpha channel and color name.
+        Returns Color record.
         """
         if color[0] == COLOR_CMYK:
-            return deepcopy(color)
+            return Color.from_color(color)
         if color[0] == COLOR_SPOT:
             if color[1][1]:
-                return [COLOR_CMYK, [] + color[1][1], color[2], color[3]]
+                return Color(COLOR_CMYK, color[1][1], color[2], color[3])
             else:
-                clr = [COLOR_RGB, [] + color[1][0], color[2], color[3]]
+                clr = Color(COLOR_RGB, color[1][0], color[2], color[3])
                 return self.get_cmyk_color(clr)
         res = self.do_transform(color, color[0], COLOR_CMYK)
-        return [COLOR_CMYK, res, color[2], color[3]]
+        return Color(COLOR_CMYK, res, color[2], color[3])
 
     def get_cmyk_color255(self, color):
         return val_255(self.get_cmyk_color(color)[1])
@@ -620,36 +1248,39 @@ class ColorManager(object):
         """
         Convert color into L*a*b* color.
         Stores alpha channel and color name.
+        Returns Color record.
         """
         if color[0] == COLOR_LAB:
-            return deepcopy(color)
+            return Color.from_color(color)
         if color[0] == COLOR_SPOT:
             if color[1][0]:
-                color = [COLOR_RGB, [] + color[1][0], color[2], color[3]]
+                color = Color(COLOR_RGB, color[1][0], color[2], color[3])
             else:
-                color = [COLOR_CMYK, [] + color[1][1], color[2], color[3]]
+                color = Color(COLOR_CMYK, color[1][1], color[2], color[3])
         res = self.do_transform(color, color[0], COLOR_LAB)
-        return [COLOR_LAB, res, color[2], color[3]]
+        return Color(COLOR_LAB, res, color[2], color[3])
 
     def get_grayscale_color(self, color):
         """
         Convert color into Grayscale color.
         Stores alpha channel and color name.
+        Returns Color record.
         """
         if color[0] == COLOR_GRAY:
-            return deepcopy(color)
+            return Color.from_color(color)
         if color[0] == COLOR_SPOT:
             if color[1][0]:
-                color = [COLOR_RGB, [] + color[1][0], color[2], color[3]]
+                color = Color(COLOR_RGB, color[1][0], color[2], color[3])
             else:
-                color = [COLOR_CMYK, [] + color[1][1], color[2], color[3]]
+                color = Color(COLOR_CMYK, color[1][1], color[2], color[3])
         res = self.do_transform(color, color[0], COLOR_GRAY)
-        return [COLOR_GRAY, res, color[2], color[3]]
+        return Color(COLOR_GRAY, res, color[2], color[3])
 
     def get_color(self, color, cs=COLOR_RGB):
         """
         Convert color into requested colorspace.
         Stores alpha channel and color name.
+        Returns Color record.
         """
         methods_map = {COLOR_RGB: self.get_rgb_color,
                        COLOR_LAB: self.get_lab_color,
@@ -671,6 +1302,36 @@ class ColorManager(object):
         return [color0[0], clr_vals, alpha, '']
 
     def get_display_color(self, color):
+        """
+        Returns display color representation using bounded LRU cache
+        keyed by colorspace and color values. Cache is dropped
+        on transforms clearing.
+        Returns list of RGB values.
+        """
+        values = color[1]
+        if color[0] == COLOR_SPOT:
+            values = tuple(tuple(item) for item in values)
+        key = (color[0], tuple(values))
+        with self.lock:
+            ret = self.display_cache.get(key)
+            if ret is not None:
+                self.display_cache_hits += 1
+                self.display_cache.move_to_end(key)
+                if self.metrics is not None:
+                    self.count(cms_metrics.DISPLAY_CACHE_HITS)
+                return list(ret)
+            self.display_cache_misses += 1
+            if self.metrics is not None:
+                self.count(cms_metrics.DISPLAY_CACHE_MISSES)
+        ret = self.calc_display_color(color)
+        with self.lock:
+            if self.display_cache_size > 0:
+                self.display_cache[key] = tuple(ret)
+                if len(self.display_cache) > self.display_cache_size:
+                    self.display_cache.popitem(last=False)
+        return list(ret)
+
+    def calc_display_color(self, color):
         """
         Calcs display color representation.
         Returns list of RGB values.
@@ -732,6 +1393,26 @@ class ColorManager(object):
             return ret.convert(IMAGE_MONO)
         return self.do_bitmap_transform(img, outmode, cs_out)
 
+    def convert_image_stream(self, reader, writer, outmode, cs_out=None):
+        """
+        Converts image between colorspaces strip by strip, so only
+        strip_height rows of source and target pixels are kept
+        in memory. Bilevel target is not supported: error diffusion
+        would restart on every strip leaving seams, so the image should
+        be streamed into grayscale and dithered as a whole.
+
+        :param reader: strip reader (see uc2.cms.image_stream)
+        :param writer: strip writer (see uc2.cms.image_stream)
+        :param outmode: target image mode
+        :param cs_out: target colorspace, defined by outmode if None
+        """
+        if outmode == IMAGE_MONO:
+            raise ValueError('Bilevel images cannot be converted by strips')
+        width, height = reader.size
+        for y in range(0, height, self.strip_height):
+            strip = reader.read(y, min(self.strip_height, height - y))
+            writer.write(y, self.convert_image(strip, outmode, cs_out))
+
     def adjust_image(self, img, profilestr):
         """
         Adjust image with embedded profile to similar colorspace
@@ -745,10 +1426,11 @@ class ColorManager(object):
         intent = self.rgb_intent
         if cs_out == COLOR_CMYK:
             intent = self.cmyk_intent
-        transform = libcms.cms_create_transform(custom_profile, cs_in,
-                                                out_profile, cs_out, intent,
-                                                self.flags)
-        return libcms.cms_do_bitmap_transform(transform, img, cs_in, cs_out)
+        transform = TRANSFORM_CACHE.get_transform(custom_profile, cs_in,
+                                                  out_profile, cs_out, intent,
+                                                  self.get_flags(),
+                                                  self.context, self.metrics)
+        return self.call_bitmap_transform(transform, img, cs_in, cs_out)
 
     def get_display_image(self, img):
         """
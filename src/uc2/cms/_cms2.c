@@ -16,6 +16,7 @@
  *	along with this program.  If not, see <https://www.gnu.org/licenses/>.
  */
 
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <lcms2.h>
 #include "Imaging.h"
@@ -62,6 +63,31 @@ getLCMStype (char* mode) {
   else if (strcmp(mode, "LAB") == 0) {
     return TYPE_Lab_8;
   }
+  /* high precision color modes */
+  else if (strcmp(mode, "RGB;16") == 0) {
+    return TYPE_RGB_16;
+  }
+  else if (strcmp(mode, "CMYK;16") == 0) {
+    return TYPE_CMYK_16;
+  }
+  else if (strcmp(mode, "LAB;16") == 0) {
+    return TYPE_Lab_16;
+  }
+  else if (strcmp(mode, "Grayscale;16") == 0) {
+    return TYPE_GRAY_16;
+  }
+  else if (strcmp(mode, "RGB;DBL") == 0) {
+    return TYPE_RGB_DBL;
+  }
+  else if (strcmp(mode, "CMYK;DBL") == 0) {
+    return TYPE_CMYK_DBL;
+  }
+  else if (strcmp(mode, "LAB;DBL") == 0) {
+    return TYPE_Lab_DBL;
+  }
+  else if (strcmp(mode, "Grayscale;DBL") == 0) {
+    return TYPE_GRAY_DBL;
+  }
 
   else {
     return TYPE_GRAY_8;
@@ -93,16 +119,16 @@ pycms_OpenProfile(PyObject *self, PyObject *args) {
 static PyObject *
 pycms_OpenProfileFromString(PyObject *self, PyObject *args) {
 
-	long size;
+	Py_ssize_t size;
 	char *profile;
 	cmsHPROFILE hProfile;
 
-	if (!PyArg_ParseTuple(args, "s#", &profile, &size)){
+	if (!PyArg_ParseTuple(args, "y#", &profile, &size)){
 		Py_INCREF(Py_None);
 		return Py_None;
 	}
 
-	hProfile = 	cmsOpenProfileFromMem(profile, size);
+	hProfile = 	cmsOpenProfileFromMem(profile, (cmsUInt32Number) size);
 
 	if(hProfile==NULL) {
 		Py_INCREF(Py_None);
@@ -160,6 +186,126 @@ pycms_CreateGrayProfile(PyObject *self, PyObject *args) {
 	return Py_BuildValue("O", PyCapsule_New((void *)hProfile, NULL, (void *)cmsCloseProfile));
 }
 
+//============lcms contexts==============
+
+#define CONTEXT_CAPSULE "cmsContext"
+#define CONTEXT_ERROR_SIZE 512
+
+typedef struct {
+	cmsUInt32Number code;
+	char text[CONTEXT_ERROR_SIZE];
+} ContextErrorData;
+
+static void
+contextErrorHandler (cmsContext ContextID, cmsUInt32Number ErrorCode, const char *Text) {
+
+	ContextErrorData *data = (ContextErrorData *) cmsGetContextUserData(ContextID);
+
+	if(data==NULL) return;
+	data->code = ErrorCode;
+	strncpy(data->text, Text, CONTEXT_ERROR_SIZE - 1);
+	data->text[CONTEXT_ERROR_SIZE - 1] = 0;
+}
+
+static void
+deleteContext (PyObject *capsule) {
+
+	cmsContext ContextID = (cmsContext) PyCapsule_GetPointer(capsule, CONTEXT_CAPSULE);
+	void *data;
+
+	if(ContextID==NULL) return;
+	data = cmsGetContextUserData(ContextID);
+	cmsDeleteContext(ContextID);
+	free(data);
+}
+
+// Returns lcms context of optional context argument.
+// Py_None means global context.
+static int
+getContext (PyObject *context, cmsContext *ContextID) {
+
+	*ContextID = NULL;
+	if(context==NULL || context==Py_None) return 1;
+	*ContextID = (cmsContext) PyCapsule_GetPointer(context, CONTEXT_CAPSULE);
+	return *ContextID != NULL;
+}
+
+// Releases transform and reference to its context
+static void
+deleteTransform (PyObject *capsule) {
+
+	cmsHTRANSFORM hTransform = (cmsHTRANSFORM) PyCapsule_GetPointer(capsule, NULL);
+	PyObject *context = (PyObject *) PyCapsule_GetContext(capsule);
+
+	if(hTransform!=NULL) cmsDeleteTransform(hTransform);
+	Py_XDECREF(context);
+}
+
+// Wraps transform into capsule which keeps reference to its context
+static PyObject *
+wrapTransform (cmsHTRANSFORM hTransform, PyObject *context) {
+
+	PyObject *capsule = PyCapsule_New((void *)hTransform, NULL, deleteTransform);
+
+	if(capsule==NULL) {
+		cmsDeleteTransform(hTransform);
+		return NULL;
+	}
+	if(context!=NULL && context!=Py_None) {
+		Py_INCREF(context);
+		PyCapsule_SetContext(capsule, (void *)context);
+	}
+	return capsule;
+}
+
+static PyObject *
+pycms_CreateContext (PyObject *self, PyObject *args) {
+
+	ContextErrorData *data;
+	cmsContext ContextID;
+
+	data = (ContextErrorData *) calloc(1, sizeof(ContextErrorData));
+	if(data==NULL) return PyErr_NoMemory();
+
+	ContextID = cmsCreateContext(NULL, (void *)data);
+	if(ContextID==NULL) {
+		free(data);
+		PyErr_SetString(PyExc_RuntimeError, "Cannot create lcms context");
+		return NULL;
+	}
+	cmsSetLogErrorHandlerTHR(ContextID, contextErrorHandler);
+
+	return PyCapsule_New((void *)ContextID, CONTEXT_CAPSULE, deleteContext);
+}
+
+static PyObject *
+pycms_GetContextError (PyObject *self, PyObject *args) {
+
+	PyObject *context;
+	cmsContext ContextID;
+	ContextErrorData *data;
+	PyObject *result;
+
+	if (!PyArg_ParseTuple(args, "O", &context)) {
+		return NULL;
+	}
+	if (!getContext(context, &ContextID) || ContextID==NULL) {
+		PyErr_Clear();
+		PyErr_SetString(PyExc_TypeError, "lcms context handle expected");
+		return NULL;
+	}
+
+	data = (ContextErrorData *) cmsGetContextUserData(ContextID);
+	if(data==NULL || !data->code) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+	result = Py_BuildValue("(Is)", data->code, data->text);
+	data->code = 0;
+	data->text[0] = 0;
+	return result;
+}
+
 static PyObject *
 pycms_BuildTransform (PyObject *self, PyObject *args) {
 
@@ -170,10 +316,13 @@ pycms_BuildTransform (PyObject *self, PyObject *args) {
 	cmsUInt32Number flags;
 	void *inputProfile;
 	void *outputProfile;
+	PyObject *context = NULL;
+	cmsContext ContextID;
 	cmsHPROFILE hInputProfile, hOutputProfile;
 	cmsHTRANSFORM hTransform;
 
-	if (!PyArg_ParseTuple(args, "OsOsii", &inputProfile, &inMode, &outputProfile, &outMode, &renderingIntent, &inFlags)) {
+	if (!PyArg_ParseTuple(args, "OsOsii|O", &inputProfile, &inMode, &outputProfile, &outMode,
+			&renderingIntent, &inFlags, &context) || !getContext(context, &ContextID)) {
 		Py_INCREF(Py_None);
 		return Py_None;
 	}
@@ -182,7 +331,7 @@ pycms_BuildTransform (PyObject *self, PyObject *args) {
 	hOutputProfile = (cmsHPROFILE) PyCapsule_GetPointer(outputProfile, NULL);
 	flags = (cmsUInt32Number) inFlags;
 
-	hTransform = cmsCreateTransform(hInputProfile, getLCMStype(inMode),
+	hTransform = cmsCreateTransformTHR(ContextID, hInputProfile, getLCMStype(inMode),
 			hOutputProfile, getLCMStype(outMode), renderingIntent, flags);
 
 	if(hTransform==NULL) {
@@ -190,7 +339,7 @@ pycms_BuildTransform (PyObject *self, PyObject *args) {
 		return Py_None;
 	}
 
-	return Py_BuildValue("O", PyCapsule_New((void *)hTransform, NULL, (void *)cmsDeleteTransform));
+	return wrapTransform(hTransform, context);
 }
 
 static PyObject *
@@ -206,11 +355,14 @@ pycms_BuildProofingTransform (PyObject *self, PyObject *args) {
 	void *outputProfile;
 	void *proofingProfile;
 
+	PyObject *context = NULL;
+	cmsContext ContextID;
 	cmsHPROFILE hInputProfile, hOutputProfile, hProofingProfile;
 	cmsHTRANSFORM hTransform;
 
-	if (!PyArg_ParseTuple(args, "OsOsOiii", &inputProfile, &inMode, &outputProfile, &outMode,
-			&proofingProfile, &renderingIntent, &proofingIntent, &inFlags)) {
+	if (!PyArg_ParseTuple(args, "OsOsOiii|O", &inputProfile, &inMode, &outputProfile, &outMode,
+			&proofingProfile, &renderingIntent, &proofingIntent, &inFlags, &context)
+			|| !getContext(context, &ContextID)) {
 		Py_INCREF(Py_None);
 		return Py_None;
 	}
@@ -220,7 +372,7 @@ pycms_BuildProofingTransform (PyObject *self, PyObject *args) {
 	hProofingProfile = (cmsHPROFILE) PyCapsule_GetPointer(proofingProfile, NULL);
 	flags = (cmsUInt32Number) inFlags;
 
-	hTransform = cmsCreateProofingTransform(hInputProfile, getLCMStype(inMode),
+	hTransform = cmsCreateProofingTransformTHR(ContextID, hInputProfile, getLCMStype(inMode),
 			hOutputProfile, getLCMStype(outMode), hProofingProfile, renderingIntent, proofingIntent, flags);
 
 	if(hTransform==NULL) {
@@ -228,16 +380,108 @@ pycms_BuildProofingTransform (PyObject *self, PyObject *args) {
 		return Py_None;
 	}
 
-	return Py_BuildValue("O", PyCapsule_New((void *)hTransform, NULL, (void *)cmsDeleteTransform));
+	return wrapTransform(hTransform, context);
+}
+
+static PyObject *
+pycms_BuildDeviceLinkTransform (PyObject *self, PyObject *args) {
+
+	char *inMode;
+	char *outMode;
+	int renderingIntent;
+	int inFlags;
+	void *deviceLink;
+	PyObject *context = NULL;
+	cmsContext ContextID;
+	cmsHPROFILE hDeviceLink;
+	cmsHTRANSFORM hTransform;
+
+	if (!PyArg_ParseTuple(args, "Ossii|O", &deviceLink, &inMode, &outMode,
+			&renderingIntent, &inFlags, &context)) {
+		return NULL;
+	}
+	if (!getContext(context, &ContextID)) {
+		PyErr_Clear();
+		PyErr_SetString(PyExc_TypeError, "lcms context handle expected");
+		return NULL;
+	}
+
+	hDeviceLink = (cmsHPROFILE) PyCapsule_GetPointer(deviceLink, NULL);
+	if (hDeviceLink == NULL) {
+		return NULL;
+	}
+
+	hTransform = cmsCreateTransformTHR(ContextID, hDeviceLink, getLCMStype(inMode),
+			NULL, getLCMStype(outMode), renderingIntent, (cmsUInt32Number) inFlags);
+
+	if(hTransform==NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+
+	return wrapTransform(hTransform, context);
+}
+
+/* Serializes transform as ICC device link profile */
+static PyObject *
+pycms_SaveDeviceLink (PyObject *self, PyObject *args) {
+
+	void *transform;
+	double version;
+	int inFlags;
+	cmsHTRANSFORM hTransform;
+	cmsHPROFILE hDeviceLink;
+	cmsUInt32Number size = 0;
+	PyObject *result;
+
+	if (!PyArg_ParseTuple(args, "Odi", &transform, &version, &inFlags)) {
+		return NULL;
+	}
+
+	hTransform = (cmsHTRANSFORM) PyCapsule_GetPointer(transform, NULL);
+	if (hTransform == NULL) {
+		return NULL;
+	}
+
+	hDeviceLink = cmsTransform2DeviceLink(hTransform, version, (cmsUInt32Number) inFlags);
+	if (hDeviceLink == NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+
+	if (!cmsSaveProfileToMem(hDeviceLink, NULL, &size)) {
+		cmsCloseProfile(hDeviceLink);
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+
+	result = PyBytes_FromStringAndSize(NULL, (Py_ssize_t) size);
+	if (result == NULL) {
+		cmsCloseProfile(hDeviceLink);
+		return NULL;
+	}
+
+	if (!cmsSaveProfileToMem(hDeviceLink, PyBytes_AS_STRING(result), &size)) {
+		Py_DECREF(result);
+		cmsCloseProfile(hDeviceLink);
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+
+	cmsCloseProfile(hDeviceLink);
+	return result;
 }
 
 static PyObject *
 pycms_SetAlarmCodes (PyObject *self, PyObject *args) {
 
 	int red, green, blue;
+	PyObject *context = NULL;
+	cmsContext ContextID;
 	cmsUInt16Number alarm_codes[cmsMAXCHANNELS] = { 0, };
 
-	if (!PyArg_ParseTuple(args, "iii", &red, &green, &blue)) {
+	if (!PyArg_ParseTuple(args, "iii|O", &red, &green, &blue, &context)
+			|| !getContext(context, &ContextID)) {
 		Py_INCREF(Py_None);
 		return Py_None;
 	}
@@ -246,7 +490,7 @@ pycms_SetAlarmCodes (PyObject *self, PyObject *args) {
 	alarm_codes[1] = (cmsUInt16Number) green * 256;
 	alarm_codes[2] = (cmsUInt16Number) blue * 256;
 
-	cmsSetAlarmCodes(alarm_codes);
+	cmsSetAlarmCodesTHR(ContextID, alarm_codes);
 
 	Py_INCREF(Py_None);
 	return Py_None;
@@ -313,6 +557,149 @@ pycms_TransformPixel2 (PyObject *self, PyObject *args) {
 	return result;
 }
 
+/* Returns size of single pixel in bytes for provided lcms format.
+ * T_BYTES() equal to 0 means double precision (8 bytes) channels. */
+static int
+getPixelSize (cmsUInt32Number format) {
+
+	int bytes = T_BYTES(format);
+
+	if (bytes == 0) {
+		bytes = sizeof(cmsFloat64Number);
+	}
+	return bytes * (T_CHANNELS(format) + T_EXTRA(format));
+}
+
+#define COLORB_SIZE 4
+
+static PyObject *
+pycms_TransformPixelArray (PyObject *self, PyObject *args) {
+
+	Py_buffer inbuf;
+	int npixels, i, in_size, out_size;
+	unsigned char *src, *packed_in, *packed_out, *dst;
+	void *transform;
+	cmsHTRANSFORM hTransform;
+	PyObject *result;
+
+	if (!PyArg_ParseTuple(args, "Oy*i", &transform, &inbuf, &npixels)) {
+		return NULL;
+	}
+
+	if (npixels < 0 || inbuf.len < (Py_ssize_t) npixels * COLORB_SIZE) {
+		PyBuffer_Release(&inbuf);
+		PyErr_SetString(PyExc_ValueError, "input buffer is too small");
+		return NULL;
+	}
+
+	hTransform = (cmsHTRANSFORM) PyCapsule_GetPointer(transform, NULL);
+	if (hTransform == NULL) {
+		PyBuffer_Release(&inbuf);
+		return NULL;
+	}
+
+	in_size = getPixelSize(cmsGetTransformInputFormat(hTransform));
+	out_size = getPixelSize(cmsGetTransformOutputFormat(hTransform));
+	if (in_size > COLORB_SIZE || out_size > COLORB_SIZE) {
+		PyBuffer_Release(&inbuf);
+		PyErr_SetString(PyExc_ValueError, "transform is not an 8-bit one");
+		return NULL;
+	}
+
+	result = PyBytes_FromStringAndSize(NULL, (Py_ssize_t) npixels * COLORB_SIZE);
+	packed_in = malloc(npixels * in_size + 1);
+	packed_out = calloc(npixels * out_size + 1, 1);
+	if (result == NULL || packed_in == NULL || packed_out == NULL) {
+		PyBuffer_Release(&inbuf);
+		Py_XDECREF(result);
+		free(packed_in);
+		free(packed_out);
+		return PyErr_NoMemory();
+	}
+
+	/* colorb slots are always 4 bytes wide, lcms expects tightly packed
+	 * pixels of the transform format */
+	src = (unsigned char *) inbuf.buf;
+	for (i = 0; i < npixels; i++) {
+		memcpy(&packed_in[i * in_size], &src[i * COLORB_SIZE], in_size);
+	}
+
+	cmsDoTransform(hTransform, packed_in, packed_out, npixels);
+
+	dst = (unsigned char *) PyBytes_AS_STRING(result);
+	memset(dst, 0, (size_t) npixels * COLORB_SIZE);
+	for (i = 0; i < npixels; i++) {
+		memcpy(&dst[i * COLORB_SIZE], &packed_out[i * out_size], out_size);
+	}
+
+	free(packed_in);
+	free(packed_out);
+	PyBuffer_Release(&inbuf);
+	return result;
+}
+
+static PyObject *
+pycms_GetTransformPixelSizes (PyObject *self, PyObject *args) {
+
+	void *transform;
+	cmsHTRANSFORM hTransform;
+
+	if (!PyArg_ParseTuple(args, "O", &transform)) {
+		return NULL;
+	}
+
+	hTransform = (cmsHTRANSFORM) PyCapsule_GetPointer(transform, NULL);
+	if (hTransform == NULL) {
+		return NULL;
+	}
+
+	return Py_BuildValue("(ii)",
+			getPixelSize(cmsGetTransformInputFormat(hTransform)),
+			getPixelSize(cmsGetTransformOutputFormat(hTransform)));
+}
+
+/* Transforms pixels between any objects supporting buffer protocol.
+ * Destination buffer is written in place, so src and dst can be
+ * the same object. */
+static PyObject *
+pycms_TransformBuffer (PyObject *self, PyObject *args) {
+
+	Py_buffer src, dst;
+	Py_ssize_t npixels;
+	void *transform;
+	cmsHTRANSFORM hTransform;
+
+	if (!PyArg_ParseTuple(args, "Oy*w*n", &transform, &src, &dst, &npixels)) {
+		return NULL;
+	}
+
+	hTransform = (cmsHTRANSFORM) PyCapsule_GetPointer(transform, NULL);
+	if (hTransform == NULL) {
+		PyBuffer_Release(&src);
+		PyBuffer_Release(&dst);
+		return NULL;
+	}
+
+	if (npixels < 0 || npixels > 0xffffffffL ||
+			src.len < npixels * getPixelSize(cmsGetTransformInputFormat(hTransform)) ||
+			dst.len < npixels * getPixelSize(cmsGetTransformOutputFormat(hTransform))) {
+		PyBuffer_Release(&src);
+		PyBuffer_Release(&dst);
+		PyErr_SetString(PyExc_ValueError, "buffer is too small for pixel count");
+		return NULL;
+	}
+
+	Py_BEGIN_ALLOW_THREADS
+	cmsDoTransform(hTransform, src.buf, dst.buf, (cmsUInt32Number) npixels);
+	Py_END_ALLOW_THREADS
+
+	PyBuffer_Release(&src);
+	PyBuffer_Release(&dst);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 static PyObject *
 pycms_TransformBitmap (PyObject *self, PyObject *args) {
 
@@ -322,8 +709,10 @@ pycms_TransformBitmap (PyObject *self, PyObject *args) {
 	void *transform;
 	cmsHTRANSFORM hTransform;
 	int width, height, i;
+	int start = 0, end = -1;
 
-	if (!PyArg_ParseTuple(args, "OOOii", &transform, &inImage, &outImage, &width, &height)) {
+	if (!PyArg_ParseTuple(args, "OOOii|ii", &transform, &inImage, &outImage,
+			&width, &height, &start, &end)) {
 		Py_INCREF(Py_None);
 		return Py_None;
 	}
@@ -333,9 +722,20 @@ pycms_TransformBitmap (PyObject *self, PyObject *args) {
 
 	hTransform = (cmsHTRANSFORM) PyCapsule_GetPointer(transform, NULL);
 
-	for (i = 0; i < height; i++) {
+	/* optional [start, end) row band allows to process image
+	 * by several threads simultaneously */
+	if (end < 0 || end > height) {
+		end = height;
+	}
+	if (start < 0) {
+		start = 0;
+	}
+
+	Py_BEGIN_ALLOW_THREADS
+	for (i = start; i < end; i++) {
 		cmsDoTransform(hTransform, inImg->image[i],	outImg->image[i], width);
 	}
+	Py_END_ALLOW_THREADS
 
 	Py_INCREF(Py_None);
 	return Py_None;
@@ -421,6 +821,43 @@ pycms_GetProfileInfoCopyright (PyObject *self, PyObject *args) {
 	return ret;
 }
 
+static PyObject *
+pycms_GetProfileID (PyObject *self, PyObject *args) {
+
+	void *profile;
+	cmsHPROFILE hProfile;
+	cmsUInt8Number profileID[16];
+	int i, empty = 1;
+
+	if (!PyArg_ParseTuple(args, "O", &profile)) {
+		return NULL;
+	}
+
+	hProfile = (cmsHPROFILE) PyCapsule_GetPointer(profile, NULL);
+	if (hProfile == NULL) {
+		return NULL;
+	}
+
+	cmsGetHeaderProfileID(hProfile, profileID);
+	for (i = 0; i < 16; i++) {
+		if (profileID[i]) {
+			empty = 0;
+			break;
+		}
+	}
+
+	/* profile ID is optional in ICC header, so calculate it if absent */
+	if (empty) {
+		if (!cmsMD5computeID(hProfile)) {
+			PyErr_SetString(PyExc_ValueError, "cannot calculate profile ID");
+			return NULL;
+		}
+		cmsGetHeaderProfileID(hProfile, profileID);
+	}
+
+	return Py_BuildValue("y#", (char *) profileID, (Py_ssize_t) 16);
+}
+
 static PyObject *
 pycms_GetPixelsFromImage (PyObject *self, PyObject *args) {
 
@@ -510,13 +947,21 @@ PyMethodDef pycms_methods[] = {
 	{"createGrayProfile", pycms_CreateGrayProfile, METH_VARARGS},
 	{"buildTransform", pycms_BuildTransform, METH_VARARGS},
 	{"buildProofingTransform", pycms_BuildProofingTransform, METH_VARARGS},
+	{"buildDeviceLinkTransform", pycms_BuildDeviceLinkTransform, METH_VARARGS},
+	{"saveDeviceLink", pycms_SaveDeviceLink, METH_VARARGS},
 	{"setAlarmCodes", pycms_SetAlarmCodes, METH_VARARGS},
+	{"createContext", pycms_CreateContext, METH_VARARGS},
+	{"getContextError", pycms_GetContextError, METH_VARARGS},
 	{"transformPixel", pycms_TransformPixel, METH_VARARGS},
 	{"transformPixel2", pycms_TransformPixel2, METH_VARARGS},
+	{"transformPixelArray", pycms_TransformPixelArray, METH_VARARGS},
+	{"getTransformPixelSizes", pycms_GetTransformPixelSizes, METH_VARARGS},
+	{"transformBuffer", pycms_TransformBuffer, METH_VARARGS},
 	{"transformBitmap", pycms_TransformBitmap, METH_VARARGS},
 	{"getProfileName", pycms_GetProfileName, METH_VARARGS},
 	{"getProfileInfo", pycms_GetProfileInfo, METH_VARARGS},
 	{"getProfileInfoCopyright", pycms_GetProfileInfoCopyright, METH_VARARGS},
+	{"getProfileID", pycms_GetProfileID, METH_VARARGS},
 	{"getPixelsFromImage", pycms_GetPixelsFromImage, METH_VARARGS},
 	{"setImagePixels", pycms_SetImagePixels, METH_VARARGS},
 	{"transformPixels", pycms_TransformPixels, METH_VARARGS},
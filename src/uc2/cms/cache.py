@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from uc2 import uc2const
+from . import libcms
+from .metrics import TRANSFORM_CACHE_HITS, DEVICELINK_LOADS, TRANSFORM_BUILD
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 64
+DEVICELINK_VERSION = 4.3
+DEVICELINK_EXT = '.icc'
+
+# Gamut check is not a part of transform pipeline and is lost
+# in device link. Not precalculated transforms are resampled by lcms
+# on saving, so stored device link is precalculated anyway.
+NOT_PERSISTENT_FLAGS = uc2const.cmsFLAGS_GAMUTCHECK
+# Device link keeps 16-bit lookup table, so 16-bit and double
+# precision transforms would be quantized after restart.
+NOT_PERSISTENT_SUFFIXES = tuple(
+    suffix for suffix in uc2const.CMS_PRECISION_SUFFIX.values() if suffix)
+# Maximal number of stored device links, the oldest ones are removed
+DEVICELINK_CACHE_SIZE = 256
+# Device link pipeline is already precalculated, so it is evaluated
+# as is. Soft proofing is baked into the pipeline.
+DEVICELINK_FLAGS_MASK = uc2const.cmsFLAGS_NOCACHE
+
+
+ICC_HEADER_SIZE = 128
+ICC_PROFILE_ID = slice(84, 100)
+
+
+def get_header_profile_id(data):
+    """Returns ICC profile ID stored in profile header
+    as a hex string or None if header doesn't contain it.
+    """
+    profile_id = data[ICC_PROFILE_ID]
+    if len(profile_id) < 16 or not any(profile_id):
+        return None
+    return profile_id.hex()
+
+
+def get_file_profile_id(path):
+    """Returns profile identifier of ICC profile file without
+    opening it by lcms. If profile header doesn't contain ID,
+    file is identified by its path, size and modification time.
+    """
+    with open(path, 'rb') as fileptr:
+        profile_id = get_header_profile_id(fileptr.read(ICC_HEADER_SIZE))
+    if profile_id is None:
+        stat = os.stat(path)
+        profile_id = ('file', os.path.abspath(path), stat.st_size,
+                      stat.st_mtime_ns)
+    return profile_id
+
+
+def get_default_profile_id(colorspace):
+    """Returns profile identifier of built-in profile
+    without opening it by lcms.
+    """
+    data = libcms.get_default_profile_data(colorspace)
+    profile_id = get_header_profile_id(data)
+    if profile_id is None:
+        profile_id = ('data', hashlib.md5(data).hexdigest())
+    return profile_id
+
+
+def get_profile_id(profile):
+    """Returns profile identifier of profile handle"""
+    return libcms.cms_get_profile_id(open_profile(profile))
+
+
+def open_profile(profile):
+    """Returns profile handle. Profile can be provided as a handle
+    or as callable returning handle, so it is opened on demand only.
+    """
+    return profile() if callable(profile) else profile
+
+
+# number of transform key fields excluding lcms context
+TRANSFORM_KEY_SIZE = 8
+
+
+def get_transform_key(in_id, in_mode, out_id, out_mode, intent, flags,
+                      proof_id=None, pintent=None, context=None):
+    """Returns transform cache key. Profiles are identified by
+    ICC profile ID (MD5 digest) or other cheap profile identifier
+    (see get_file_profile_id()), so identical profiles opened
+    from different files or memory share the same transforms.
+    Transforms report errors and use alarm codes of lcms context
+    they are created in, so transforms are not shared between
+    contexts. Cached transform keeps reference to its context,
+    so context id is not reused while the key is in use.
+    """
+    key = (in_id, in_mode, out_id, out_mode, proof_id, intent, pintent, flags)
+    if context is not None:
+        key += (id(context),)
+    return key
+
+
+class DeviceLinkCache(object):
+    """Persistent on-disk cache of precalculated transforms.
+    Each transform is stored as ICC device link profile, so on next
+    start it is loaded by single profile open instead of opening all
+    source profiles and precalculating the transform again.
+    Device link is evaluated as is, so loaded transform is
+    the precalculated one even for cmsFLAGS_NOTPRECALC transforms.
+    Only 8-bit transforms are stored. Cache keeps maxsize
+    recently used device links.
+    """
+
+    path = None
+    maxsize = DEVICELINK_CACHE_SIZE
+
+    def __init__(self, path, maxsize=DEVICELINK_CACHE_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    @staticmethod
+    def is_persistent(in_mode, out_mode, flags):
+        if flags & NOT_PERSISTENT_FLAGS:
+            return False
+        return not (in_mode.endswith(NOT_PERSISTENT_SUFFIXES) or
+                    out_mode.endswith(NOT_PERSISTENT_SUFFIXES))
+
+    def get_filepath(self, key):
+        # device link doesn't depend on lcms context of transform
+        key = key[:TRANSFORM_KEY_SIZE]
+        digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.path, digest + DEVICELINK_EXT)
+
+    def load(self, key, in_mode, out_mode, flags, context=None):
+        """Returns transform from stored device link or None"""
+        if not self.is_persistent(in_mode, out_mode, flags):
+            return None
+        filepath = self.get_filepath(key)
+        if not os.path.isfile(filepath):
+            return None
+        try:
+            devicelink = libcms.cms_open_profile_from_file(filepath)
+            # modification time marks recently used entries
+            os.utime(filepath)
+            flags = (flags & DEVICELINK_FLAGS_MASK) | \
+                    uc2const.cmsFLAGS_NOTPRECALC
+            return libcms.cms_create_devicelink_transform(
+                devicelink, in_mode, out_mode,
+                uc2const.INTENT_PERCEPTUAL, flags, context)
+        except (libcms.CmsError, OSError):
+            LOG.warning('Broken device link cache entry %s', filepath)
+            return None
+
+    def save(self, key, transform, in_mode, out_mode, flags):
+        """Stores transform as device link. Cache is best-effort,
+        so write errors are logged only.
+        """
+        if not self.is_persistent(in_mode, out_mode, flags):
+            return
+        filepath = self.get_filepath(key)
+        tmppath = '%s.%d.tmp' % (filepath, os.getpid())
+        try:
+            data = libcms.cms_save_devicelink(transform, DEVICELINK_VERSION)
+            with open(tmppath, 'wb') as fileptr:
+                fileptr.write(data)
+            os.replace(tmppath, filepath)
+        except (libcms.CmsError, OSError) as e:
+            LOG.warning('Cannot store device link %s: %s', filepath, e)
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+            return
+        self.shrink()
+
+    def shrink(self):
+        """Removes the oldest device links exceeding maxsize"""
+        entries = []
+        for filename in os.listdir(self.path):
+            if filename.endswith(DEVICELINK_EXT):
+                filepath = os.path.join(self.path, filename)
+                try:
+                    entries.append((os.path.getmtime(filepath), filepath))
+                except OSError:
+                    pass
+        entries.sort()
+        excess = max(0, len(entries) - self.maxsize)
+        for _mtime, filepath in entries[:excess]:
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+
+    def clear(self):
+        for filename in os.listdir(self.path):
+            if filename.endswith(DEVICELINK_EXT):
+                os.remove(os.path.join(self.path, filename))
+
+
+class TransformCache(object):
+    """Process-wide LRU cache of lcms transforms.
+    Transforms are immutable after creation, so the same transform
+    can be shared by any number of color managers. Cache is thread-safe;
+    missing transform is built once while other threads requesting
+    it wait for the result. Cache lock is held for lookups only,
+    so different transforms are built concurrently.
+    """
+
+    lock = None
+    transforms = None
+    pending = None
+    disk_cache = None
+    maxsize = DEFAULT_CACHE_SIZE
+    hits = 0
+    misses = 0
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.lock = threading.RLock()
+        self.transforms = OrderedDict()
+        self.pending = {}
+        self.maxsize = maxsize
+
+    def __len__(self):
+        return len(self.transforms)
+
+    def __contains__(self, key):
+        return key in self.transforms
+
+    def set_disk_cache(self, path=None, maxsize=DEVICELINK_CACHE_SIZE):
+        """Enables persistent device link cache in provided directory.
+        None value disables it.
+        """
+        if path is None:
+            self.disk_cache = None
+        elif self.disk_cache is None or not self.disk_cache.path == path:
+            self.disk_cache = DeviceLinkCache(path, maxsize)
+        else:
+            self.disk_cache.maxsize = maxsize
+
+    def set_maxsize(self, maxsize):
+        with self.lock:
+            self.maxsize = max(0, maxsize)
+            self.shrink()
+
+    def shrink(self):
+        with self.lock:
+            while len(self.transforms) > self.maxsize:
+                self.transforms.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.transforms.clear()
+            self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            transform = self.transforms.get(key)
+            if transform is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.transforms.move_to_end(key)
+            return transform
+
+    def put(self, key, transform):
+        with self.lock:
+            self.transforms[key] = transform
+            self.transforms.move_to_end(key)
+            self.shrink()
+
+    def load(self, key, in_mode, out_mode, flags, context=None):
+        if self.disk_cache is None:
+            return None
+        return self.disk_cache.load(key, in_mode, out_mode, flags, context)
+
+    def store(self, key, transform, in_mode, out_mode, flags):
+        if self.disk_cache is not None:
+            self.disk_cache.save(key, transform, in_mode, out_mode, flags)
+
+    def build(self, key, in_mode, out_mode, flags, factory, metrics=None,
+              context=None):
+        """Returns cached or stored transform or creates new one
+        by factory callable. Cache hits and transform building time
+        are reported into metrics object if provided.
+        Transform is built outside of cache lock; threads requesting
+        transform which is being built wait for its future.
+        """
+        with self.lock:
+            transform = self.get(key)
+            if transform is not None:
+                if metrics is not None:
+                    metrics.count(TRANSFORM_CACHE_HITS)
+                return transform
+            future = self.pending.get(key)
+            owner = future is None
+            if owner:
+                future = self.pending[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            transform = self.load(key, in_mode, out_mode, flags, context)
+            if transform is not None:
+                if metrics is not None:
+                    metrics.count(DEVICELINK_LOADS)
+            else:
+                start = time.perf_counter()
+                transform = factory()
+                if metrics is not None:
+                    metrics.add_time(TRANSFORM_BUILD,
+                                     time.perf_counter() - start)
+                self.store(key, transform, in_mode, out_mode, flags)
+        except BaseException as e:
+            with self.lock:
+                self.pending.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self.lock:
+            self.put(key, transform)
+            self.pending.pop(key, None)
+        future.set_result(transform)
+        return transform
+
+    def get_transform(self, in_profile, in_mode, out_profile, out_mode,
+                      intent, flags, context=None, metrics=None,
+                      profile_ids=None):
+        """Returns cached transform or creates new one
+        using libcms.cms_create_transform().
+        Profiles can be provided as callables (see open_profile()) with
+        their identifiers in profile_ids tuple, so they are opened
+        only when transform is actually built.
+        """
+        if profile_ids is None:
+            profile_ids = (get_profile_id(in_profile),
+                           get_profile_id(out_profile))
+        in_id, out_id = profile_ids
+        key = get_transform_key(in_id, in_mode, out_id, out_mode, intent,
+                                flags, context=context)
+        return self.build(key, in_mode, out_mode, flags,
+                          lambda: libcms.cms_create_transform(
+                              open_profile(in_profile), in_mode,
+                              open_profile(out_profile), out_mode,
+                              intent, flags, context),
+                          metrics, context)
+
+    def get_proofing_transform(self, in_profile, in_mode, out_profile,
+                               out_mode, proof_profile, intent, pintent,
+                               flags, context=None, metrics=None,
+                               profile_ids=None):
+        """Returns cached proofing transform or creates new one
+        using libcms.cms_create_proofing_transform().
+        Profiles can be provided as in get_transform().
+        """
+        if profile_ids is None:
+            profile_ids = (get_profile_id(in_profile),
+                           get_profile_id(out_profile),
+                           get_profile_id(proof_profile))
+        in_id, out_id, proof_id = profile_ids
+        key = get_transform_key(in_id, in_mode, out_id, out_mode, intent,
+                                flags, proof_id, pintent, context)
+        return self.build(key, in_mode, out_mode, flags,
+                          lambda: libcms.cms_create_proofing_transform(
+                              open_profile(in_profile), in_mode,
+                              open_profile(out_profile), out_mode,
+                              open_profile(proof_profile), intent, pintent,
+                              flags, context),
+                          metrics, context)
+
+
+TRANSFORM_CACHE = TransformCache()
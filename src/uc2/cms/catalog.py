@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Catalog of installed ICC profiles. Profile directories are scanned
+on thread pool, profile metadata are kept in memory and can be
+persisted in JSON index file. Index entries are validated by file
+modification time and size, so unchanged profiles are never
+opened again.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from uc2.uc2const import COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY
+from . import libcms
+
+LOG = logging.getLogger(__name__)
+
+CATALOG_VERSION = 1
+INDEX_FILENAME = 'profile_catalog.json'
+PROFILE_EXTS = ('.icc', '.icm')
+ICC_HEADER_SIZE = 128
+ICC_MAGIC = b'acsp'
+
+# ICC colorspace signatures of supported colorspaces
+ICC_COLORSPACES = {
+    'RGB': COLOR_RGB,
+    'CMYK': COLOR_CMYK,
+    'Lab': COLOR_LAB,
+    'GRAY': COLOR_GRAY,
+}
+
+CLASS_INPUT = 'scnr'
+CLASS_DISPLAY = 'mntr'
+CLASS_OUTPUT = 'prtr'
+CLASS_LINK = 'link'
+CLASS_ABSTRACT = 'abst'
+CLASS_COLORSPACE = 'spac'
+CLASS_NAMED = 'nmcl'
+
+# config profile dicts filled from catalog:
+# (colorspace, device class, config attribute)
+CONFIG_PROFILE_DICTS = (
+    (COLOR_RGB, None, 'cms_rgb_profiles'),
+    (COLOR_CMYK, None, 'cms_cmyk_profiles'),
+    (COLOR_LAB, None, 'cms_lab_profiles'),
+    (COLOR_GRAY, None, 'cms_gray_profiles'),
+    (COLOR_RGB, CLASS_DISPLAY, 'cms_display_profiles'),
+)
+
+ProfileInfo = namedtuple('ProfileInfo', 'path mtime size name info '
+                                        'copyright colorspace device_class '
+                                        'profile_id')
+
+
+def get_system_profile_dirs():
+    """Returns list of existing system and user profile directories.
+    """
+    home = os.path.expanduser('~')
+    if sys.platform == 'win32':
+        root = os.environ.get('SystemRoot', 'C:\\Windows')
+        dirs = [os.path.join(root, 'System32', 'spool', 'drivers', 'color')]
+    elif sys.platform == 'darwin':
+        dirs = ['/System/Library/ColorSync/Profiles',
+                '/Library/ColorSync/Profiles',
+                os.path.join(home, 'Library', 'ColorSync', 'Profiles')]
+    else:
+        data_home = os.environ.get('XDG_DATA_HOME') or \
+            os.path.join(home, '.local', 'share')
+        dirs = ['/usr/share/color/icc', '/usr/local/share/color/icc',
+                '/var/lib/color/icc', os.path.join(data_home, 'icc'),
+                os.path.join(home, '.color', 'icc')]
+    return [path for path in dirs if os.path.isdir(path)]
+
+
+def is_profile_file(path):
+    return os.path.splitext(path)[1].lower() in PROFILE_EXTS
+
+
+def parse_header(data):
+    """Returns (colorspace, device class) tuple of ICC profile header.
+    Unsupported colorspaces are returned as ICC signatures.
+    """
+    if len(data) < ICC_HEADER_SIZE or not data[36:40] == ICC_MAGIC:
+        raise libcms.CmsError('Not an ICC profile')
+    signature = data[16:20].decode('latin1').strip()
+    device_class = data[12:16].decode('latin1').strip()
+    return ICC_COLORSPACES.get(signature, signature), device_class
+
+
+def read_profile_info(path, stat=None):
+    """Reads metadata of profile file.
+    Returns ProfileInfo or None if file is not suitable profile.
+    """
+    try:
+        stat = stat or os.stat(path)
+        with open(path, 'rb') as fileptr:
+            data = fileptr.read()
+        colorspace, device_class = parse_header(data)
+        profile = libcms.cms_open_profile_from_string(data)
+        return ProfileInfo(path, stat.st_mtime, stat.st_size,
+                           libcms.cms_get_profile_name(profile),
+                           libcms.cms_get_profile_info(profile),
+                           libcms.cms_get_profile_copyright(profile),
+                           colorspace, device_class,
+                           libcms.cms_get_profile_id(profile))
+    except Exception as e:
+        LOG.debug('Cannot read profile %s: %s', path, e)
+        return None
+
+
+class ProfileCatalog(object):
+    """Catalog of ICC profiles metadata.
+    Lookups by path, profile name and profile ID are dict lookups.
+    Catalog is safe for use from several threads.
+
+    :param index_path: JSON index file path, catalog is not persisted
+                       if not provided
+    :param workers: number of scanning threads, default thread pool
+                    size if None
+    """
+
+    index_path = None
+    workers = None
+    profiles = None
+    # paths of invalid files: (mtime, size) pairs
+    invalid = None
+    by_name = None
+    by_id = None
+    modified = False
+
+    def __init__(self, index_path=None, workers=None):
+        self.index_path = index_path
+        self.workers = workers
+        self.lock = threading.RLock()
+        self.profiles = {}
+        self.invalid = {}
+        self.by_name = {}
+        self.by_id = {}
+        self.set_index(index_path)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def set_index(self, index_path):
+        """Sets JSON index file and loads it if the file exists.
+        """
+        with self.lock:
+            self.index_path = index_path
+            if index_path and os.path.isfile(index_path):
+                self.load()
+
+    def __contains__(self, path):
+        return path in self.profiles
+
+    def __iter__(self):
+        return iter(list(self.profiles.values()))
+
+    def add(self, info):
+        with self.lock:
+            self.remove(info.path)
+            self.profiles[info.path] = info
+            self.by_name.setdefault(info.name, info)
+            self.by_id.setdefault(info.profile_id, info)
+            self.modified = True
+
+    def remove(self, path):
+        with self.lock:
+            self.invalid.pop(path, None)
+            info = self.profiles.pop(path, None)
+            if info is None:
+                return
+            self.modified = True
+            for index, field in ((self.by_name, 'name'),
+                                 (self.by_id, 'profile_id')):
+                key = getattr(info, field)
+                if index.get(key) is info:
+                    del index[key]
+                    # another profile with the same key
+                    for item in self.profiles.values():
+                        if getattr(item, field) == key:
+                            index[key] = item
+                            break
+
+    def is_actual(self, path, stat):
+        """Checks that path is indexed and file is not changed.
+        """
+        key = (stat.st_mtime, stat.st_size)
+        info = self.profiles.get(path)
+        if info is not None:
+            return (info.mtime, info.size) == key
+        return tuple(self.invalid.get(path, ())) == key
+
+    def update_file(self, path, stat):
+        info = read_profile_info(path, stat)
+        with self.lock:
+            if info is None:
+                self.remove(path)
+                self.invalid[path] = (stat.st_mtime, stat.st_size)
+                self.modified = True
+            else:
+                self.add(info)
+        return info
+
+    def get(self, path):
+        """Returns ProfileInfo of profile file or None if file
+        is not suitable profile. Changed files are read again.
+        """
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.remove(path)
+            return None
+        if self.is_actual(path, stat):
+            return self.profiles.get(path)
+        return self.update_file(path, stat)
+
+    def get_by_name(self, name):
+        return self.by_name.get(name)
+
+    def get_by_id(self, profile_id):
+        return self.by_id.get(profile_id)
+
+    def get_profiles(self, colorspace=None, device_class=None):
+        """Returns list of ProfileInfo sorted by name.
+        """
+        return sorted((info for info in self
+                       if colorspace in (None, info.colorspace) and
+                       device_class in (None, info.device_class)),
+                      key=lambda x: (x.name, x.path))
+
+    def get_profile_dict(self, colorspace, device_class=None):
+        """Returns {profile name: path} dict of colorspace profiles
+        in format of cms_*_profiles config dicts.
+        """
+        return {info.name: info.path for info in
+                reversed(self.get_profiles(colorspace, device_class))}
+
+    def scan(self, dirs=None, recursive=True):
+        """Scans profile directories (system ones if not provided)
+        updating changed and new profiles on thread pool.
+        Profiles removed from scanned directories are dropped.
+        Returns list of ProfileInfo of scanned directories.
+        """
+        dirs = get_system_profile_dirs() if dirs is None else dirs
+        files = {}
+        for root in dirs:
+            root = os.path.abspath(root)
+            for dirpath, dirnames, filenames in os.walk(root):
+                if not recursive:
+                    dirnames[:] = []
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if is_profile_file(path):
+                        try:
+                            files[path] = os.stat(path)
+                        except OSError:
+                            pass
+            prefix = os.path.join(root, '')
+            for path in list(self.profiles) + list(self.invalid):
+                if path.startswith(prefix) and path not in files:
+                    self.remove(path)
+        changed = [(path, stat) for path, stat in files.items()
+                   if not self.is_actual(path, stat)]
+        if changed:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(lambda args: self.update_file(*args),
+                                  changed))
+        if self.index_path and self.modified:
+            self.save()
+        return [self.profiles[path] for path in sorted(files)
+                if path in self.profiles]
+
+    def load(self, path=None):
+        """Loads stored index. Broken index is ignored.
+        """
+        path = path or self.index_path
+        try:
+            with open(path) as fileptr:
+                data = json.load(fileptr)
+            if not data.get('version') == CATALOG_VERSION:
+                return
+            profiles = [ProfileInfo(*item) for item in data['profiles']]
+            invalid = data['invalid']
+        except Exception as e:
+            LOG.warning('Cannot load profile catalog %s: %s', path, e)
+            return
+        with self.lock:
+            for info in profiles:
+                self.add(info)
+            self.invalid.update(invalid)
+            self.modified = False
+
+    def save(self, path=None):
+        path = path or self.index_path
+        with self.lock:
+            data = {
+                'version': CATALOG_VERSION,
+                'profiles': [list(info) for info in self.profiles.values()],
+                'invalid': self.invalid,
+            }
+            self.modified = False
+        with open(path, 'w') as fileptr:
+            json.dump(data, fileptr)
+
+
+PROFILE_CATALOG = ProfileCatalog()
+
+
+def update_app_profiles(config, config_dir, catalog=PROFILE_CATALOG):
+    """Scans installed profiles using index file in application config
+    directory and adds them into cms_*_profiles config dicts.
+    Paths of added entries are listed in cms_catalog_profiles, so only
+    such entries are dropped when profile is removed from system;
+    other config entries are kept as is.
+    """
+    catalog.set_index(os.path.join(config_dir, INDEX_FILENAME))
+    catalog.scan()
+    tracked = set(config.cms_catalog_profiles)
+    added = set()
+    for colorspace, device_class, attr in CONFIG_PROFILE_DICTS:
+        profile_dict = dict(getattr(config, attr))
+        for name, path in list(profile_dict.items()):
+            if path in tracked and path not in catalog:
+                del profile_dict[name]
+        for name, path in catalog.get_profile_dict(
+                colorspace, device_class).items():
+            if name not in profile_dict:
+                profile_dict[name] = path
+                added.add(path)
+        if not profile_dict == getattr(config, attr):
+            setattr(config, attr, profile_dict)
+    tracked = sorted(added | set(path for path in tracked
+                                 if path in catalog))
+    if not tracked == config.cms_catalog_profiles:
+        config.cms_catalog_profiles = tracked
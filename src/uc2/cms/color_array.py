@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+
+from uc2.uc2const import COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY, \
+    COLOR_SPOT
+from .vectorized import CHANNELS
+
+CS_CODES = [COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY, COLOR_SPOT]
+CS_INDEX = {cs: code for code, cs in enumerate(CS_CODES)}
+MAX_CHANNELS = 4
+MIN_CAPACITY = 16
+
+
+class ColorArray(object):
+    """Compact columnar container of [cs, values, alpha, name] colors.
+    Colorspaces are stored as codes, color values as rows of float64
+    matrix (unused channels are zero), names are interned in name table.
+    Spot colors keep their RGB and CMYK alternative values separately.
+
+    Item access and iteration return colors in list representation,
+    so the container can replace colors list for reading code.
+
+    :param colors: list of colors to fill container
+    """
+
+    cs_codes = None
+    values = None
+    alpha = None
+    name_ids = None
+    names = None
+    name_index = None
+    spots = None
+    count = 0
+
+    def __init__(self, colors=None):
+        self.cs_codes = np.zeros(MIN_CAPACITY, dtype=np.uint8)
+        self.values = np.zeros((MIN_CAPACITY, MAX_CHANNELS))
+        self.alpha = np.zeros(MIN_CAPACITY)
+        self.name_ids = np.zeros(MIN_CAPACITY, dtype=np.int32)
+        self.names = []
+        self.name_index = {}
+        self.spots = {}
+        self.count = 0
+        if colors:
+            self.extend(colors)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.get_color(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColorArray([self.get_color(i)
+                               for i in range(*index.indices(self.count))])
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('ColorArray index out of range')
+        return self.get_color(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, (ColorArray, list)) \
+                or not len(self) == len(other):
+            return False
+        return all(x == y for x, y in zip(self, other))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @property
+    def nbytes(self):
+        """Memory used by columns (name table is not counted)."""
+        return sum(column[:self.count].nbytes for column in
+                   (self.cs_codes, self.values, self.alpha, self.name_ids))
+
+    def get_name_id(self, name):
+        name_id = self.name_index.get(name)
+        if name_id is None:
+            name_id = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def reserve(self, size):
+        """Grows column capacity to fit at least size colors."""
+        capacity = len(self.alpha)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for attr in ('cs_codes', 'values', 'alpha', 'name_ids'):
+            column = getattr(self, attr)
+            new_column = np.zeros((capacity,) + column.shape[1:],
+                                  dtype=column.dtype)
+            new_column[:self.count] = column[:self.count]
+            setattr(self, attr, new_column)
+
+    def append(self, color):
+        self.reserve(self.count + 1)
+        index = self.count
+        cs, values = color[0], color[1]
+        self.cs_codes[index] = CS_INDEX[cs]
+        if cs == COLOR_SPOT:
+            self.spots[index] = [list(values[0]), list(values[1])]
+            self.values[index] = 0.0
+        else:
+            self.values[index, :len(values)] = values
+            self.values[index, len(values):] = 0.0
+        self.alpha[index] = color[2]
+        self.name_ids[index] = self.get_name_id(color[3])
+        self.count += 1
+
+    def extend(self, colors):
+        self.reserve(self.count + len(colors))
+        for color in colors:
+            self.append(color)
+
+    def get_color(self, index):
+        cs = CS_CODES[self.cs_codes[index]]
+        if cs == COLOR_SPOT:
+            rgb, cmyk = self.spots[index]
+            values = [list(rgb), list(cmyk)]
+        else:
+            values = self.values[index, :CHANNELS[cs]].tolist()
+        return [cs, values, float(self.alpha[index]),
+                self.names[self.name_ids[index]]]
+
+    def get_name(self, index):
+        return self.names[self.name_ids[index]]
+
+    def to_list(self):
+        return list(self)
+
+    @classmethod
+    def from_arrays(cls, cs, values, alpha=None, names=None):
+        """Creates container of single colorspace colors from
+        (N, channels) array of color values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        colors = cls()
+        size = len(values)
+        colors.reserve(size)
+        colors.cs_codes[:size] = CS_INDEX[cs]
+        colors.values[:size, :values.shape[1]] = values
+        colors.alpha[:size] = 1.0 if alpha is None else alpha
+        if names is None:
+            colors.name_ids[:size] = colors.get_name_id('')
+        else:
+            colors.name_ids[:size] = [colors.get_name_id(name)
+                                      for name in names]
+        colors.count = size
+        return colors
+
+    def group_values(self, spot_cs=COLOR_RGB):
+        """Groups colors by colorspace for batched processing.
+        Spot colors are represented by spot_cs alternative values
+        if they are present or by other alternative values.
+        Returns dict of (color indexes, (N, channels) values array) tuples.
+        """
+        groups = {}
+        codes = self.cs_codes[:self.count]
+        for code in np.unique(codes):
+            cs = CS_CODES[code]
+            if cs == COLOR_SPOT:
+                continue
+            indexes = np.flatnonzero(codes == code)
+            groups[cs] = (indexes, self.values[indexes, :CHANNELS[cs]])
+        spot_groups = {}
+        for index in sorted(self.spots):
+            rgb, cmyk = self.spots[index]
+            if spot_cs == COLOR_CMYK:
+                cs, values = (COLOR_CMYK, cmyk) if cmyk else (COLOR_RGB, rgb)
+            else:
+                cs, values = (COLOR_RGB, rgb) if rgb else (COLOR_CMYK, cmyk)
+            group = spot_groups.setdefault(cs, ([], []))
+            group[0].append(index)
+            group[1].append(values)
+        for cs, (indexes, values) in spot_groups.items():
+            values = np.array(values, dtype=np.float64)
+            if cs in groups:
+                indexes = np.concatenate((groups[cs][0], indexes))
+                values = np.vstack((groups[cs][1], values))
+            groups[cs] = (np.asarray(indexes), values)
+        return groups
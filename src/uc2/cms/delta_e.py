@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Color difference formulas. Array functions accept CIE L*a*b*
+arrays of (..., 3) shape and broadcast them against each other.
+Color functions accept [cs, values, alpha, name] colors which
+are converted into Lab by batched color manager transforms.
+"""
+
+import numpy as np
+
+CIE76 = 'cie76'
+CIE94 = 'cie94'
+CIEDE2000 = 'ciede2000'
+
+# (kL, K1, K2) weighting factors for CIE94
+CIE94_GRAPHIC_ARTS = (1.0, 0.045, 0.015)
+CIE94_TEXTILES = (2.0, 0.048, 0.014)
+
+POW25_7 = 25.0 ** 7
+
+
+def split_lab(lab):
+    lab = np.asarray(lab, dtype=np.float64)
+    return lab[..., 0], lab[..., 1], lab[..., 2]
+
+
+def cie76(lab0, lab1):
+    """Returns CIE76 color difference of Lab arrays.
+    """
+    diff = np.asarray(lab0, dtype=np.float64) - lab1
+    return np.sqrt((diff * diff).sum(axis=-1))
+
+
+def cie94(lab0, lab1, factors=CIE94_GRAPHIC_ARTS):
+    """Returns CIE94 color difference of Lab arrays.
+    The first array is used as reference colors.
+    """
+    kl, k1, k2 = factors
+    L0, a0, b0 = split_lab(lab0)
+    L1, a1, b1 = split_lab(lab1)
+    c0 = np.hypot(a0, b0)
+    dc = c0 - np.hypot(a1, b1)
+    dh2 = np.maximum((a0 - a1) ** 2 + (b0 - b1) ** 2 - dc * dc, 0.0)
+    sc = 1.0 + k1 * c0
+    sh = 1.0 + k2 * c0
+    return np.sqrt(((L0 - L1) / kl) ** 2 + (dc / sc) ** 2 + dh2 / (sh * sh))
+
+
+def ciede2000(lab0, lab1, kl=1.0, kc=1.0, kh=1.0):
+    """Returns CIEDE2000 color difference of Lab arrays.
+    """
+    L0, a0, b0 = split_lab(lab0)
+    L1, a1, b1 = split_lab(lab1)
+
+    c_mean = (np.hypot(a0, b0) + np.hypot(a1, b1)) / 2.0
+    c_mean7 = c_mean ** 7
+    g = 0.5 * (1.0 - np.sqrt(c_mean7 / (c_mean7 + POW25_7)))
+    a0 = a0 * (1.0 + g)
+    a1 = a1 * (1.0 + g)
+    c0 = np.hypot(a0, b0)
+    c1 = np.hypot(a1, b1)
+    h0 = np.degrees(np.arctan2(b0, a0)) % 360.0
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360.0
+    achromatic = c0 * c1 == 0.0
+
+    dl = L1 - L0
+    dc = c1 - c0
+    dh = h1 - h0
+    dh = np.where(dh > 180.0, dh - 360.0,
+                  np.where(dh < -180.0, dh + 360.0, dh))
+    dh = np.where(achromatic, 0.0, dh)
+    dh = 2.0 * np.sqrt(c0 * c1) * np.sin(np.radians(dh) / 2.0)
+
+    l_mean = (L0 + L1) / 2.0
+    c_mean = (c0 + c1) / 2.0
+    h_sum = h0 + h1
+    h_mean = np.where(np.abs(h0 - h1) <= 180.0, h_sum / 2.0,
+                      np.where(h_sum < 360.0, (h_sum + 360.0) / 2.0,
+                               (h_sum - 360.0) / 2.0))
+    h_mean = np.where(achromatic, h_sum, h_mean)
+
+    t = 1.0 - 0.17 * np.cos(np.radians(h_mean - 30.0)) + \
+        0.24 * np.cos(np.radians(2.0 * h_mean)) + \
+        0.32 * np.cos(np.radians(3.0 * h_mean + 6.0)) - \
+        0.20 * np.cos(np.radians(4.0 * h_mean - 63.0))
+    d_theta = 30.0 * np.exp(-((h_mean - 275.0) / 25.0) ** 2)
+    c_mean7 = c_mean ** 7
+    rc = 2.0 * np.sqrt(c_mean7 / (c_mean7 + POW25_7))
+    l50 = (l_mean - 50.0) ** 2
+    sl = 1.0 + 0.015 * l50 / np.sqrt(20.0 + l50)
+    sc = 1.0 + 0.045 * c_mean
+    sh = 1.0 + 0.015 * c_mean * t
+    rt = -np.sin(np.radians(2.0 * d_theta)) * rc
+
+    dl = dl / (kl * sl)
+    dc = dc / (kc * sc)
+    dh = dh / (kh * sh)
+    return np.sqrt(dl * dl + dc * dc + dh * dh + rt * dc * dh)
+
+
+METHODS = {CIE76: cie76, CIE94: cie94, CIEDE2000: ciede2000}
+
+
+def to_lab(colors, cms=None):
+    """Converts list of colors into (N, 3) array of CIE L*a*b* values.
+
+    :param colors: list of [cs, values, alpha, name] colors
+    :param cms: color manager, default one is created if not provided
+    """
+    if cms is None:
+        from uc2.cms import ColorManager
+        cms = ColorManager()
+    lab = cms.get_lab_array(colors)
+    return lab * (100.0, 255.0, 255.0) - (0.0, 128.0, 128.0)
+
+
+def delta_e(color0, color1, method=CIEDE2000, cms=None):
+    """Returns color difference of two colors.
+    """
+    lab = to_lab([color0, color1], cms)
+    return float(METHODS[method](lab[0], lab[1]))
+
+
+def delta_e_many(color, colors, method=CIEDE2000, cms=None):
+    """Returns (N,) array of color differences between color
+    and each color of list.
+    """
+    lab = to_lab([color] + list(colors), cms)
+    return METHODS[method](lab[0], lab[1:])
+
+
+def delta_e_matrix(colors0, colors1=None, method=CIEDE2000, cms=None):
+    """Returns (N, M) array of pairwise color differences. If second
+    list is not provided, colors of the first list are compared
+    with each other.
+    """
+    lab0 = to_lab(colors0, cms)
+    lab1 = lab0 if colors1 is None else to_lab(colors1, cms)
+    return METHODS[method](lab0[:, np.newaxis], lab1[np.newaxis])
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Strip readers and writers for streaming image conversion
+(see ColorManager.convert_image_stream()). Image is processed
+by horizontal strips of rows, so only a strip of source
+and target pixels is kept in memory.
+
+Reader provides mode and size attributes and read(y, height) method
+returning strip as PIL image. Writer provides write(y, strip) method
+accepting strip as PIL image.
+"""
+
+from PIL import Image
+
+
+def get_stride(mode, width, rawmode):
+    """Returns size in bytes of packed row of pixels.
+    """
+    return len(Image.new(mode, (width, 1)).tobytes('raw', rawmode))
+
+
+class ImageStripReader(object):
+    """Reads strips of PIL image.
+
+    :param image: PIL image object
+    """
+
+    image = None
+    mode = None
+    size = (0, 0)
+
+    def __init__(self, image):
+        self.image = image
+        self.mode = image.mode
+        self.size = image.size
+
+    def read(self, y, height):
+        return self.image.crop((0, y, self.size[0], y + height))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RawStripReader(ImageStripReader):
+    """Reads strips of uncompressed pixel data from file.
+    Source can be divided into several full width chunks
+    (for example TIFF strips), each chunk is described by
+    (y, height, offset, rawmode, stride, orientation) tuple.
+
+    :param fileptr: binary file object supporting seek()
+    :param mode: PIL image mode
+    :param size: (width, height) image size
+    :param chunks: list of data chunks, single chunk of mode
+                   packed rows starting at offset 0 if not provided
+    """
+
+    fileptr = None
+    chunks = None
+
+    def __init__(self, fileptr, mode, size, chunks=None):
+        self.fileptr = fileptr
+        self.mode = mode
+        self.size = size
+        width, height = size
+        self.chunks = chunks or [(0, height, 0, mode,
+                                  get_stride(mode, width, mode), 1)]
+
+    def read_chunk(self, chunk, y, height):
+        y0, chunk_height, offset, rawmode, stride, orientation = chunk
+        row = y - y0
+        if orientation < 0:
+            row = chunk_height - row - height
+        self.fileptr.seek(offset + row * stride)
+        data = self.fileptr.read(height * stride)
+        if not len(data) == height * stride:
+            raise OSError('Unexpected end of image data')
+        return Image.frombytes(self.mode, (self.size[0], height), data,
+                               'raw', rawmode, stride, orientation)
+
+    def read(self, y, height):
+        strips = []
+        end = y + height
+        for chunk in self.chunks:
+            y0, y1 = chunk[0], chunk[0] + chunk[1]
+            if y0 < end and y < y1:
+                top = max(y, y0)
+                strips.append((top, self.read_chunk(
+                    chunk, top, min(end, y1) - top)))
+        if len(strips) == 1:
+            return strips[0][1]
+        strip = Image.new(self.mode, (self.size[0], height))
+        for top, item in strips:
+            strip.paste(item, (0, top - y))
+        return strip
+
+    def close(self):
+        self.fileptr.close()
+
+
+def get_raw_chunks(image):
+    """Returns list of RawStripReader chunks if image data are stored
+    as uncompressed full width chunks, otherwise returns None.
+    """
+    width, height = image.size
+    chunks = []
+    for tile in image.tile:
+        decoder, box, offset, args = tuple(tile)[:4]
+        if not decoder == 'raw' or not box[0] == 0 or \
+                not box[2] == width:
+            return None
+        if isinstance(args, str):
+            args = (args,)
+        rawmode = args[0]
+        stride = args[1] if len(args) > 1 else 0
+        orientation = args[2] if len(args) > 2 else 1
+        if not stride:
+            stride = get_stride(image.mode, width, rawmode)
+        chunks.append((box[1], box[3] - box[1], offset, rawmode,
+                       stride, orientation))
+    return sorted(chunks) or None
+
+
+def open_strip_reader(path):
+    """Opens image file for strip reading. Uncompressed images
+    (TIFF, BMP, PPM etc.) are read directly from file strip by strip.
+    Other images are decoded by PIL into memory at first.
+    """
+    image = Image.open(path)
+    chunks = get_raw_chunks(image)
+    if chunks is None:
+        image.load()
+        return ImageStripReader(image)
+    mode, size = image.mode, image.size
+    image.close()
+    return RawStripReader(open(path, 'rb'), mode, size, chunks)
+
+
+class ImageStripWriter(object):
+    """Assembles strips into new PIL image.
+
+    :param mode: PIL image mode
+    :param size: (width, height) image size
+    """
+
+    image = None
+
+    def __init__(self, mode, size):
+        self.image = Image.new(mode, size)
+
+    def write(self, y, strip):
+        self.image.paste(strip, (0, y))
+
+
+class RawStripWriter(object):
+    """Writes packed rows of strips into binary file object
+    sequentially. File object can be a pipe to image encoder.
+
+    :param fileptr: binary file object
+    :param rawmode: PIL raw mode of packed rows, strip mode if None
+    """
+
+    fileptr = None
+    rawmode = None
+
+    def __init__(self, fileptr, rawmode=None):
+        self.fileptr = fileptr
+        self.rawmode = rawmode
+
+    def write(self, y, strip):
+        self.fileptr.write(strip.tobytes('raw', self.rawmode or strip.mode))
+
+
+class BufferStripWriter(object):
+    """Writes packed rows of strips into writable buffer
+    (mmap, bytearray, NumPy memmap etc.) at row offsets.
+
+    :param buffer: writable buffer of height * stride bytes at least
+    :param stride: size in bytes of packed row
+    :param offset: offset of the first row in buffer
+    :param rawmode: PIL raw mode of packed rows, strip mode if None
+    """
+
+    buffer = None
+    stride = 0
+    offset = 0
+    rawmode = None
+
+    def __init__(self, buffer, stride, offset=0, rawmode=None):
+        self.buffer = memoryview(buffer).cast('B')
+        self.stride = stride
+        self.offset = offset
+        self.rawmode = rawmode
+
+    def write(self, y, strip):
+        data = strip.tobytes('raw', self.rawmode or strip.mode)
+        start = self.offset + y * self.stride
+        self.buffer[start:start + len(data)] = data
@@ -17,7 +17,12 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import base64
+import importlib
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import NamedTemporaryFile
 
 from PIL import Image
 
@@ -43,16 +48,37 @@ def get_version():
 COLOR_RNG = range(256)
 
 
-def cms_set_alarm_codes(r, g, b):
+def cms_create_context():
+    """Returns a handle to new lcms context wrapped as a Python object.
+    Context keeps its own alarm codes and records last lcms error,
+    so transforms created in different contexts do not share
+    global lcms state.
+
+    :return: handle to lcms context
+    """
+    return _cms.createContext()
+
+
+def cms_get_context_error(context):
+    """Returns last error reported by lcms in context as
+    (error code, message) tuple or None. Error is cleared.
+
+    :param context: valid lcms context handle
+    """
+    return _cms.getContextError(context)
+
+
+def cms_set_alarm_codes(r, g, b, context=None):
     """Used to define gamut check marker.
     r,g,b are expected to be integers in range 0..255
 
     :param r: red channel
     :param g: green channel
     :param b: blue channel
+    :param context: lcms context handle, global context if None
     """
     if r in COLOR_RNG and g in COLOR_RNG and b in COLOR_RNG:
-        _cms.setAlarmCodes(r, g, b)
+        _cms.setAlarmCodes(r, g, b, context)
     else:
         raise CmsError('r,g,b are expected to be integers in range 0..255')
 
@@ -99,6 +125,56 @@ def cms_open_profile_from_string(profile_str):
     return result
 
 
+RESOURCE_MODULES = {
+    uc2const.COLOR_RGB: 'srgb_profile_rc',
+    uc2const.COLOR_CMYK: 'cmyk_profile_rc',
+    uc2const.COLOR_LAB: 'lab_profile_rc',
+    uc2const.COLOR_GRAY: 'gray_profile_rc',
+    uc2const.COLOR_DISPLAY: 'display_profile_rc',
+}
+
+PROFILE_DATA = {}
+
+
+def get_default_profile_data(colorspace):
+    """Returns content of built-in profile. Resource is decoded
+    on first request only and memoized.
+
+    :param colorspace: colorspace constant
+    :return: ICC profile as a bytes string
+    """
+    if colorspace not in PROFILE_DATA:
+        if colorspace not in RESOURCE_MODULES:
+            msg = 'Unexpected colorspace requested %s'
+            raise CmsError(msg % str(colorspace))
+        module = importlib.import_module(
+            '.' + RESOURCE_MODULES[colorspace], __package__)
+        PROFILE_DATA[colorspace] = base64.b32decode(module.RESOURCE)
+    return PROFILE_DATA[colorspace]
+
+
+def get_default_profile_resource(colorspace):
+    """Returns named temporary file object of built-in profile.
+
+    :param colorspace: colorspace constant
+    :return: named temporary file object
+    """
+    resource_file = NamedTemporaryFile()
+    resource_file.write(get_default_profile_data(colorspace))
+    resource_file.file.seek(0)
+    return resource_file
+
+
+def save_default_profile(path, colorspace):
+    """Saves content of built-in profile.
+
+    :param path: profile path as a string
+    :param colorspace: colorspace constant
+    """
+    with open(path, 'wb') as fileptr:
+        fileptr.write(get_default_profile_data(colorspace))
+
+
 def cms_create_srgb_profile():
     """Artificial functionality. The function emulates built-in sRGB
     profile reading profile resource attached to the package.
@@ -109,9 +185,8 @@ def cms_create_srgb_profile():
 
     :return: handle to lcms built-in sRGB profile
     """
-    from . import srgb_profile_rc
-    profile = srgb_profile_rc.get_resource(True)
-    return cms_open_profile_from_file(profile.name)
+    return cms_open_profile_from_string(
+        get_default_profile_data(uc2const.COLOR_RGB))
 
 
 def get_srgb_profile_resource():
@@ -119,8 +194,7 @@ def get_srgb_profile_resource():
 
     :return: path to sRGB profile
     """
-    from . import srgb_profile_rc
-    return srgb_profile_rc.get_resource(True)
+    return get_default_profile_resource(uc2const.COLOR_RGB)
 
 
 def save_srgb_profile(path):
@@ -128,8 +202,7 @@ def save_srgb_profile(path):
 
     :param path: sRGB profile path as a string
     """
-    from . import srgb_profile_rc
-    srgb_profile_rc.save_resource(path)
+    save_default_profile(path, uc2const.COLOR_RGB)
 
 
 def cms_create_cmyk_profile():
@@ -142,9 +215,8 @@ def cms_create_cmyk_profile():
 
     :return: handle to lcms built-in CMYK profile
     """
-    from . import cmyk_profile_rc
-    profile = cmyk_profile_rc.get_resource(True)
-    return cms_open_profile_from_file(profile.name)
+    return cms_open_profile_from_string(
+        get_default_profile_data(uc2const.COLOR_CMYK))
 
 
 def get_cmyk_profile_resource():
@@ -152,8 +224,7 @@ def get_cmyk_profile_resource():
 
     :return: path to built-in CMYK profile
     """
-    from . import cmyk_profile_rc
-    return cmyk_profile_rc.get_resource(True)
+    return get_default_profile_resource(uc2const.COLOR_CMYK)
 
 
 def save_cmyk_profile(path):
@@ -161,8 +232,7 @@ def save_cmyk_profile(path):
 
     :param path: CMYK profile path as a string
     """
-    from . import cmyk_profile_rc
-    cmyk_profile_rc.save_resource(path)
+    save_default_profile(path, uc2const.COLOR_CMYK)
 
 
 def cms_create_display_profile():
@@ -177,9 +247,8 @@ def cms_create_display_profile():
 
     :return: handle to lcms built-in display profile
     """
-    from . import display_profile_rc
-    profile = display_profile_rc.get_resource(True)
-    return cms_open_profile_from_file(profile.name)
+    return cms_open_profile_from_string(
+        get_default_profile_data(uc2const.COLOR_DISPLAY))
 
 
 def get_display_profile_resource():
@@ -187,8 +256,7 @@ def get_display_profile_resource():
 
     :return: path to built-in display profile
     """
-    from . import display_profile_rc
-    return display_profile_rc.get_resource(True)
+    return get_default_profile_resource(uc2const.COLOR_DISPLAY)
 
 
 def save_display_profile(path):
@@ -196,8 +264,7 @@ def save_display_profile(path):
 
     :param path: display profile path as a string
     """
-    from . import display_profile_rc
-    display_profile_rc.save_resource(path)
+    save_default_profile(path, uc2const.COLOR_DISPLAY)
 
 
 def cms_create_lab_profile():
@@ -210,9 +277,8 @@ def cms_create_lab_profile():
 
     :return: handle to lcms built-in display profile
     """
-    from . import lab_profile_rc
-    profile = lab_profile_rc.get_resource(True)
-    return cms_open_profile_from_file(profile.name)
+    return cms_open_profile_from_string(
+        get_default_profile_data(uc2const.COLOR_LAB))
 
 
 def get_lab_profile_resource():
@@ -220,8 +286,7 @@ def get_lab_profile_resource():
 
     :return: path to built-in Lab profile
     """
-    from . import lab_profile_rc
-    return lab_profile_rc.get_resource(True)
+    return get_default_profile_resource(uc2const.COLOR_LAB)
 
 
 def save_lab_profile(path):
@@ -229,8 +294,7 @@ def save_lab_profile(path):
 
     :param path: Lab profile path as a string
     """
-    from . import lab_profile_rc
-    lab_profile_rc.save_resource(path)
+    save_default_profile(path, uc2const.COLOR_LAB)
 
 
 def cms_create_gray_profile():
@@ -243,9 +307,8 @@ def cms_create_gray_profile():
 
     :return: handle to lcms built-in Gray profile
     """
-    from . import gray_profile_rc
-    profile = gray_profile_rc.get_resource(True)
-    return cms_open_profile_from_file(profile.name)
+    return cms_open_profile_from_string(
+        get_default_profile_data(uc2const.COLOR_GRAY))
 
 
 def get_gray_profile_resource():
@@ -253,8 +316,7 @@ def get_gray_profile_resource():
 
     :return: path to built-in Gray profile
     """
-    from . import gray_profile_rc
-    return gray_profile_rc.get_resource(True)
+    return get_default_profile_resource(uc2const.COLOR_GRAY)
 
 
 def save_gray_profile(path):
@@ -262,8 +324,7 @@ def save_gray_profile(path):
 
     :param path: Gray profile path as a string
     """
-    from . import gray_profile_rc
-    gray_profile_rc.save_resource(path)
+    save_default_profile(path, uc2const.COLOR_GRAY)
 
 
 FUNC_MAP = {
@@ -328,9 +389,14 @@ def cms_save_default_profile(path, colorspace):
 INTENTS = (0, 1, 2, 3)
 
 
+def get_context_error_msg(msg, context):
+    error = None if context is None else cms_get_context_error(context)
+    return msg if error is None else '%s (%s)' % (msg, error[1])
+
+
 def cms_create_transform(in_profile, in_mode, out_profile, out_mode,
                          intent=uc2const.INTENT_PERCEPTUAL,
-                         flags=uc2const.cmsFLAGS_NOTPRECALC):
+                         flags=uc2const.cmsFLAGS_NOTPRECALC, context=None):
     """Returns a handle to lcms transformation wrapped as a Python object.
 
     :param in_profile: valid lcms profile handle
@@ -339,6 +405,7 @@ def cms_create_transform(in_profile, in_mode, out_profile, out_mode,
     :param out_mode: valid lcms or PIL mode
     :param intent: integer constant (0-3) of transform rendering intent
     :param flags: lcms flags
+    :param context: lcms context handle, global context if None
 
     :return: handle to lcms transformation
     """
@@ -347,11 +414,12 @@ def cms_create_transform(in_profile, in_mode, out_profile, out_mode,
         raise CmsError('renderingIntent must be an integer between 0 and 3')
 
     result = _cms.buildTransform(in_profile, in_mode, out_profile, out_mode,
-                                 intent, flags)
+                                 intent, flags, context)
 
     if result is None:
         msg = 'Cannot create requested transform'
-        raise CmsError("%s: %s %s" % (msg, in_mode, out_mode))
+        msg = "%s: %s %s" % (msg, in_mode, out_mode)
+        raise CmsError(get_context_error_msg(msg, context))
 
     return result
 
@@ -360,7 +428,8 @@ def cms_create_proofing_transform(in_profile, in_mode, out_profile, out_mode,
                                   proof_profile,
                                   intent=uc2const.INTENT_PERCEPTUAL,
                                   pintent=uc2const.INTENT_RELATIVE_COLORIMETRIC,
-                                  flags=uc2const.cmsFLAGS_SOFTPROOFING):
+                                  flags=uc2const.cmsFLAGS_SOFTPROOFING,
+                                  context=None):
     """Returns a handle to lcms transformation wrapped as a Python object.
 
     :param in_profile: valid lcms profile handle
@@ -371,6 +440,7 @@ def cms_create_proofing_transform(in_profile, in_mode, out_profile, out_mode,
     :param intent: integer constant (0-3) of transform rendering intent
     :param pintent: integer constant (0-3) of transform proofing intent
     :param flags: lcms flags
+    :param context: lcms context handle, global context if None
 
     :return: handle to lcms transformation
     """
@@ -384,11 +454,59 @@ def cms_create_proofing_transform(in_profile, in_mode, out_profile, out_mode,
     result = _cms.buildProofingTransform(in_profile, in_mode,
                                          out_profile, out_mode,
                                          proof_profile, intent,
-                                         pintent, flags)
+                                         pintent, flags, context)
 
     if result is None:
         msg = 'Cannot create requested proofing transform'
-        raise CmsError("%s: %s %s" % (msg, in_mode, out_mode))
+        msg = "%s: %s %s" % (msg, in_mode, out_mode)
+        raise CmsError(get_context_error_msg(msg, context))
+
+    return result
+
+
+def cms_create_devicelink_transform(devicelink, in_mode, out_mode,
+                                    intent=uc2const.INTENT_PERCEPTUAL,
+                                    flags=uc2const.cmsFLAGS_NOTPRECALC,
+                                    context=None):
+    """Returns a handle to lcms transformation built from device link
+    profile wrapped as a Python object.
+
+    :param devicelink: valid lcms device link profile handle
+    :param in_mode: valid lcms or PIL mode
+    :param out_mode: valid lcms or PIL mode
+    :param intent: integer constant (0-3) of transform rendering intent
+    :param flags: lcms flags
+    :param context: lcms context handle, global context if None
+
+    :return: handle to lcms transformation
+    """
+
+    if intent not in INTENTS:
+        raise CmsError('renderingIntent must be an integer between 0 and 3')
+
+    result = _cms.buildDeviceLinkTransform(devicelink, in_mode, out_mode,
+                                           intent, flags, context)
+
+    if result is None:
+        msg = 'Cannot create requested device link transform'
+        msg = "%s: %s %s" % (msg, in_mode, out_mode)
+        raise CmsError(get_context_error_msg(msg, context))
+
+    return result
+
+
+def cms_save_devicelink(transform, version=4.3, flags=0):
+    """Serializes lcms transformation as ICC device link profile.
+
+    :param transform: valid lcms transformation handle
+    :param version: ICC version of device link profile
+    :param flags: lcms flags
+    :return: device link profile as a bytes string
+    """
+    result = _cms.saveDeviceLink(transform, version, flags)
+
+    if result is None:
+        raise CmsError('Cannot create device link for provided transform')
 
     return result
 
@@ -413,14 +531,100 @@ def cms_do_transform(transform, inbuff, outbuff):
         raise CmsError(msg)
 
 
-def cms_do_bitmap_transform(transform, image, in_mode, out_mode):
+def cms_do_transform_many(transform, inbuff):
+    """Transforms list of color values using provided lcms transform
+    handle. All colors are packed into single contiguous buffer and
+    processed by one native call.
+
+    :param transform: valid lcms transformation handle
+    :param inbuff: list of 4-member lists. The members should be
+                   between 0 and 255
+    :return: list of 4-member lists
+    """
+    if not isinstance(inbuff, (list, tuple)):
+        raise CmsError('inbuff must be a list of 4-member lists')
+    if not inbuff:
+        return []
+    try:
+        packed = bytes(value & 0xff for item in inbuff for value in item)
+    except TypeError:
+        raise CmsError('inbuff must be a list of 4-member lists')
+    if not len(packed) == 4 * len(inbuff):
+        raise CmsError('inbuff must be a list of 4-member lists')
+
+    ret = _cms.transformPixelArray(transform, packed, len(inbuff))
+    return [list(ret[i:i + 4]) for i in range(0, len(ret), 4)]
+
+
+def cms_get_transform_pixel_sizes(transform):
+    """Returns pixel sizes in bytes of transform input and output formats.
+
+    :param transform: valid lcms transformation handle
+    :return: (input pixel size, output pixel size) tuple
+    """
+    return _cms.getTransformPixelSizes(transform)
+
+
+def cms_do_buffer_transform(transform, src, dst, npixels=None):
+    """Transforms pixels from src buffer into dst buffer in place.
+    Both buffers can be any C-contiguous objects supporting buffer
+    protocol (bytes, bytearray, memoryview, array.array, mmap,
+    NumPy arrays). dst should be writable and can be the same object
+    as src. Pixels should be packed according to transform formats.
+
+    :param transform: valid lcms transformation handle
+    :param src: source buffer
+    :param dst: writable destination buffer
+    :param npixels: number of pixels to transform, if None
+                    calculated from src buffer size
+    """
+    in_size = cms_get_transform_pixel_sizes(transform)[0]
+    try:
+        if npixels is None:
+            npixels = memoryview(src).nbytes // in_size
+        _cms.transformBuffer(transform, src, dst, npixels)
+    except (TypeError, ValueError, BufferError) as e:
+        raise CmsError('Cannot transform buffer: %s' % str(e))
+
+
+BAND_MIN_HEIGHT = 64
+
+# Shared thread pool for bitmap bands, so bitmap transforms
+# don't start and join threads on every call.
+BITMAP_EXECUTOR = None
+BITMAP_EXECUTOR_WORKERS = 0
+BITMAP_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_bitmap_executor(workers):
+    """Returns shared thread pool for bitmap bands. Pool is replaced
+    by bigger one if more workers are requested than it has.
+
+    :param workers: required number of threads
+    :return: ThreadPoolExecutor instance
+    """
+    global BITMAP_EXECUTOR, BITMAP_EXECUTOR_WORKERS
+    with BITMAP_EXECUTOR_LOCK:
+        if BITMAP_EXECUTOR_WORKERS < workers:
+            if BITMAP_EXECUTOR is not None:
+                BITMAP_EXECUTOR.shutdown(wait=False)
+            BITMAP_EXECUTOR = ThreadPoolExecutor(max_workers=workers)
+            BITMAP_EXECUTOR_WORKERS = workers
+        return BITMAP_EXECUTOR
+
+
+def cms_do_bitmap_transform(transform, image, in_mode, out_mode, workers=1):
     """Provides PIL images support for color management.
     Currently supports L, RGB, CMYK and LAB modes only.
+    If workers is greater than 1 the image is split into row bands
+    which are transformed on a thread pool. In this case transform
+    should be created with cmsFLAGS_NOCACHE flag.
 
     :param transform: valid lcms transformation handle
     :param image: valid PIL image object
     :param in_mode: valid lcms or PIL mode
     :param out_mode: valid lcms or PIL mode
+    :param workers: number of threads to process the image
 
     :return: new PIL image object in out_mode colorspace
     """
@@ -438,7 +642,18 @@ def cms_do_bitmap_transform(transform, image, in_mode, out_mode):
     image.load()
     new_image = Image.new(out_mode, (w, h))
 
-    _cms.transformBitmap(transform, image.im, new_image.im, w, h)
+    workers = max(1, min(workers, h // BAND_MIN_HEIGHT))
+    if workers == 1:
+        _cms.transformBitmap(transform, image.im, new_image.im, w, h)
+    else:
+        step = -(-h // workers)
+        bands = [(y, min(y + step, h)) for y in range(0, h, step)]
+
+        def do_band(band):
+            _cms.transformBitmap(transform, image.im, new_image.im,
+                                 w, h, band[0], band[1])
+
+        list(get_bitmap_executor(workers).map(do_band, bands))
 
     return new_image
 
@@ -468,3 +683,16 @@ def cms_get_profile_copyright(profile):
     :return: profile copyright info string
     """
     return _cms.getProfileInfoCopyright(profile).decode('cp1252').strip()
+
+
+def cms_get_profile_id(profile):
+    """Returns ICC profile ID (MD5 digest of profile content).
+    If profile header doesn't contain ID, it is calculated.
+
+    :param profile: valid lcms profile handle
+    :return: profile ID as a hex string
+    """
+    try:
+        return _cms.getProfileID(profile).hex()
+    except (TypeError, ValueError) as e:
+        raise CmsError('Cannot get profile ID: %s' % str(e))
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Lookup table approximation of color transforms.
+Transform is sampled once onto regular grid of input values and
+colors are evaluated by tetrahedral (simplex) or trilinear
+interpolation between grid nodes. The module depends on NumPy only,
+so stored tables can be used without LittleCMS.
+"""
+
+import itertools
+
+import numpy as np
+
+from uc2.uc2const import COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY
+from .vectorized import delta_e76
+
+TETRAHEDRAL = 'tetrahedral'
+TRILINEAR = 'trilinear'
+INTERPOLATIONS = (TETRAHEDRAL, TRILINEAR)
+
+GRID_SIZES = {COLOR_RGB: 33, COLOR_CMYK: 17, COLOR_LAB: 33, COLOR_GRAY: 256}
+
+
+def get_grid(channels, size):
+    """Returns (size ** channels, channels) array of grid nodes.
+    The last channel varies fastest.
+    """
+    axis = np.linspace(0.0, 1.0, size)
+    mesh = np.meshgrid(*([axis] * channels), indexing='ij')
+    return np.stack(mesh, axis=-1).reshape(-1, channels)
+
+
+def max_delta_e(lab0, lab1):
+    """Returns max CIE76 color difference between two arrays
+    of normalized Lab values.
+    """
+    if not len(lab0):
+        return 0.0
+    return float(delta_e76(lab0, lab1).max())
+
+
+class ColorLUT(object):
+    """Color lookup table. Table is (size,) * channels_in + (channels_out,)
+    array of output color values sampled on regular grid.
+    """
+
+    table = None
+    nodes = None
+    strides = None
+    size = 0
+    channels_in = 0
+    channels_out = 0
+    interpolation = TETRAHEDRAL
+
+    def __init__(self, table, interpolation=TETRAHEDRAL):
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError('Unsupported interpolation %s' % interpolation)
+        self.table = np.asarray(table, dtype=np.float64)
+        self.size = self.table.shape[0]
+        self.channels_in = self.table.ndim - 1
+        self.channels_out = self.table.shape[-1]
+        if self.size < 2 or \
+                not self.table.shape[:-1] == (self.size,) * self.channels_in:
+            raise ValueError('Incorrect lookup table shape %s'
+                             % str(self.table.shape))
+        self.interpolation = interpolation
+        self.strides = self.size ** np.arange(self.channels_in - 1, -1, -1)
+        self.nodes = self.table.reshape(-1, self.channels_out)
+
+    @classmethod
+    def build(cls, func, channels, size, interpolation=TETRAHEDRAL):
+        """Samples transform function onto grid.
+
+        :param func: function converting (N, channels) array of color
+                     values into (N, channels_out) array
+        :param channels: number of input channels
+        :param size: number of grid nodes per channel
+        :param interpolation: interpolation method
+        """
+        nodes = np.asarray(func(get_grid(channels, size)), dtype=np.float64)
+        table = nodes.reshape((size,) * channels + (nodes.shape[-1],))
+        return cls(table, interpolation)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['table'], str(data['interpolation']))
+
+    def save(self, path):
+        with open(path, 'wb') as fileptr:
+            np.savez(fileptr, table=self.table,
+                     interpolation=self.interpolation)
+
+    def __call__(self, values):
+        """Returns (N, channels_out) array of interpolated color values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = np.clip(values.reshape(-1, self.channels_in), 0.0, 1.0)
+        scaled = values * (self.size - 1)
+        base = np.minimum(scaled.astype(np.intp), self.size - 2)
+        frac = scaled - base
+        index = base @ self.strides
+        if self.interpolation == TETRAHEDRAL:
+            return self.interpolate_simplex(index, frac)
+        return self.interpolate_linear(index, frac)
+
+    def interpolate_simplex(self, index, frac):
+        # Grid cell is split into simplices (tetrahedra for 3 channels)
+        # along the main diagonal; simplex is selected by order
+        # of fractional parts.
+        order = np.argsort(-frac, axis=1, kind='stable')
+        frac = np.take_along_axis(frac, order, axis=1)
+        weights = np.diff(frac, axis=1, prepend=1.0, append=0.0)
+        result = self.nodes[index] * -weights[:, :1]
+        for i in range(self.channels_in):
+            index = index + self.strides[order[:, i]]
+            result -= self.nodes[index] * weights[:, i + 1:i + 2]
+        return result
+
+    def interpolate_linear(self, index, frac):
+        result = np.zeros((len(index), self.channels_out))
+        for corner in itertools.product((0, 1), repeat=self.channels_in):
+            corner = np.array(corner)
+            weight = np.where(corner, frac, 1.0 - frac).prod(axis=1)
+            result += self.nodes[index + corner @ self.strides] * \
+                weight[:, np.newaxis]
+        return result
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Opt-in instrumentation of color manager.
+Metrics are collected only if color manager has metrics object
+(see ColorManager.enable_metrics()).
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Counters
+TRANSFORM_HITS = 'transform_hits'
+TRANSFORM_CACHE_HITS = 'transform_cache_hits'
+DEVICELINK_LOADS = 'devicelink_loads'
+DISPLAY_CACHE_HITS = 'display_cache_hits'
+DISPLAY_CACHE_MISSES = 'display_cache_misses'
+SINGLE_CALLS = 'single_calls'
+BULK_CALLS = 'bulk_calls'
+BULK_COLORS = 'bulk_colors'
+SIMPLE_TRANSFORMS = 'simple_transforms'
+LUT_TRANSFORMS = 'lut_transforms'
+BITMAP_CALLS = 'bitmap_calls'
+BITMAP_MEGAPIXELS = 'bitmap_megapixels'
+
+# Timers
+TRANSFORM_BUILD = 'transform_build'
+LCMS_CALL = 'lcms_call'
+
+
+class CmsMetrics(object):
+    """Thread-safe set of counters and timers.
+    Timer stores number of calls, total and max time in seconds.
+    """
+
+    lock = None
+    counters = None
+    timers = None
+    started = 0.0
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.timers = {}
+            self.started = time.time()
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def get_counter(self, name):
+        return self.counters.get(name, 0)
+
+    def get_timer(self, name):
+        """Returns (calls, total seconds, max seconds) tuple.
+        """
+        return tuple(self.timers.get(name, (0, 0.0, 0.0)))
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'started': self.started,
+                'duration': time.time() - self.started,
+                'counters': dict(self.counters),
+                'timers': {name: {'calls': calls, 'total': total,
+                                  'max': max_time,
+                                  'mean': total / calls if calls else 0.0}
+                           for name, (calls, total, max_time)
+                           in self.timers.items()},
+            }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2, sort_keys=True)
+
+    def to_text(self):
+        data = self.as_dict()
+        lines = ['CMS metrics (%.3f s):' % data['duration']]
+        for name, value in sorted(data['counters'].items()):
+            value = '%.3f' % value if isinstance(value, float) else value
+            lines.append('  %s: %s' % (name, value))
+        for name, timer in sorted(data['timers'].items()):
+            lines.append('  %s: %d calls, %.6f s total, %.6f s max'
+                         % (name, timer['calls'], timer['total'],
+                            timer['max']))
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        """Writes metrics into JSON file.
+        """
+        with open(path, 'w') as fileptr:
+            fileptr.write(self.to_json())
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Spatial index of palette colors in CIE L*a*b* colorspace.
+Colors are stored in uniform grid of cubic cells, so nearest color
+and within-radius queries check only cells around requested color.
+Distances are CIE76 color differences.
+"""
+
+import itertools
+import json
+import math
+from collections import namedtuple
+
+from . import delta_e
+
+DEFAULT_CELL_SIZE = 5.0
+INDEX_EXT = '.labindex'
+INDEX_VERSION = 1
+
+IndexItem = namedtuple('IndexItem', 'id lab color palette')
+
+
+def get_index_path(palette_path):
+    """Returns path of index file stored next to palette file.
+    """
+    return palette_path + INDEX_EXT
+
+
+class PaletteIndex(object):
+    """Nearest color index over colors of one or several palettes.
+
+    :param palettes: SK1Palette object or list of palettes
+    :param cms: color manager used for Lab conversion
+    :param cell_size: grid cell size in Lab units
+    """
+
+    cms = None
+    cell_size = DEFAULT_CELL_SIZE
+    items = None
+    cells = None
+    bounds = None
+    next_id = 0
+
+    def __init__(self, palettes=None, cms=None, cell_size=DEFAULT_CELL_SIZE):
+        self.cms = cms
+        self.cell_size = float(cell_size)
+        self.items = {}
+        self.cells = {}
+        # min and max cell coordinates ever used
+        self.bounds = None
+        if palettes is not None:
+            if not isinstance(palettes, (list, tuple)):
+                palettes = [palettes, ]
+            for palette in palettes:
+                self.add_palette(palette)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item_id):
+        return item_id in self.items
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def get_cell(self, lab):
+        return tuple(int(math.floor(x / self.cell_size)) for x in lab)
+
+    def add_palette(self, palette):
+        """Adds all palette colors using batched Lab conversion.
+        Returns list of item ids.
+        """
+        return self.insert_many(palette.colors, palette.name)
+
+    def insert_many(self, colors, palette=''):
+        lab = delta_e.to_lab(colors, self.cms).tolist()
+        return [self.insert_lab(vals, color, palette)
+                for vals, color in zip(lab, colors)]
+
+    def insert(self, color, palette=''):
+        """Adds color to index. Returns item id.
+        """
+        return self.insert_many([color, ], palette)[0]
+
+    def insert_lab(self, lab, color, palette=''):
+        item = IndexItem(self.next_id, tuple(lab), color, palette)
+        self.next_id += 1
+        self.items[item.id] = item
+        cell = self.get_cell(item.lab)
+        self.cells.setdefault(cell, set()).add(item.id)
+        if self.bounds is None:
+            self.bounds = (cell, cell)
+        else:
+            self.bounds = (tuple(map(min, self.bounds[0], cell)),
+                           tuple(map(max, self.bounds[1], cell)))
+        return item.id
+
+    def delete(self, item_id):
+        """Removes item from index.
+        """
+        item = self.items.pop(item_id)
+        cell = self.get_cell(item.lab)
+        self.cells[cell].discard(item_id)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def iter_shell(self, center, ring):
+        """Yields occupied cells on Chebyshev distance ring from center cell.
+        """
+        shell_size = (2 * ring + 1) ** 3 - max(2 * ring - 1, 0) ** 3
+        if shell_size > len(self.cells):
+            for cell in list(self.cells):
+                if max(abs(x - y) for x, y in zip(cell, center)) == ring:
+                    yield cell
+            return
+        span = range(-ring, ring + 1)
+        for offset in itertools.product(span, repeat=3):
+            if max(abs(x) for x in offset) == ring:
+                cell = tuple(x + y for x, y in zip(center, offset))
+                if cell in self.cells:
+                    yield cell
+
+    def get_max_ring(self, center):
+        lo, hi = self.bounds
+        return max(max(abs(c - x), abs(c - y))
+                   for c, x, y in zip(center, lo, hi))
+
+    def nearest_lab(self, lab, k=1):
+        """Returns list of up to k (delta E, IndexItem) tuples
+        for items nearest to Lab color, sorted by distance.
+        """
+        if not self.items or k < 1:
+            return []
+        center = self.get_cell(lab)
+        max_ring = self.get_max_ring(center)
+        found = []
+        for ring in range(max_ring + 1):
+            for cell in self.iter_shell(center, ring):
+                for item_id in self.cells[cell]:
+                    item = self.items[item_id]
+                    found.append((math.dist(lab, item.lab), item))
+            found.sort(key=lambda x: x[0])
+            del found[k:]
+            # items of farther rings are at least ring * cell_size away
+            if len(found) == k and found[-1][0] <= ring * self.cell_size:
+                break
+        return found
+
+    def within_lab(self, lab, radius):
+        """Returns list of (delta E, IndexItem) tuples for items
+        within radius from Lab color, sorted by distance.
+        """
+        if not self.items:
+            return []
+        center = self.get_cell(lab)
+        max_ring = min(self.get_max_ring(center),
+                       int(radius // self.cell_size) + 1)
+        found = []
+        for ring in range(max_ring + 1):
+            for cell in self.iter_shell(center, ring):
+                for item_id in self.cells[cell]:
+                    item = self.items[item_id]
+                    distance = math.dist(lab, item.lab)
+                    if distance <= radius:
+                        found.append((distance, item))
+        found.sort(key=lambda x: x[0])
+        return found
+
+    def nearest(self, color, k=1):
+        """Returns k nearest palette colors for [cs, values, alpha, name]
+        color as list of (delta E, IndexItem) tuples.
+        """
+        return self.nearest_lab(delta_e.to_lab([color, ], self.cms)[0], k)
+
+    def within(self, color, radius):
+        """Returns palette colors within radius (delta E) from
+        [cs, values, alpha, name] color as list of (delta E, IndexItem)
+        tuples.
+        """
+        return self.within_lab(delta_e.to_lab([color, ], self.cms)[0],
+                               radius)
+
+    def save(self, path):
+        data = {
+            'version': INDEX_VERSION,
+            'cell_size': self.cell_size,
+            'items': [[item.lab, item.color, item.palette]
+                      for item in self.items.values()],
+        }
+        with open(path, 'w') as fileptr:
+            json.dump(data, fileptr)
+
+    @classmethod
+    def load(cls, path, cms=None):
+        """Loads stored index. Lab values are stored in index file,
+        so loading requires no color management.
+        """
+        with open(path) as fileptr:
+            data = json.load(fileptr)
+        if not data.get('version') == INDEX_VERSION:
+            raise ValueError('Unsupported palette index version')
+        index = cls(cms=cms, cell_size=data['cell_size'])
+        for lab, color, palette in data['items']:
+            index.insert_lab(lab, color, palette)
+        return index
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Array based implementation of simple (non color managed) color
+transformations. Functions accept (N, channels) arrays of generic
+color values and apply the same math as scalar functions
+of uc2.cms module to all colors at once.
+"""
+
+import numpy as np
+
+from uc2.uc2const import COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY
+
+CHANNELS = {COLOR_RGB: 3, COLOR_CMYK: 4, COLOR_LAB: 3, COLOR_GRAY: 1}
+
+# linear sRGB -> normalized XYZ
+RGB_TO_XYZ = np.array([
+    [10135552.0 / 23359437.0, 8788810.0 / 23359437.0,
+     4435075.0 / 23359437.0],
+    [871024.0 / 4096299.0, 8788810.0 / 12288897.0, 887015.0 / 12288897.0],
+    [158368.0 / 8920923.0, 8788810.0 / 80288307.0, 70074185.0 / 80288307.0],
+])
+
+# normalized XYZ -> linear sRGB
+XYZ_TO_RGB = np.array([
+    [1219569.0 / 395920.0, -608687.0 / 395920.0, -107481.0 / 197960.0],
+    [-80960619.0 / 87888100.0, 82435961.0 / 43944050.0,
+     3976797.0 / 87888100.0],
+    [93813.0 / 1774030.0, -180961.0 / 887015.0, 107481.0 / 93370.0],
+])
+
+PRECISION = 3
+
+# Scales to get real CIE L*a*b* differences from normalized Lab values
+LAB_SCALES = np.array([100.0, 255.0, 255.0])
+
+
+def to_array(values, channels):
+    """Returns list of color values as (N, channels) float64 array.
+    """
+    return np.asarray(values, dtype=np.float64).reshape(-1, channels)
+
+
+def pack_array(arr, scales):
+    """Returns array of color values converted into lcms
+    pixel values using per channel (scale, offset) pairs.
+    """
+    scale, offset = np.array(scales).T
+    return np.ascontiguousarray(arr * scale + offset)
+
+
+def unpack_array(arr, scales):
+    """Returns array of lcms pixel values converted into
+    color values using per channel (scale, offset) pairs.
+    """
+    scale, offset = np.array(scales).T
+    return np.clip((arr - offset) / scale, 0.0, 1.0)
+
+
+def delta_e76(lab0, lab1):
+    """Returns array of CIE76 color differences between two arrays
+    of normalized Lab values.
+    """
+    diff = (np.asarray(lab0) - np.asarray(lab1)) * LAB_SCALES
+    return np.sqrt((diff * diff).sum(axis=-1))
+
+
+def cmyk_to_rgb(arr):
+    rgb = 1.0 - np.minimum(1.0, arr[:, :3] + arr[:, 3:4])
+    return np.round(rgb, PRECISION)
+
+
+def rgb_to_cmyk(arr):
+    cmy = 1.0 - arr
+    k = cmy.min(axis=1, keepdims=True)
+    return np.hstack((cmy - k, k))
+
+
+def gray_to_cmyk(arr):
+    cmyk = np.zeros((len(arr), 4))
+    cmyk[:, 3] = 1.0 - arr[:, 0]
+    return cmyk
+
+
+def gray_to_rgb(arr):
+    return np.repeat(arr[:, :1], 3, axis=1)
+
+
+def rgb_to_gray(arr):
+    return arr.sum(axis=1, keepdims=True) / 3.0
+
+
+def linear_to_rgb(arr):
+    gamma = np.power(np.maximum(arr, 0.0031308), 1.0 / 2.4) * 1.055 - 0.055
+    return np.where(arr > 0.0031308, gamma, arr * 12.92)
+
+
+def rgb_to_linear(arr):
+    threshold = 0.0031308 * 12.92
+    gamma = np.power(np.maximum(arr, threshold) * (1.0 / 1.055) +
+                     (0.055 / 1.055), 2.4)
+    return np.where(arr > threshold, gamma, arr * (1.0 / 12.92))
+
+
+def xyz_to_lab(arr):
+    root = np.cbrt(arr)
+    return np.where(arr > 216.0 / 24389.0, root,
+                    arr * (841.0 / 108.0) + (4.0 / 29.0))
+
+
+def lab_to_rgb(arr):
+    L = arr[:, 0] * 100.0
+    a = arr[:, 1] * 255.0 - 128.0
+    b = arr[:, 2] * 255.0 - 128.0
+
+    # Lab -> normalized XYZ
+    Y = L * (1.0 / 116.0) + 16.0 / 116.0
+    X = a * (1.0 / 500.0) + Y
+    Z = b * (-1.0 / 200.0) + Y
+    limit = 6.0 / 29.0
+    X = np.where(X > limit, X * X * X, X * (108.0 / 841.0) - 432.0 / 24389.0)
+    Y = np.where(L > 8.0, Y * Y * Y, L * (27.0 / 24389.0))
+    Z = np.where(Z > limit, Z * Z * Z, Z * (108.0 / 841.0) - 432.0 / 24389.0)
+
+    # normalized XYZ -> gamma-compressed sRGB
+    rgb = np.column_stack((X, Y, Z)) @ XYZ_TO_RGB.T
+    return np.round(linear_to_rgb(rgb), PRECISION)
+
+
+def rgb_to_lab(arr):
+    # RGB -> linear sRGB -> normalized XYZ
+    X, Y, Z = xyz_to_lab(rgb_to_linear(arr) @ RGB_TO_XYZ.T).T
+
+    # normalized XYZ -> Lab
+    lab = np.column_stack(((Y * 116.0 - 16.0) / 100.0,
+                           ((X - Y) * 500.0 + 128.0) / 255.0,
+                           ((Y - Z) * 200.0 + 128.0) / 255.0))
+    return np.round(lab, PRECISION)
+
+
+TRANSFORMS = {
+    (COLOR_RGB, COLOR_CMYK): (rgb_to_cmyk,),
+    (COLOR_RGB, COLOR_GRAY): (rgb_to_gray,),
+    (COLOR_RGB, COLOR_LAB): (rgb_to_lab,),
+    (COLOR_CMYK, COLOR_RGB): (cmyk_to_rgb,),
+    (COLOR_CMYK, COLOR_GRAY): (cmyk_to_rgb, rgb_to_gray),
+    (COLOR_CMYK, COLOR_LAB): (cmyk_to_rgb, rgb_to_lab),
+    (COLOR_GRAY, COLOR_RGB): (gray_to_rgb,),
+    (COLOR_GRAY, COLOR_CMYK): (gray_to_cmyk,),
+    (COLOR_GRAY, COLOR_LAB): (gray_to_rgb, rgb_to_lab),
+    (COLOR_LAB, COLOR_RGB): (lab_to_rgb,),
+    (COLOR_LAB, COLOR_CMYK): (lab_to_rgb, rgb_to_cmyk),
+    (COLOR_LAB, COLOR_GRAY): (lab_to_rgb, rgb_to_gray),
+}
+
+
+def do_simple_transform(arr, cs_in, cs_out):
+    """
+    Emulates color management library transformation for
+    (N, channels) array of color values.
+    Returns new (N, channels) array.
+    """
+    arr = to_array(arr, CHANNELS[cs_in])
+    if cs_in == cs_out:
+        return arr.copy()
+    for func in TRANSFORMS[(cs_in, cs_out)]:
+        arr = func(arr)
+    return arr
@@ -16,69 +16,39 @@
 # 	along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
-from importlib import import_module
+import os
 
-from uc2 import events, msgconst
-from uc2 import uc2const
+from uc2 import events, msgconst, uc2const
+from uc2.formats import sniffer
+from uc2.formats.registry import LOADER, SAVER, COLORS, WRITER, get_registry
 from uc2.utils import fsutils
 from uc2.utils.fs import get_file_extension
+from uc2.utils.mixutils import merge_cnf
 
 LOG = logging.getLogger(__name__)
 
-LOADERS = {}
-SAVERS = {}
-CHECKERS = {}
 
-
-def _get_loader(pid):
-    if not isinstance(pid, str):
-        return None
-    if pid in LOADERS:
-        return LOADERS[pid]
-    loader = None
-    try:
-        loader_mod = import_module('uc2.formats.' + pid)
-        loader = getattr(loader_mod, pid + '_loader')
-    except Exception as e:
-        LOG.error('Error accessing <%s> loader %s', pid, e)
-    LOADERS[pid] = loader
-    return loader
-
-
-def _get_saver(pid):
-    if not isinstance(pid, str):
-        return None
-    if pid in SAVERS:
-        return SAVERS[pid]
-    saver = None
-    try:
-        saver_mod = import_module('uc2.formats.' + pid)
-        saver = getattr(saver_mod, pid + '_saver')
-    except Exception as e:
-        LOG.error('Error accessing <%s> saver %s', pid, e)
-    SAVERS[pid] = saver
-    return saver
+def prewarm_formats(fids=None, experimental=False):
+    """Imports format modules in advance. Should be called before
+    forking of worker processes to share imported modules.
+    Returns list of format ids which cannot be resolved.
+    """
+    return get_registry().prewarm(fids, experimental)
 
 
-def _get_checker(pid):
-    if not isinstance(pid, str):
-        return None
-    if pid in CHECKERS:
-        return CHECKERS[pid]
-    checker = None
+def _check(checker, path):
     try:
-        checker_mod = import_module('uc2.formats.' + pid)
-        checker = getattr(checker_mod, 'check_' + pid)
+        return bool(checker and checker(path))
     except Exception as e:
-        LOG.error('Error accessing <%s> checker %s', pid, e)
-    CHECKERS[pid] = checker
-    return checker
+        LOG.debug('Checker %s failed for %s %s', checker, path, e)
+        return False
 
 
 def get_loader_by_id(pid):
-    loader = _get_loader(pid)
+    registry = get_registry()
+    loader = registry.get_loader(pid)
     if not loader:
-        msg = 'Loader is not found for id %s' % (uc2const.FORMAT_NAMES[pid],)
+        msg = 'Loader is not found for id %s' % registry.get_name(pid)
         events.emit(events.MESSAGES, msgconst.ERROR, msg)
     return loader
 
@@ -91,20 +61,30 @@ def get_loader(path, experimental=False, return_id=False):
 
     ret_id = None
 
+    registry = get_registry()
     ext = get_file_extension(path)
     loader = None
-    ld_formats = [] + uc2const.LOADER_FORMATS
+    ld_formats = registry.get_formats(LOADER, experimental)
 
     msg = 'Start to search for loader by file extension %s' % (ext.__str__())
     events.emit(events.MESSAGES, msgconst.INFO, msg)
 
-    if experimental:
-        ld_formats += uc2const.EXPERIMENTAL_LOADERS
-    for item in ld_formats:
-        if ext in uc2const.FORMAT_EXTENSION[item]:
-            checker = _get_checker(item)
-            if checker and checker(path):
-                loader = _get_loader(item)
+    try:
+        detected = sniffer.get_confident(sniffer.sniff_file(path, ld_formats))
+    except Exception as e:
+        LOG.warning('Cannot read file header %s %s', path, e)
+        detected = None
+    if detected is not None:
+        ret_id, confidence = detected
+        loader = registry.get_loader(ret_id)
+        msg = 'Format %s is detected by signature (confidence %.2f)' % \
+              (registry.get_name(ret_id), confidence)
+        events.emit(events.MESSAGES, msgconst.INFO, msg)
+
+    if loader is None:
+        for item in registry.get_by_extension(ext):
+            if item in ld_formats and _check(registry.get_checker(item), path):
+                loader = registry.get_loader(item)
                 ret_id = item
                 break
 
@@ -115,12 +95,10 @@ def get_loader(path, experimental=False, return_id=False):
         events.emit(events.MESSAGES, msgconst.INFO, msg)
 
         for item in ld_formats:
-            checker = _get_checker(item)
-            if checker is not None:
-                if checker(path):
-                    loader = _get_loader(item)
-                    ret_id = item
-                    break
+            if _check(registry.get_checker(item), path):
+                loader = registry.get_loader(item)
+                ret_id = item
+                break
 
     if loader is None:
         msg = 'Loader is not found for %s' % path
@@ -136,27 +114,27 @@ def get_loader(path, experimental=False, return_id=False):
 
 
 def get_saver_by_id(pid):
-    saver = _get_saver(pid)
+    registry = get_registry()
+    saver = registry.get_saver(pid)
     if not saver:
-        msg = 'Saver is not found for id %u' % pid
+        msg = 'Saver is not found for id %s' % registry.get_name(pid)
         events.emit(events.MESSAGES, msgconst.ERROR, msg)
     return saver
 
 
 def get_saver(path, experimental=False, return_id=False):
     ret_id = None
+    registry = get_registry()
     ext = get_file_extension(path)
     saver = None
-    sv_formats = [] + uc2const.SAVER_FORMATS
+    sv_formats = registry.get_formats(SAVER, experimental)
 
     msg = 'Start to search saver by file extension %s' % (ext.__str__())
     events.emit(events.MESSAGES, msgconst.INFO, msg)
 
-    if experimental:
-        sv_formats += uc2const.EXPERIMENTAL_SAVERS
-    for item in sv_formats:
-        if ext in uc2const.FORMAT_EXTENSION[item]:
-            saver = _get_saver(item)
+    for item in registry.get_by_extension(ext):
+        if item in sv_formats:
+            saver = registry.get_saver(item)
             ret_id = item
             break
     if saver is None:
@@ -169,3 +147,87 @@ def get_saver(path, experimental=False, return_id=False):
     if return_id:
         return saver, ret_id
     return saver
+
+
+def iter_colors(path, experimental=False, cnf=None, **kw):
+    """Returns generator of palette file colors in SKP form.
+    Colors are parsed one by one without building document model,
+    so memory consumption doesn't depend on palette size.
+    Format configs have default values updated by cnf.
+    """
+    loader, fid = get_loader(path, experimental, return_id=True)
+    iterator = get_registry().get_colors_iterator(fid) if fid else None
+    if iterator is None:
+        msg = 'Colors reader is not found for %s' % path
+        events.emit(events.MESSAGES, msgconst.ERROR, msg)
+        raise IOError(msg)
+    return iterator(path, cnf=cnf, **kw)
+
+
+def open_palette_writer(path, fid=None, fileptr=None, cnf=None, cms=None,
+                        **kw):
+    """Returns streaming palette writer. Colors in SKP form are written
+    by write_color() one by one without building document model,
+    palette file is completed by close() (writer is context manager).
+    Palette properties (palette_name, source, comments, columns) are
+    writer attributes which should be set before the first color.
+    Format is defined by file extension if format id is not provided.
+    Writer uses cms color manager for color conversions (new
+    ColorManager instance if not provided).
+    """
+    registry = get_registry()
+    if fid is None:
+        writers = registry.get_formats(WRITER)
+        for item in registry.get_by_extension(get_file_extension(path)):
+            if item in writers:
+                fid = item
+                break
+    writer = registry.get_palette_writer(fid) if fid else None
+    if writer is None:
+        msg = 'Palette writer is not found for %s' % path
+        events.emit(events.MESSAGES, msgconst.ERROR, msg)
+        raise IOError(msg)
+    return writer(path, fileptr, cnf=cnf, cms=cms, **kw)
+
+
+def can_transcode(loader_id, saver_id):
+    """Checks are there colors reader and palette writer
+    for direct transcoding between formats.
+    """
+    registry = get_registry()
+    return loader_id in registry.get_formats(COLORS, True) and \
+        saver_id in registry.get_formats(WRITER, True)
+
+
+def is_lossless_transcoding(loader_id, saver_id):
+    """Checks is direct transcoding equivalent to translation through
+    palette models. Colors readers don't provide palette properties,
+    so target format should not store them.
+    """
+    return can_transcode(loader_id, saver_id) and \
+        saver_id in uc2const.BARE_PALETTES
+
+
+def transcode(src, dst, loader_id=None, saver_id=None, cnf=None, cms=None,
+              **kw):
+    """Translates palette colors from streaming colors reader directly
+    into streaming palette writer without building palette models.
+    Palette properties are not read, so palette name is taken from
+    source file name. Returns number of written colors.
+    """
+    if loader_id is None:
+        loader_id = get_loader(src, return_id=True)[1]
+    iterator = get_registry().get_colors_iterator(loader_id) \
+        if loader_id else None
+    if iterator is None:
+        msg = 'Colors reader is not found for %s' % src
+        events.emit(events.MESSAGES, msgconst.ERROR, msg)
+        raise IOError(msg)
+    cnf = merge_cnf(cnf, kw)
+    filename = os.path.basename(src)
+    writer = open_palette_writer(dst, saver_id, cnf=dict(cnf), cms=cms)
+    with writer:
+        writer.palette_name = os.path.splitext(filename)[0]
+        writer.comments = 'Converted from %s' % filename
+        writer.write_colors(iterator(src, cnf=dict(cnf)))
+    return writer.ncolors
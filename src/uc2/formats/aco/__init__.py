@@ -15,7 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.aco.aco_config import ACO_Config
 from uc2.formats.aco.aco_const import ACO1_VER, ACO2_VER
+from uc2.formats.aco.aco_filters import ACO_Loader, ACO_Writer
 from uc2.formats.aco.aco_presenter import ACO_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
 from uc2.utils.fsutils import get_fileptr
@@ -48,6 +50,18 @@ def aco_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def aco_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = ACO_Config()
+    config.update(merge_cnf(cnf, kw))
+    return ACO_Loader().iter_colors(config, filename, fileptr)
+
+
+def aco_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = ACO_Config()
+    config.update(merge_cnf(cnf, kw))
+    return ACO_Writer(config, filename, fileptr, cms)
+
+
 def check_aco(path):
     fileptr = get_fileptr(path)
     string = fileptr.read(2)
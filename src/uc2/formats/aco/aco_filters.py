@@ -15,8 +15,14 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import shutil
+import struct
+import tempfile
 
-from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver
+from uc2.formats.aco import aco_const
+from uc2.formats.aco.aco_model import ACO1_Color, ACO2_Color
+from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver, \
+    AbstractPaletteWriter, SPOOL_SIZE
 
 
 class ACO_Loader(AbstractBinaryLoader):
@@ -25,9 +31,66 @@ class ACO_Loader(AbstractBinaryLoader):
     def do_load(self):
         self.model.parse(self)
 
+    def do_iter_colors(self):
+        # Named colors of ACO2 section are preferred (as in
+        # ACO_Palette.get_color_list()), so ACO1 section is skipped
+        # if ACO2 one follows it.
+        self.fileptr.seek(0, 2)
+        filesize = self.fileptr.tell()
+        self.fileptr.seek(0)
+        version = self.readbytes(2)
+        ncolors = struct.unpack('>H', self.readbytes(2))[0]
+        color_class = ACO2_Color
+        if version == aco_const.ACO1_VER:
+            start = self.fileptr.tell()
+            self.fileptr.seek(start + 10 * ncolors)
+            if self.fileptr.tell() < filesize:
+                self.readbytes(2)
+                ncolors = struct.unpack('>H', self.readbytes(2))[0]
+            else:
+                self.fileptr.seek(start)
+                color_class = ACO1_Color
+        for _i in range(ncolors):
+            obj = color_class()
+            obj.parse(self)
+            color = aco_const.aco_chunk2color(obj.chunk)
+            if color:
+                yield color
+
 
 class ACO_Saver(AbstractSaver):
     name = 'ACO_Saver'
 
     def do_save(self):
         self.model.save(self)
+
+
+class ACO_Writer(AbstractPaletteWriter):
+    """
+    Streaming writer of ACO palette. Colors of ACO1 section are written
+    directly, colors of ACO2 section are spooled until close.
+    Numbers of colors in section headers are known on close, so ACO1
+    header is back-patched.
+    """
+    name = 'ACO_Writer'
+    binary = True
+    max_colors = 0xffff
+    count_pos = 0
+    aco2 = None
+
+    def write_header(self):
+        self.aco2 = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+        self.count_pos = self.fileptr.tell() + 2
+        self.write(aco_const.ACO1_VER + struct.pack('>H', 0))
+
+    def write_item(self, color):
+        self.write(aco_const.color2aco_chunk(color))
+        self.aco2.write(aco_const.color2aco_chunk(color, aco_const.ACO2_VER))
+
+    def write_footer(self):
+        count = struct.pack('>H', self.ncolors)
+        self.patch(self.count_pos, count)
+        self.write(aco_const.ACO2_VER + count)
+        self.aco2.seek(0)
+        shutil.copyfileobj(self.aco2, self.fileptr)
+        self.aco2.close()
@@ -15,7 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.ase.ase_config import ASE_Config
 from uc2.formats.ase.ase_const import ASEF
+from uc2.formats.ase.ase_filters import ASE_Loader, ASE_Writer
 from uc2.formats.ase.ase_presenter import ASE_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
 from uc2.utils.fsutils import get_fileptr
@@ -48,6 +50,18 @@ def ase_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def ase_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = ASE_Config()
+    config.update(merge_cnf(cnf, kw))
+    return ASE_Loader().iter_colors(config, filename, fileptr)
+
+
+def ase_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = ASE_Config()
+    config.update(merge_cnf(cnf, kw))
+    return ASE_Writer(config, filename, fileptr, cms)
+
+
 def check_ase(path):
     fileptr = get_fileptr(path)
     string = fileptr.read(len(ASEF))
@@ -16,7 +16,13 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver
+import struct
+
+from uc2.formats.ase import ase_const
+from uc2.formats.ase.ase_model import BID_TO_CLASS, ASE_Palette, ASE_Group, \
+    ASE_Group_End, ASE_Color
+from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver, \
+    AbstractPaletteWriter
 
 
 class ASE_Loader(AbstractBinaryLoader):
@@ -25,9 +31,50 @@ class ASE_Loader(AbstractBinaryLoader):
     def do_load(self):
         self.model.parse(self)
 
+    def do_iter_colors(self):
+        nblocs = struct.unpack('>I', self.readbytes(12)[8:12])[0]
+        for _i in range(nblocs):
+            bid = self.readbytes(2)
+            self.fileptr.seek(-2, 1)
+            obj = BID_TO_CLASS[bid]()
+            obj.parse(self)
+            if obj.identifier == ase_const.ASE_COLOR:
+                color = obj.get_color()
+                if color:
+                    yield color
+
 
 class ASE_Saver(AbstractSaver):
     name = 'ASE_Saver'
 
     def do_save(self):
         self.model.save(self)
+
+
+class ASE_Writer(AbstractPaletteWriter):
+    """
+    Streaming writer of ASE palette. Colors are written as a group
+    named by palette name, number of blocks is back-patched on close.
+    """
+    name = 'ASE_Writer'
+    binary = True
+    count_pos = 0
+
+    def write_block(self, obj):
+        obj.update()
+        self.write(obj.chunk)
+
+    def write_header(self):
+        self.count_pos = self.fileptr.tell() + 8
+        self.write_block(ASE_Palette())
+        self.write_block(ASE_Group(self.palette_name))
+
+    def write_item(self, color):
+        obj = ASE_Color()
+        obj.set_color(color, self.config.prefer_cmyk_for_spot)
+        self.write_block(obj)
+
+    def write_footer(self):
+        self.write_block(ASE_Group_End())
+        # group and group end blocks
+        self.patch(self.count_pos, struct.pack('>I', self.ncolors + 2))
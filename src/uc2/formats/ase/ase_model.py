@@ -17,6 +17,7 @@
 
 import struct
 
+from uc2 import cms, uc2const
 from uc2.formats.generic import BinaryModelObject
 from uc2.formats.ase import ase_const
 
@@ -177,6 +178,33 @@ class ASE_Color(ASE_Block):
             self.color_vals = struct.unpack('>f', self.chunk[pos:pos + 4])
         self.color_marker = self.chunk[-2:]
 
+    def get_color(self):
+        if self.color_marker == ase_const.ASE_SPOT:
+            if self.colorspace == ase_const.ASE_RGB:
+                vals = [list(self.color_vals), []]
+                return [uc2const.COLOR_SPOT, vals, 1.0, self.color_name]
+            elif self.colorspace == ase_const.ASE_CMYK:
+                vals = [[], list(self.color_vals)]
+                return [uc2const.COLOR_SPOT, vals, 1.0, self.color_name]
+        cs = ase_const.CS_MATCH[self.colorspace]
+        return [cs, list(self.color_vals), 1.0, self.color_name]
+
+    def set_color(self, color, prefer_cmyk_for_spot=False):
+        if color[0] == uc2const.COLOR_SPOT:
+            self.color_marker = ase_const.ASE_SPOT
+            rgb, cmyk = color[1][0], color[1][1]
+            if rgb and (not cmyk or not prefer_cmyk_for_spot):
+                self.colorspace = ase_const.ASE_RGB
+                self.color_vals = tuple(rgb)
+            else:
+                self.colorspace = ase_const.ASE_CMYK
+                self.color_vals = tuple(cmyk)
+        else:
+            self.color_marker = ase_const.ASE_PROCESS
+            self.colorspace = ase_const.CS_MATCH[color[0]]
+            self.color_vals = tuple(color[1])
+        self.color_name = color[3] or cms.verbose_color(color)
+
     def update_for_sword(self):
         ASE_Block.update_for_sword(self)
         self.cache_fields.append((6, 2, 'Color name size'))
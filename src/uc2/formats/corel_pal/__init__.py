@@ -15,6 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.corel_pal.corel_pal_config import CorelPalette_Config
+from uc2.formats.corel_pal.corel_pal_filters import CorelPalette_ColorLoader, \
+    CorelPalette_Writer
 from uc2.formats.corel_pal.corel_pal_presenter import CorelPalette_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
 from uc2.utils.fsutils import get_fileptr
@@ -47,6 +50,18 @@ def corel_pal_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def corel_pal_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = CorelPalette_Config()
+    config.update(merge_cnf(cnf, kw))
+    return CorelPalette_ColorLoader().iter_colors(config, filename, fileptr)
+
+
+def corel_pal_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = CorelPalette_Config()
+    config.update(merge_cnf(cnf, kw))
+    return CorelPalette_Writer(config, filename, fileptr, cms)
+
+
 def check_corel_pal(path):
     fileptr = get_fileptr(path, binary=False)
     ret = False
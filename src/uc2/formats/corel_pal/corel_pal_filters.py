@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import shutil
+
+from uc2.formats.corel_pal.corel_pal_methods import CS_MATCH, \
+    CorelPalette_Methods, create_new_palette
+from uc2.formats.generic_filters import AbstractPaletteWriter
+from uc2.formats.xml_.xml_filters import XML_Loader, XML_Saver
+
+COLOR_TAG = 'color'
+PAGE_TAG = 'page'
+METADATA_TAGS = ('colorspaces', 'localization')
+
+
+class CorelPalette_ColorLoader(XML_Loader):
+    """
+    Streaming reader of Corel palette colors.
+    Color elements of palette pages are converted as soon as they
+    are parsed and are dropped from model, so only palette metadata
+    (colorspaces and localization) are kept in memory. Colors
+    referring to not yet parsed metadata are kept until end of file.
+    """
+    name = 'CorelPalette_ColorLoader'
+    cms = None
+    methods = None
+    ready = None
+    changed = False
+
+    def element_data(self, data):
+        if self.stack and self.stack[-1].tag not in (PAGE_TAG, 'colors'):
+            XML_Loader.element_data(self, data)
+
+    def end_element(self, name):
+        obj = self.stack[-1] if self.stack else None
+        XML_Loader.end_element(self, name)
+        if obj is None or not obj.tag == name:
+            return
+        if name == COLOR_TAG and self.stack and \
+                self.stack[-1].tag == PAGE_TAG:
+            self.stack[-1].childs.pop()
+            self.ready.append(obj)
+        elif name in METADATA_TAGS:
+            self.changed = True
+
+    def is_resolved(self, obj):
+        localizations = self.methods.localizations
+        attrs = obj.attrs
+        if attrs.get('cs') in CS_MATCH:
+            return 'name' in attrs or 'resid' not in attrs or \
+                attrs['resid'] in localizations
+        if attrs.get('cs') not in self.methods.colorspaces:
+            return False
+        attrs = self.model.attrs
+        return 'name' in attrs or 'resid' not in attrs or \
+            attrs['resid'] in localizations
+
+    def do_iter_colors(self):
+        self.stack = []
+        self.ready = []
+        self.model = None
+        self.changed = True
+        self.methods = CorelPalette_Methods(self)
+        deferred = []
+        for _step in self.feed_parsing():
+            if self.model is None:
+                continue
+            self.model.config = self.config
+            if self.changed:
+                self.methods.update()
+                self.changed = False
+            for obj in self.ready:
+                if deferred or not self.is_resolved(obj):
+                    deferred.append(obj)
+                    continue
+                color = self.methods.convert_color(obj)
+                if color:
+                    yield color
+            self.ready = []
+        for obj in deferred:
+            color = self.methods.convert_color(obj)
+            if color:
+                yield color
+
+
+class CorelPalette_Writer(AbstractPaletteWriter, XML_Saver):
+    """
+    Streaming writer of Corel palette. Color elements are written
+    into spooled file as soon as they are added to palette page.
+    Colorspaces of spot colors precede colors in palette file,
+    so they are kept in model and whole palette is written on close.
+    """
+    name = 'CorelPalette_Writer'
+    spooled = True
+    methods = None
+    page = None
+    spool = None
+
+    def write_header(self):
+        self.model = create_new_palette(self.config)
+        self.model.config = self.config
+        self.methods = CorelPalette_Methods(self)
+        self.methods.model = self.model
+        self.methods.config = self.config
+        self.methods.cms = self.get_cms()
+        if self.palette_name:
+            self.methods.set_palette_name(self.palette_name)
+        self.methods.set_palette_comments(self.get_comments())
+        self.page = self.methods.get_page_obj()
+        self.indent = 3
+
+    def write_item(self, color):
+        self.methods.add_color(color)
+        for obj in self.page.childs:
+            self.write_obj(obj)
+        self.page.childs = []
+
+    def write_output(self, spool):
+        self.methods.clear_model()
+        self.spool = spool
+        self.fileptr = self.output
+        self.indent = 0
+        self.writeln('<?xml version="1.0" encoding="%s"?>' %
+                     self.config.encoding)
+        self.write_obj(self.model)
+        self.fileptr = spool
+
+    def write_obj(self, obj):
+        if obj is not self.page or not self.ncolors:
+            XML_Saver.write_obj(self, obj)
+            return
+        ind = self.indent * self.config.indent
+        self.writeln(ind + '<%s%s>' % (obj.tag, self.get_obj_attrs(obj)))
+        shutil.copyfileobj(self.spool, self.fileptr)
+        self.writeln(ind + '</%s>' % obj.tag)
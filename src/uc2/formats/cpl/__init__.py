@@ -15,7 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.cpl.cpl_config import CPL_Config
 from uc2.formats.cpl.cpl_const import CPL_IDs, CPL12
+from uc2.formats.cpl.cpl_filters import CPL_Loader, CPL_Writer
 from uc2.formats.cpl.cpl_presenter import CPL_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
 from uc2.utils.fsutils import get_fileptr
@@ -48,6 +50,18 @@ def cpl_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def cpl_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = CPL_Config()
+    config.update(merge_cnf(cnf, kw))
+    return CPL_Loader().iter_colors(config, filename, fileptr)
+
+
+def cpl_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = CPL_Config()
+    config.update(merge_cnf(cnf, kw))
+    return CPL_Writer(config, filename, fileptr, cms)
+
+
 def check_cpl(path):
     fileptr = get_fileptr(path)
     string = fileptr.read(len(CPL12))
@@ -17,11 +17,24 @@
 
 import os
 
-from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver
+from uc2 import utils
+from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver, \
+    AbstractPaletteWriter
 from uc2.formats.cpl import cpl_const
 from uc2.formats.cpl.cpl_model import CPL12_Palette, CPL8_Palette, \
     CPL7_Palette, CPL7_PaletteUTF, CPL10_Palette, CPL12_SpotPalette, \
-    CPLX4_SpotPalette
+    CPLX4_SpotPalette, CPL12_Color
+
+
+CPL_PALETTES = {
+    cpl_const.CPLX4_SPOT: CPLX4_SpotPalette,
+    cpl_const.CPL12: CPL12_Palette,
+    cpl_const.CPL12_SPOT: CPL12_SpotPalette,
+    cpl_const.CPL10: CPL10_Palette,
+    cpl_const.CPL8: CPL8_Palette,
+    cpl_const.CPL7: CPL7_Palette,
+    cpl_const.CPL7_UTF: CPL7_PaletteUTF,
+}
 
 
 class CPL_Loader(AbstractBinaryLoader):
@@ -30,30 +43,53 @@ class CPL_Loader(AbstractBinaryLoader):
     def do_load(self):
         self.model = None
         ver = self.readbytes(2)
-
-        if ver == cpl_const.CPLX4_SPOT:
-            self.model = CPLX4_SpotPalette()
-        elif ver == cpl_const.CPL12:
-            self.model = CPL12_Palette()
-        elif ver == cpl_const.CPL12_SPOT:
-            self.model = CPL12_SpotPalette()
-        elif ver == cpl_const.CPL10:
-            self.model = CPL10_Palette()
-        elif ver == cpl_const.CPL8:
-            self.model = CPL8_Palette()
-        elif ver == cpl_const.CPL7:
-            self.model = CPL7_Palette()
-        elif ver == cpl_const.CPL7_UTF:
-            self.model = CPL7_PaletteUTF()
+        if ver in CPL_PALETTES:
+            self.model = CPL_PALETTES[ver]()
         if self.model:
             self.model.parse(self)
             if not self.model.name and self.filepath:
                 name = os.path.basename(self.filepath).split('.')[0]
                 self.model.name = '%s palette' % name
 
+    def do_iter_colors(self):
+        ver = self.readbytes(2)
+        if ver not in CPL_PALETTES:
+            return
+        palette = CPL_PALETTES[ver]()
+        palette.parse_header(self)
+        for obj in palette.iter_color_objects(self):
+            color = obj.get_color()
+            if color:
+                yield color
+
 
 class CPL_Saver(AbstractSaver):
     name = 'CPL_Saver'
 
     def do_save(self):
         self.model.save(self)
+
+
+class CPL_Writer(AbstractPaletteWriter):
+    """
+    Streaming writer of CPL12 palette.
+    Number of colors closes palette header and is back-patched on close.
+    """
+    name = 'CPL_Writer'
+    binary = True
+    max_colors = 0xffff
+    count_pos = 0
+
+    def write_header(self):
+        palette = CPL12_Palette(self.palette_name)
+        palette.update_for_save()
+        self.write(palette.chunk)
+        self.count_pos = self.fileptr.tell() - 2
+
+    def write_item(self, color):
+        obj = CPL12_Color(color)
+        obj.update_for_save()
+        self.write(obj.chunk)
+
+    def write_footer(self):
+        self.patch(self.count_pos, utils.py_int2word(self.ncolors))
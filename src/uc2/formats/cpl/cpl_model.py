@@ -23,11 +23,34 @@ from uc2.formats.cdr import cdr_const, cdr_utils
 
 class AbstractCPLPalette(BinaryModelObject):
     resolve_name = 'CPL Palette'
+    ncolors = 0
 
     def __init__(self):
         self.childs = []
         self.cache_fields = []
 
+    def parse(self, loader):
+        self.parse_header(loader)
+        self.parse_colors(loader)
+
+    def parse_header(self, loader): pass
+
+    def get_color_class(self): pass
+
+    def iter_color_objects(self, loader):
+        """Parses palette colors one by one.
+        File position should be at the first color.
+        """
+        color_class = self.get_color_class()
+        for _i in range(self.ncolors):
+            color = color_class()
+            color.parse(loader)
+            yield color
+
+    def parse_colors(self, loader):
+        for color in self.iter_color_objects(loader):
+            self.childs.append(color)
+
     def resolve(self, name=''):
         is_leaf = False
         info = '%d' % (len(self.childs))
@@ -75,17 +98,13 @@ class CPL7_Palette(AbstractCPLPalette):
     def __init__(self):
         AbstractCPLPalette.__init__(self)
 
-    def parse(self, loader):
+    def get_color_class(self):
+        return CPL7_Color
+
+    def parse_header(self, loader):
         self.ncolors = loader.readword()
         loader.fileptr.seek(0)
         self.chunk = loader.readbytes(4)
-        self.parse_colors(loader)
-
-    def parse_colors(self, loader):
-        for i in range(self.ncolors):
-            color = CPL7_Color()
-            color.parse(loader)
-            self.childs.append(color)
 
     def update_for_sword(self):
         self.cache_fields.append((0, 2, 'version'))
@@ -133,11 +152,8 @@ class CPL7_PaletteUTF(CPL7_Palette):
     def __init__(self):
         CPL7_Palette.__init__(self)
 
-    def parse_colors(self, loader):
-        for i in range(self.ncolors):
-            color = CPL7_ColorUTF()
-            color.parse(loader)
-            self.childs.append(color)
+    def get_color_class(self):
+        return CPL7_ColorUTF
 
 
 class CPL7_ColorUTF(AbstractCPLColor):
@@ -183,16 +199,15 @@ class CPL8_Palette(AbstractCPLPalette):
     def __init__(self):
         AbstractCPLPalette.__init__(self)
 
-    def parse(self, loader):
+    def get_color_class(self):
+        return CPL8_Color
+
+    def parse_header(self, loader):
         size = loader.readbyte()
         self.name = loader.readstr(size)
         self.ncolors = loader.readword()
         loader.fileptr.seek(0)
         self.chunk = loader.readbytes(2 + 1 + size + 2)
-        for i in range(self.ncolors):
-            color = CPL8_Color()
-            color.parse(loader)
-            self.childs.append(color)
 
     def update_for_sword(self):
         size = len(self.name)
@@ -229,7 +244,12 @@ class CPL10_Palette(AbstractCPLPalette):
     def __init__(self):
         AbstractCPLPalette.__init__(self)
 
-    def parse(self, loader):
+    def get_color_class(self):
+        if self.palette_type < 38 and not self.palette_type in (5, 16):
+            return CPL10_SpotColor
+        return CPL10_Color
+
+    def parse_header(self, loader):
         self.nheaders = loader.readdword()
         chunk_size = 2 + 4
         chunk_size += self.nheaders * 8
@@ -258,16 +278,6 @@ class CPL10_Palette(AbstractCPLPalette):
         loader.fileptr.seek(0)
         self.chunk = loader.readbytes(chunk_size)
 
-        if self.palette_type < 38 and not self.palette_type in (5, 16):
-            color_class = CPL10_SpotColor
-        else:
-            color_class = CPL10_Color
-
-        for i in range(self.ncolors):
-            color = color_class()
-            color.parse(loader)
-            self.childs.append(color)
-
     def update_for_sword(self):
         self.cache_fields.append((0, 2, 'version'))
         self.cache_fields.append((2, 4, 'number of headers'))
@@ -354,7 +364,10 @@ class CPL12_Palette(AbstractCPLPalette):
         AbstractCPLPalette.__init__(self)
         if name: self.name = name
 
-    def parse(self, loader):
+    def get_color_class(self):
+        return CPL12_Color
+
+    def parse_header(self, loader):
         self.nheaders = loader.readdword()
         chunk_size = 2 + 4
         chunk_size += self.nheaders * 8
@@ -384,14 +397,6 @@ class CPL12_Palette(AbstractCPLPalette):
         loader.fileptr.seek(0)
         self.chunk = loader.readbytes(chunk_size)
 
-        self.parse_colors(loader)
-
-    def parse_colors(self, loader):
-        for i in range(self.ncolors):
-            color = CPL12_Color()
-            color.parse(loader)
-            self.childs.append(color)
-
     def update_for_sword(self):
         self.cache_fields.append((0, 2, 'version'))
         self.cache_fields.append((2, 4, 'number of headers'))
@@ -468,16 +473,10 @@ class CPL12_SpotPalette(CPL12_Palette):
     def __init__(self):
         CPL12_Palette.__init__(self)
 
-    def parse_colors(self, loader):
+    def get_color_class(self):
         if self.palette_type < 38 and not self.palette_type in (5, 16):
-            color_class = CPL12_SpotColor
-        else:
-            color_class = CPL12_Color
-
-        for i in range(self.ncolors):
-            color = color_class()
-            color.parse(loader)
-            self.childs.append(color)
+            return CPL12_SpotColor
+        return CPL12_Color
 
 
 class CPL12_SpotColor(CPL10_SpotColor):
@@ -532,7 +531,10 @@ class CPLX4_SpotPalette(AbstractCPLPalette):
     def __init__(self):
         AbstractCPLPalette.__init__(self)
 
-    def parse(self, loader):
+    def get_color_class(self):
+        return CPLX4_SpotColor
+
+    def parse_header(self, loader):
         self.nheaders = loader.readdword()
 
         self.headers = {}
@@ -569,14 +571,6 @@ class CPLX4_SpotPalette(AbstractCPLPalette):
         loader.fileptr.seek(0)
         self.chunk = loader.readbytes(self.headers[2] + 2)
 
-        self.parse_colors(loader)
-
-    def parse_colors(self, loader):
-        for i in range(self.ncolors):
-            color = CPLX4_SpotColor()
-            color.parse(loader)
-            self.childs.append(color)
-
     def update_for_sword(self):
         self.cache_fields.append((0, 2, 'version'))
         self.cache_fields.append((2, 4, 'number of headers'))
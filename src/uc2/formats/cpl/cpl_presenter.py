@@ -63,4 +63,6 @@ class CPL_Presenter(BinaryModelPresenter):
                 skp_model.comments += '\n'
             skp_model.comments += 'Converted from %s' % filename
         for item in self.model.childs:
-            skp_model.colors.append(item.get_color())
+            color = item.get_color()
+            if color:
+                skp_model.colors.append(color)
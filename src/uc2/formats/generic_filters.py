@@ -18,6 +18,8 @@
 import errno
 import logging
 import os
+import shutil
+import tempfile
 import xml.sax
 from xml.sax import handler
 from xml.sax.xmlreader import InputSource
@@ -27,6 +29,9 @@ from uc2.utils.fsutils import get_fileptr
 
 LOG = logging.getLogger(__name__)
 
+XML_CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 1024 * 1024
+
 
 class AbstractLoader(object):
     name = 'Abstract Loader'
@@ -76,6 +81,29 @@ class AbstractLoader(object):
     def do_load(self):
         pass
 
+    def iter_colors(self, config, path=None, fileptr=None):
+        """Generator of palette colors in SKP form. Colors are parsed
+        one by one by do_iter_colors() without building document model.
+        File is closed when generator is exhausted or closed.
+        """
+        self.config = config
+        if path:
+            self.filepath = path
+            self.fileptr = get_fileptr(path)
+        elif fileptr:
+            self.fileptr = fileptr
+        else:
+            msg = _('There is no file for reading')
+            raise IOError(errno.ENODATA, msg, '')
+        try:
+            for color in self.do_iter_colors():
+                yield color
+        finally:
+            self.fileptr.close()
+
+    def do_iter_colors(self):
+        return iter(())
+
     def readln(self, strip=True):
         line = self.fileptr.readline().decode()
         if strip:
@@ -139,17 +167,35 @@ class AbstractXMLLoader(AbstractLoader, handler.ContentHandler):
     def init_load(self):
         self.input_source = InputSource()
         self.input_source.setByteStream(self.fileptr)
+        self.init_reader()
+        self.do_load()
+
+    def init_reader(self):
         self.xml_reader = xml.sax.make_parser()
         self.xml_reader.setContentHandler(self)
         self.xml_reader.setErrorHandler(handler.ErrorHandler())
         self.xml_reader.setEntityResolver(handler.EntityResolver())
         self.xml_reader.setDTDHandler(handler.DTDHandler())
         self.xml_reader.setFeature(handler.feature_external_ges, False)
-        self.do_load()
 
     def start_parsing(self):
         self.xml_reader.parse(self.input_source)
 
+    def feed_parsing(self, size=XML_CHUNK_SIZE):
+        """Feeds XML parser by chunks of file data.
+        Generator yields after each parsed chunk, so parsed
+        elements can be taken away between chunks.
+        """
+        self.init_reader()
+        while True:
+            data = self.fileptr.read(size)
+            if not data:
+                break
+            self.xml_reader.feed(data)
+            yield
+        self.xml_reader.close()
+        yield
+
     def startElement(self, name, attrs):
         self.start_element(name, attrs)
 
@@ -239,3 +285,141 @@ class AbstractSaver(object):
 
     def send_error(self, msg):
         events.emit(events.MESSAGES, msgconst.ERROR, msg)
+
+
+class AbstractPaletteWriter(AbstractSaver):
+    """
+    Streaming writer of palette colors in SKP form. Colors are written
+    one by one by write_color() without building palette model, file
+    is completed by close(). Palette properties are written with
+    the first color, so they should be set before it.
+    Header fields depending on number of colors are back-patched on
+    close. If output file is not seekable (or writer needs to rewrite
+    written data), colors are written into spooled temporary file
+    which is copied to output on close. If with-block raises, written
+    data is discarded instead.
+    """
+    name = 'Abstract Palette Writer'
+    binary = False
+    spooled = False
+    max_colors = None
+
+    cms = None
+    output = None
+
+    palette_name = ''
+    source = ''
+    comments = ''
+    columns = 1
+
+    ncolors = 0
+    started = False
+    closed = False
+
+    def __init__(self, config, path=None, fileptr=None, cms=None):
+        AbstractSaver.__init__(self)
+        self.config = config
+        self.cms = cms
+        if path:
+            self.filepath = path
+            self.fileptr = get_fileptr(path, True)
+        elif fileptr:
+            self.fileptr = fileptr
+        else:
+            msg = _('There is no file for writting')
+            raise IOError(errno.ENODATA, msg, '')
+        if self.spooled or (self.binary and not self.fileptr.seekable()):
+            self.output = self.fileptr
+            self.fileptr = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def get_cms(self):
+        if self.cms is None:
+            from uc2.cms import ColorManager
+            self.cms = ColorManager()
+        return self.cms
+
+    def start(self):
+        if not self.started:
+            self.started = True
+            self.write_header()
+
+    def write_color(self, color):
+        if self.closed:
+            raise IOError(errno.EBADF, _('Palette writer is closed'), '')
+        if self.max_colors is not None and self.ncolors >= self.max_colors:
+            msg = _('Palette format cannot hold more than %d colors')
+            raise ValueError(msg % self.max_colors)
+        self.start()
+        self.write_item(color)
+        self.ncolors += 1
+
+    def write_colors(self, colors):
+        for color in colors:
+            self.write_color(color)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.start()
+            self.write_footer()
+            if self.output is not None:
+                self.fileptr.seek(0)
+                self.write_output(self.fileptr)
+        finally:
+            self.fileptr.close()
+            if self.output is not None:
+                self.output.close()
+        self.fileptr = None
+
+    def discard(self):
+        """Closes writer without completing palette file. File opened
+        by path is removed.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.fileptr.close()
+        if self.output is not None:
+            self.output.close()
+        self.fileptr = None
+        if self.filepath and os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+    def write_output(self, spool):
+        shutil.copyfileobj(spool, self.output)
+
+    def get_comments(self):
+        """Returns palette comments with palette source line.
+        """
+        comments = ''
+        if self.source:
+            comments += 'Palette source: ' + self.source + '\n'
+        return comments + self.comments
+
+    def patch(self, pos, data):
+        """Overwrites data at file position keeping current one.
+        """
+        current = self.fileptr.tell()
+        self.fileptr.seek(pos)
+        self.fileptr.write(data)
+        self.fileptr.seek(current)
+
+    def write_header(self):
+        pass
+
+    def write_item(self, color):
+        pass
+
+    def write_footer(self):
+        pass
@@ -15,7 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.gpl.gpl_config import GPL_Config
 from uc2.formats.gpl.gpl_const import GPL_HEADER
+from uc2.formats.gpl.gpl_filters import GPL_Loader, GPL_Writer
 from uc2.formats.gpl.gpl_presenter import GPL_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
 from uc2.utils.fsutils import get_fileptr
@@ -48,6 +50,18 @@ def gpl_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def gpl_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = GPL_Config()
+    config.update(merge_cnf(cnf, kw))
+    return GPL_Loader().iter_colors(config, filename, fileptr)
+
+
+def gpl_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = GPL_Config()
+    config.update(merge_cnf(cnf, kw))
+    return GPL_Writer(config, filename, fileptr, cms)
+
+
 def check_gpl(path):
     fileptr = get_fileptr(path)
     string = fileptr.read(len(GPL_HEADER.encode()))
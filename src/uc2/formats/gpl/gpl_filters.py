@@ -18,14 +18,25 @@
 import os
 
 from uc2 import cms
-from uc2.formats.generic_filters import AbstractLoader, AbstractSaver
+from uc2.formats.generic_filters import AbstractLoader, AbstractSaver, \
+    AbstractPaletteWriter
 from uc2.formats.gpl.gpl_const import GPL_HEADER, COL_STR, NAME_STR
+from uc2.formats.gpl.gpl_model import GPL_Palette, gpl_item2color
 
 
 class GPL_Loader(AbstractLoader):
     name = 'GPL_Loader'
 
     def do_load(self):
+        for item in self.iter_items():
+            self.model.colors.append(item)
+
+    def do_iter_colors(self):
+        self.model = GPL_Palette()
+        for item in self.iter_items():
+            yield gpl_item2color(item)
+
+    def iter_items(self):
         comments = ''
         self.readln()
         name = self.readln().split(NAME_STR)[1].strip()
@@ -36,7 +47,7 @@ class GPL_Loader(AbstractLoader):
             self.model.columns = int(line.split(COL_STR)[1].strip())
         while True:
             line = self.readln(False)
-            if not line[0] == '#':
+            if not line or not line[0] == '#':
                 break
             if len(line) > 1:
                 line = line[1:].strip()
@@ -44,11 +55,11 @@ class GPL_Loader(AbstractLoader):
                 line = ''
             comments += line + os.linesep
         self.set_comments(comments)
-        while True:
-            self.add_color(line)
+        while line:
+            item = self.parse_color(line)
+            if item:
+                yield item
             line = self.readln(False)
-            if not line:
-                break
 
     def set_comments(self, comments):
         if not len(comments):
@@ -64,21 +75,21 @@ class GPL_Loader(AbstractLoader):
             self.model.comments += item + os.linesep
         self.model.comments = self.model.comments
 
-    def add_color(self, line):
-        if line[0] == '#' or not line:
-            return
+    def parse_color(self, line):
+        if not line or line[0] == '#':
+            return None
         parts = line.replace('\t', ' ')
         parts = parts.replace('  ', ' ').replace('  ', ' ').strip().split(' ')
         name = ''
         if len(parts) > 3:
             name = ' '.join(parts[3:])
         if len(parts) < 3:
-            return
+            return None
         vals = parts[:3]
         r, g, b = [int(x) for x in vals]
         if not name and self.config.set_color_name:
             name = cms.rgb_to_hexcolor(cms.val_255_to_dec((r, g, b)))
-        self.model.colors.append([r, g, b, name])
+        return [r, g, b, name]
 
 
 class GPL_Saver(AbstractSaver):
@@ -105,3 +116,26 @@ class GPL_Saver(AbstractSaver):
             if item[3]:
                 line += '\t' + item[3]
             self.writeln(line)
+
+
+class GPL_Writer(AbstractPaletteWriter):
+    name = 'GPL_Writer'
+
+    def write_header(self):
+        self.writeln(GPL_HEADER)
+        self.writeln('%s %s' % (NAME_STR, self.palette_name))
+        if self.columns > 1:
+            self.writeln('%s %u' % (COL_STR, self.columns))
+        self.writeln('#')
+        lines = self.get_comments().rstrip().splitlines()
+        if lines:
+            for line in lines:
+                self.writeln('# %s' % line)
+            self.writeln('#')
+
+    def write_item(self, color):
+        r, g, b = self.get_cms().get_rgb_color255(color)
+        line = '%3u %3u %3u' % (r, g, b)
+        if color[3]:
+            line += '\t' + color[3]
+        self.writeln(line)
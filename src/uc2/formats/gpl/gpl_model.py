@@ -16,7 +16,15 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from uc2 import cms
 from uc2.formats.generic import TextModelObject
+from uc2.uc2const import COLOR_RGB
+
+
+def gpl_item2color(item):
+    r, g, b, name = item
+    r, g, b = cms.val_255_to_dec((r, g, b))
+    return [COLOR_RGB, [r, g, b], 1.0, name]
 
 
 class GPL_Palette(TextModelObject):
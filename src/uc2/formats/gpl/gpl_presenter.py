@@ -17,12 +17,11 @@
 
 import os
 
-from uc2 import uc2const, cms
+from uc2 import uc2const
 from uc2.formats.generic import TextModelPresenter
 from uc2.formats.gpl.gpl_config import GPL_Config
 from uc2.formats.gpl.gpl_filters import GPL_Loader, GPL_Saver
-from uc2.formats.gpl.gpl_model import GPL_Palette
-from uc2.uc2const import COLOR_RGB
+from uc2.formats.gpl.gpl_model import GPL_Palette, gpl_item2color
 
 
 class GPL_Presenter(TextModelPresenter):
@@ -78,6 +77,4 @@ class GPL_Presenter(TextModelPresenter):
             skp_model.comments += 'Converted from %s' % filename
 
         for item in self.model.colors:
-            r, g, b, name = item
-            r, g, b = cms.val_255_to_dec((r, g, b))
-            skp_model.colors.append([COLOR_RGB, [r, g, b], 1.0, name])
+            skp_model.colors.append(gpl_item2color(item))
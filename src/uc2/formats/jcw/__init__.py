@@ -15,7 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.jcw.jcw_config import JCW_Config
 from uc2.formats.jcw.jcw_const import JCW_ID
+from uc2.formats.jcw.jcw_filters import JCW_Loader, JCW_Writer
 from uc2.formats.jcw.jcw_presenter import JCW_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
 from uc2.utils.fsutils import get_fileptr
@@ -48,6 +50,18 @@ def jcw_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def jcw_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = JCW_Config()
+    config.update(merge_cnf(cnf, kw))
+    return JCW_Loader().iter_colors(config, filename, fileptr)
+
+
+def jcw_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = JCW_Config()
+    config.update(merge_cnf(cnf, kw))
+    return JCW_Writer(config, filename, fileptr, cms)
+
+
 def check_jcw(path):
     fileptr = get_fileptr(path)
     string = fileptr.read(len(JCW_ID))
@@ -17,8 +17,12 @@
 
 import os
 
-from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver
-from uc2.formats.jcw.jcw_model import JCW_Palette
+from uc2 import cms, uc2const, utils
+from uc2.formats.generic_filters import AbstractBinaryLoader, AbstractSaver, \
+    AbstractPaletteWriter
+from uc2.formats.jcw import jcw_const
+from uc2.formats.jcw.jcw_model import JCW_Palette, JCW_Color
+from uc2.formats.jcw.jcw_utils import get_jcw_name
 
 PALETTE_NAMES = {
     'P4CPC': 'PANTONE® process coated',
@@ -50,9 +54,57 @@ class JCW_Loader(AbstractBinaryLoader):
             else:
                 self.model.name = '%s palette' % filename
 
+    def do_iter_colors(self):
+        palette = JCW_Palette()
+        palette.parse_header(self)
+        for obj in palette.iter_color_objects(self):
+            color = obj.get_color()
+            if color:
+                yield color
+
 
 class JCW_Saver(AbstractSaver):
     name = 'JCW_Saver'
 
     def do_save(self):
         self.model.save(self)
+
+
+class JCW_Writer(AbstractPaletteWriter):
+    """
+    Streaming writer of JCW palette. Size of color name field is defined
+    by the longest color name, so colors are spooled with their names
+    and are written with palette header on close.
+    """
+    name = 'JCW_Writer'
+    spooled = True
+    max_colors = 0xffff
+    colorspace = jcw_const.JCW_CMYK
+    namesize = jcw_const.JCW_NAMESIZE
+
+    def write_item(self, color):
+        if not self.ncolors:
+            self.colorspace = jcw_const.JCW_CMYK \
+                if color[0] == uc2const.COLOR_CMYK else jcw_const.JCW_RGB
+        if self.colorspace == jcw_const.JCW_CMYK:
+            clr = self.get_cms().get_cmyk_color(color).to_list()
+            name = clr[3] or cms.cmyk_to_hexcolor(clr[1])
+        else:
+            clr = self.get_cms().get_rgb_color(color).to_list()
+            name = clr[3] or cms.rgb_to_hexcolor(clr[1])
+        obj = JCW_Color(self.colorspace, self.namesize, clr)
+        name = get_jcw_name(name)
+        self.namesize = max(self.namesize, len(name))
+        self.write(obj.valbytes + utils.py_int2byte(len(name)) + name)
+
+    def write_output(self, spool):
+        self.output.write(jcw_const.JCW_ID + jcw_const.JCW_VER +
+                          utils.py_int2word(self.ncolors) +
+                          utils.py_int2byte(self.colorspace) +
+                          utils.py_int2byte(self.namesize))
+        for _i in range(self.ncolors):
+            valbytes = spool.read(8)
+            size = utils.byte2py_int(spool.read(1))
+            name = spool.read(size)
+            padding = b'\x00' * (self.namesize - size)
+            self.output.write(valbytes + name + padding)
@@ -17,7 +17,8 @@
 
 from uc2 import utils
 from uc2.formats.generic import BinaryModelObject
-from uc2.formats.jcw.jcw_utils import parse_jcw_color, get_jcw_color
+from uc2.formats.jcw.jcw_utils import parse_jcw_color, get_jcw_color, \
+    get_jcw_name
 from uc2.formats.jcw import jcw_const
 
 
@@ -38,6 +39,11 @@ class JCW_Palette(BinaryModelObject):
             self.namesize = namesize
 
     def parse(self, loader):
+        self.parse_header(loader)
+        for clr in self.iter_color_objects(loader):
+            self.childs.append(clr)
+
+    def parse_header(self, loader):
         self.palette_id = loader.readbytes(3)
         self.version = loader.readbytes(1)
         self.ncolors = loader.readword()
@@ -45,10 +51,15 @@ class JCW_Palette(BinaryModelObject):
         self.namesize = loader.readbyte()
         loader.fileptr.seek(0)
         self.chunk = loader.readbytes(8)
-        for i in range(self.ncolors):
+
+    def iter_color_objects(self, loader):
+        """Parses palette colors one by one.
+        File position should be at the first color.
+        """
+        for _i in range(self.ncolors):
             clr = JCW_Color(self.colorspace, self.namesize)
             clr.parse(loader)
-            self.childs.append(clr)
+            yield clr
 
     def update_for_sword(self):
         self.cache_fields.append((0, 3, 'palette id'))
@@ -105,9 +116,8 @@ class JCW_Color(BinaryModelObject):
     def update_for_save(self):
         self.chunk = b''
         self.chunk += self.valbytes
-        self.chunk += self.name.encode('iso-8859-1', errors='ignore')
-        if len(self.name) < self.namesize:
-            self.chunk += b'\x00' * (self.namesize - len(self.name))
+        name = get_jcw_name(self.name)[:self.namesize]
+        self.chunk += name + b'\x00' * (self.namesize - len(name))
 
     def save(self, saver):
         saver.write(self.chunk)
@@ -23,6 +23,7 @@ from uc2.formats.jcw.jcw_config import JCW_Config
 from uc2.formats.jcw.jcw_const import JCW_CMYK, JCW_RGB, JCW_NAMESIZE
 from uc2.formats.jcw.jcw_filters import JCW_Loader, JCW_Saver
 from uc2.formats.jcw.jcw_model import JCW_Palette, JCW_Color
+from uc2.formats.jcw.jcw_utils import get_jcw_name
 
 
 class JCW_Presenter(BinaryModelPresenter):
@@ -52,7 +53,7 @@ class JCW_Presenter(BinaryModelPresenter):
 
         namesize = JCW_NAMESIZE
         for item in skp_model.colors:
-            namesize = max(namesize, len(item[3]))
+            namesize = max(namesize, len(get_jcw_name(item[3])))
 
         if skp_model.colors[0][0] == uc2const.COLOR_CMYK:
             colorspace = JCW_CMYK
@@ -62,18 +63,12 @@ class JCW_Presenter(BinaryModelPresenter):
         self.model = JCW_Palette(colorspace, namesize)
         for color in skp_model.colors:
             if colorspace == JCW_CMYK:
-                clr = self.cms.get_cmyk_color(color)
+                clr = self.cms.get_cmyk_color(color).to_list()
+                clr[3] = clr[3] or cms.cmyk_to_hexcolor(clr[1])
             else:
-                clr = self.cms.get_rgb_color(color)
-            if clr[3]:
-                clr[3] = clr[3].encode('iso-8859-1', errors='ignore')
-            if not clr[3]:
-                if colorspace == JCW_CMYK:
-                    clr[3] += cms.cmyk_to_hexcolor(color[1])
-                else:
-                    clr[3] += cms.rgb_to_hexcolor(color[1])
-
-            self.model.childs.append(JCW_Color(colorspace, namesize, color))
+                clr = self.cms.get_rgb_color(color).to_list()
+                clr[3] = clr[3] or cms.rgb_to_hexcolor(clr[1])
+            self.model.childs.append(JCW_Color(colorspace, namesize, clr))
         self.model.update_for_save()
 
     def convert_to_skp(self, skp_doc):
@@ -76,3 +76,10 @@ def get_jcw_color(color):
         return struct.pack('<4H', *dec_to_val(vals))
     else:
         return struct.pack('<3H', *dec_to_val(color[1])) + b'\x00\x00'
+
+
+def get_jcw_name(name):
+    """Returns color name bytes as stored in JCW file. Size of name field
+    is one byte value, so name is limited by 255 bytes.
+    """
+    return name.encode('iso-8859-1', errors='ignore')[:255]
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Registry of file formats. Built-in formats are described by uc2const
+tables, third-party formats are plugged in by 'uc2.formats' entry
+points. Entry point should refer to FormatSpec object, list of specs
+or callable returning them:
+
+    [options.entry_points]
+    uc2.formats =
+        myformat = mypackage.myformat:FORMAT_SPEC
+
+Format modules are imported on first access of loader, saver,
+checker, colors iterator or palette writer. prewarm() imports them in advance
+(for example before forking of worker processes).
+"""
+
+import logging
+import threading
+from collections import namedtuple
+from importlib import import_module, metadata
+
+from uc2 import uc2const
+
+LOG = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'uc2.formats'
+
+LOADER = 'loader'
+SAVER = 'saver'
+CHECKER = 'checker'
+COLORS = 'colors'
+WRITER = 'writer'
+ROLES = (LOADER, SAVER, CHECKER, COLORS, WRITER)
+
+
+class FormatSpec(namedtuple('FormatSpec', 'fid name extensions module '
+                                          'loader saver checker colors '
+                                          'writer palette experimental '
+                                          'signatures')):
+    """Declarative description of file format.
+    Loader, saver, checker, colors iterator and palette writer are
+    attribute names in format module, True means default name
+    (<fid>_loader, <fid>_saver, check_<fid>, <fid>_iter_colors,
+    <fid>_writer) and None means format doesn't support the operation.
+    Signatures are sniffer.Signature tuples of file header.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, fid, name=None, extensions=(), module=None,
+                loader=True, saver=True, checker=True, colors=None,
+                writer=None, palette=True, experimental=False,
+                signatures=()):
+        loader = fid + '_loader' if loader is True else loader or None
+        saver = fid + '_saver' if saver is True else saver or None
+        checker = 'check_' + fid if checker is True else checker or None
+        colors = fid + '_iter_colors' if colors is True else colors or None
+        writer = fid + '_writer' if writer is True else writer or None
+        return super(FormatSpec, cls).__new__(
+            cls, fid, name or fid.upper(),
+            tuple(ext.lower() for ext in extensions),
+            module or 'uc2.formats.' + fid, loader, saver, checker,
+            colors, writer, palette, experimental, tuple(signatures))
+
+
+def get_builtin_specs():
+    """Returns list of FormatSpec of built-in formats.
+    """
+    loaders = uc2const.LOADER_FORMATS + uc2const.EXPERIMENTAL_LOADERS
+    savers = uc2const.SAVER_FORMATS + uc2const.EXPERIMENTAL_SAVERS
+    palettes = uc2const.PALETTE_LOADERS + uc2const.PALETTE_SAVERS
+    regular = uc2const.LOADER_FORMATS + uc2const.SAVER_FORMATS
+    specs = []
+    for fid in loaders + [item for item in savers if item not in loaders]:
+        specs.append(FormatSpec(
+            fid, uc2const.FORMAT_NAMES.get(fid),
+            uc2const.FORMAT_EXTENSION.get(fid, ()),
+            loader=fid in loaders, saver=fid in savers,
+            checker=fid in loaders,
+            colors=fid in uc2const.PALETTE_LOADERS,
+            writer=fid in uc2const.PALETTE_SAVERS, palette=fid in palettes,
+            experimental=fid not in regular))
+    return specs
+
+
+class FormatRegistry(object):
+    """Registry of format specs with extension index and
+    lazily resolved loaders, savers and checkers.
+    Formats keep registration order which is lookup priority.
+    """
+
+    specs = None
+    # extension: list of format ids
+    extensions = None
+    # (format id, role): resolved object
+    resolved = None
+    lock = None
+
+    def __init__(self, specs=()):
+        self.lock = threading.RLock()
+        self.specs = {}
+        self.extensions = {}
+        self.resolved = {}
+        for spec in specs:
+            self.register(spec)
+
+    def __contains__(self, fid):
+        return fid in self.specs
+
+    def __iter__(self):
+        return iter(list(self.specs.values()))
+
+    def register(self, spec):
+        with self.lock:
+            self.unregister(spec.fid)
+            self.specs[spec.fid] = spec
+            for ext in spec.extensions:
+                self.extensions.setdefault(ext, []).append(spec.fid)
+
+    def unregister(self, fid):
+        with self.lock:
+            spec = self.specs.pop(fid, None)
+            if spec is None:
+                return
+            for ext in spec.extensions:
+                self.extensions[ext].remove(fid)
+                if not self.extensions[ext]:
+                    del self.extensions[ext]
+            for role in ROLES:
+                self.resolved.pop((fid, role), None)
+
+    def load_entry_points(self, group=ENTRY_POINT_GROUP):
+        """Registers formats of installed plugins.
+        Broken plugins are logged and skipped.
+        """
+        try:
+            entry_points = metadata.entry_points(group=group)
+        except TypeError:
+            entry_points = metadata.entry_points().get(group, ())
+        for entry_point in entry_points:
+            try:
+                specs = entry_point.load()
+                if callable(specs):
+                    specs = specs()
+                if isinstance(specs, FormatSpec):
+                    specs = [specs]
+                for spec in specs:
+                    self.register(spec)
+            except Exception as e:
+                LOG.error('Error loading format plugin <%s> %s',
+                          entry_point.name, e)
+
+    def get_spec(self, fid):
+        return self.specs.get(fid)
+
+    def get_name(self, fid):
+        spec = self.specs.get(fid)
+        return fid if spec is None else spec.name
+
+    def get_extensions(self, fid):
+        spec = self.specs.get(fid)
+        return () if spec is None else spec.extensions
+
+    def get_by_extension(self, ext):
+        """Returns list of format ids registered for file extension.
+        """
+        return list(self.extensions.get((ext or '').lower(), ()))
+
+    def get_formats(self, role, experimental=False):
+        """Returns list of format ids supporting role
+        (LOADER, SAVER, CHECKER, COLORS or WRITER).
+        """
+        return [spec.fid for spec in self.specs.values()
+                if getattr(spec, role) and
+                (experimental or not spec.experimental)]
+
+    def is_palette(self, fid):
+        spec = self.specs.get(fid)
+        return bool(spec and spec.palette)
+
+    def resolve(self, fid, role):
+        """Returns loader, saver or checker of format importing
+        format module if required. Failures are not cached,
+        so format becomes available as soon as it is fixed.
+        """
+        key = (fid, role)
+        if key in self.resolved:
+            return self.resolved[key]
+        spec = self.specs.get(fid) if isinstance(fid, str) else None
+        if spec is None or not getattr(spec, role):
+            return None
+        try:
+            obj = getattr(import_module(spec.module), getattr(spec, role))
+        except Exception as e:
+            LOG.error('Error accessing <%s> %s %s', fid, role, e)
+            return None
+        with self.lock:
+            self.resolved[key] = obj
+        return obj
+
+    def get_loader(self, fid):
+        return self.resolve(fid, LOADER)
+
+    def get_saver(self, fid):
+        return self.resolve(fid, SAVER)
+
+    def get_checker(self, fid):
+        return self.resolve(fid, CHECKER)
+
+    def get_colors_iterator(self, fid):
+        return self.resolve(fid, COLORS)
+
+    def get_palette_writer(self, fid):
+        return self.resolve(fid, WRITER)
+
+    def prewarm(self, fids=None, experimental=False):
+        """Resolves loaders, savers, checkers, colors iterators
+        and palette writers of formats (all regular formats if not provided).
+        Returns list of format ids which cannot be resolved.
+        """
+        if fids is None:
+            fids = [spec.fid for spec in self.specs.values()
+                    if experimental or not spec.experimental]
+        failed = []
+        for fid in fids:
+            spec = self.specs.get(fid)
+            if spec is None:
+                failed.append(fid)
+                continue
+            for role in ROLES:
+                if getattr(spec, role) and self.resolve(fid, role) is None:
+                    failed.append(fid)
+                    break
+        return failed
+
+
+REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry():
+    """Returns format registry built on first call
+    from built-in formats and entry points.
+    """
+    global REGISTRY
+    if REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if REGISTRY is None:
+                registry = FormatRegistry(get_builtin_specs())
+                registry.load_entry_points()
+                REGISTRY = registry
+    return REGISTRY
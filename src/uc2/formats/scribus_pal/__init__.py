@@ -15,6 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.scribus_pal.scribus_pal_config import ScribusPalette_Config
+from uc2.formats.scribus_pal.scribus_pal_filters import \
+    ScribusPalette_Loader, ScribusPalette_Writer
 from uc2.formats.scribus_pal.scribus_pal_model import SP_TAG
 from uc2.formats.scribus_pal.scribus_pal_presenter import \
     ScribusPalettePresenter
@@ -49,6 +52,18 @@ def scribus_pal_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def scribus_pal_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = ScribusPalette_Config()
+    config.update(merge_cnf(cnf, kw))
+    return ScribusPalette_Loader().iter_colors(config, filename, fileptr)
+
+
+def scribus_pal_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = ScribusPalette_Config()
+    config.update(merge_cnf(cnf, kw))
+    return ScribusPalette_Writer(config, filename, fileptr, cms)
+
+
 def check_scribus_pal(path):
     fileptr = get_fileptr(path, binary=False)
     ret = False
@@ -15,11 +15,25 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from uc2.formats.generic_filters import AbstractXMLLoader, AbstractSaver
+from uc2.formats.generic_filters import AbstractXMLLoader, AbstractSaver, \
+    AbstractPaletteWriter
 from uc2.formats.scribus_pal.scribus_pal_model import ScribusPalette, SPColor, \
     SPObject
 
 
+def get_color_line(color):
+    line = '\t<%s' % color.tag
+    if color.RGB:
+        line += ' RGB="%s"' % color.RGB
+    if color.CMYK:
+        line += ' CMYK="%s"' % color.CMYK
+    if color.Spot == '1':
+        line += ' Spot="%s"' % color.Spot
+    if color.Register == '1':
+        line += ' Register="%s"' % color.Register
+    return line + ' NAME="%s" />' % color.NAME
+
+
 class ScribusPalette_Loader(AbstractXMLLoader):
     name = 'ScribusPalette_Loader'
     stack = []
@@ -48,6 +62,19 @@ class ScribusPalette_Loader(AbstractXMLLoader):
         if self.stack and self.stack[-1].tag == name:
             self.stack = self.stack[:-1]
 
+    def do_iter_colors(self):
+        self.stack = []
+        self.model = ScribusPalette()
+        childs = self.model.childs
+        for _step in self.feed_parsing():
+            # the last palette child can be still incomplete
+            ready = len(childs) - 1 if len(self.stack) > 1 else len(childs)
+            for item in childs[:ready]:
+                color = item.get_color()
+                if color:
+                    yield color
+            del childs[:ready]
+
 
 class ScribusPalette_Saver(AbstractSaver):
     name = 'ScribusPalette_Saver'
@@ -56,7 +83,7 @@ class ScribusPalette_Saver(AbstractSaver):
         self.writeln('<?xml version="1.0" encoding="UTF-8"?>')
         if self.model.comments:
             self.writeln('<!--')
-            self.fileptr.write(self.model.comments)
+            self.writeln(self.model.comments)
             self.writeln('-->')
         self.writeln('<%s Name="%s" >' % (self.model.tag, self.model.Name))
         for item in self.model.childs:
@@ -64,14 +91,26 @@ class ScribusPalette_Saver(AbstractSaver):
         self.writeln('</%s>' % self.model.tag)
 
     def write_color(self, color):
-        line = '\t<%s' % color.tag
-        if color.RGB:
-            line += ' RGB="%s"' % color.RGB
-        if color.CMYK:
-            line += ' CMYK="%s"' % color.CMYK
-        if color.Spot == '1':
-            line += ' Spot="%s"' % color.Spot
-        if color.Register == '1':
-            line += ' Register="%s"' % color.Register
-        line += ' NAME="%s" />' % color.NAME
-        self.writeln(line)
+        self.writeln(get_color_line(color))
+
+
+class ScribusPalette_Writer(AbstractPaletteWriter):
+    name = 'ScribusPalette_Writer'
+
+    def write_header(self):
+        self.writeln('<?xml version="1.0" encoding="UTF-8"?>')
+        comments = self.get_comments()
+        if comments:
+            self.writeln('<!--')
+            self.writeln(comments)
+            self.writeln('-->')
+        self.writeln('<%s Name="%s" >' % (ScribusPalette.tag,
+                                          self.palette_name))
+
+    def write_item(self, color):
+        obj = SPColor()
+        obj.set_color(color, self.get_cms())
+        self.writeln(get_color_line(obj))
+
+    def write_footer(self):
+        self.writeln('</%s>' % ScribusPalette.tag)
@@ -16,7 +16,9 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from uc2 import cms
 from uc2.formats.generic import TaggedModelObject
+from uc2.uc2const import COLOR_RGB, COLOR_CMYK, COLOR_SPOT, COLOR_REG
 
 SP_TAG = 'SCRIBUSCOLORS'
 SPCOLOR_TAG = 'COLOR'
@@ -35,6 +37,9 @@ class SPObject(TaggedModelObject):
         return not is_node, self.tag, \
             '%d' % (len(self.childs)) if is_node else ''
 
+    def get_color(self):
+        return None
+
 
 class ScribusPalette(SPObject):
     """
@@ -58,3 +63,42 @@ class SPColor(SPObject):
     RGB = ''
     Spot = '0'
     Register = '0'
+
+    def get_color(self):
+        if self.Register == '1':
+            return cms.get_registration_black()
+        elif self.Spot == '1':
+            rgb = []
+            cmyk = []
+            if self.RGB:
+                rgb = cms.hexcolor_to_rgb(self.RGB)
+            if self.CMYK:
+                cmyk = cms.hexcolor_to_cmyk(self.CMYK)
+            return [COLOR_SPOT, [rgb, cmyk], 1.0, self.NAME]
+        elif self.CMYK:
+            return [COLOR_CMYK, cms.hexcolor_to_cmyk(self.CMYK), 1.0,
+                    self.NAME]
+        elif self.RGB:
+            return [COLOR_RGB, cms.hexcolor_to_rgb(self.RGB), 1.0, self.NAME]
+        return None
+
+    def set_color(self, color, color_manager):
+        if color[0] == COLOR_SPOT:
+            self.Spot = '1'
+            if color[1][1]:
+                self.CMYK = cms.cmyk_to_hexcolor(color[1][1])
+            else:
+                self.RGB = cms.rgb_to_hexcolor(color[1][0])
+            self.NAME = color[3]
+            if color[3] == COLOR_REG:
+                self.Register = '1'
+        elif color[0] == COLOR_CMYK:
+            self.CMYK = cms.cmyk_to_hexcolor(color[1])
+            self.NAME = color[3]
+        elif color[0] == COLOR_RGB:
+            self.RGB = cms.rgb_to_hexcolor(color[1])
+            self.NAME = color[3]
+        else:
+            clr = color_manager.get_rgb_color(color)
+            self.RGB = cms.rgb_to_hexcolor(clr[1])
+            self.NAME = clr[3]
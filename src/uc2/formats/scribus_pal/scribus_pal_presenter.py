@@ -17,13 +17,12 @@
 
 import os
 
-from uc2 import uc2const, cms
+from uc2 import uc2const
 from uc2.formats.generic import TaggedModelPresenter
 from uc2.formats.scribus_pal.scribus_pal_config import ScribusPalette_Config
 from uc2.formats.scribus_pal.scribus_pal_filters import ScribusPalette_Loader, \
     ScribusPalette_Saver
 from uc2.formats.scribus_pal.scribus_pal_model import ScribusPalette, SPColor
-from uc2.uc2const import COLOR_RGB, COLOR_CMYK, COLOR_SPOT, COLOR_REG
 
 
 class ScribusPalettePresenter(TaggedModelPresenter):
@@ -68,25 +67,7 @@ class ScribusPalettePresenter(TaggedModelPresenter):
         sp.comments = sp.comments
         for item in skp.colors:
             obj = SPColor()
-            if item[0] == COLOR_SPOT:
-                obj.Spot = '1'
-                if item[1][1]:
-                    obj.CMYK = cms.cmyk_to_hexcolor(item[1][1])
-                else:
-                    obj.RGB = cms.rgb_to_hexcolor(item[1][0])
-                obj.NAME = item[3]
-                if item[3] == COLOR_REG:
-                    obj.Register = '1'
-            elif item[0] == COLOR_CMYK:
-                obj.CMYK = cms.cmyk_to_hexcolor(item[1])
-                obj.NAME = item[3]
-            elif item[0] == COLOR_RGB:
-                obj.RGB = cms.rgb_to_hexcolor(item[1])
-                obj.NAME = item[3]
-            else:
-                clr = self.cms.get_rgb_color(item)
-                obj.RGB = cms.rgb_to_hexcolor(clr[1])
-                obj.NAME = clr[3]
+            obj.set_color(item, self.cms)
             sp.childs.append(obj)
 
     def convert_to_skp(self, skp_doc):
@@ -103,25 +84,6 @@ class ScribusPalettePresenter(TaggedModelPresenter):
             skp.comments = 'Converted from %s' % filename
         skp.source = self.config.source
         for item in self.model.childs:
-            if item.Register == '1':
-                color = cms.get_registration_black()
-            elif item.Spot == '1':
-                rgb = []
-                cmyk = []
-                if item.RGB:
-                    rgb = cms.hexcolor_to_rgb(item.RGB)
-                if item.CMYK:
-                    cmyk = cms.hexcolor_to_cmyk(item.CMYK)
-                name = item.NAME
-                color = [COLOR_SPOT, [rgb, cmyk], 1.0, name]
-            elif item.CMYK:
-                cmyk = cms.hexcolor_to_cmyk(item.CMYK)
-                name = item.NAME
-                color = [COLOR_CMYK, cmyk, 1.0, name]
-            elif item.RGB:
-                rgb = cms.hexcolor_to_rgb(item.RGB)
-                name = item.NAME
-                color = [COLOR_RGB, rgb, 1.0, name]
-            else:
-                continue
-            skp.colors.append(color)
+            color = item.get_color()
+            if color:
+                skp.colors.append(color)
@@ -15,7 +15,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from uc2.formats.skp.skp_config import SKP_Config
 from uc2.formats.skp.skp_const import SKP_ID
+from uc2.formats.skp.skp_filters import SKP_Loader, SKP_Writer
 from uc2.formats.skp.skp_presenter import SKP_Presenter
 from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
@@ -34,8 +36,20 @@ def skp_saver(doc, filename=None, fileptr=None, translate=True,
     doc.save(filename, fileptr)
 
 
+def skp_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = SKP_Config()
+    config.update(merge_cnf(cnf, kw))
+    return SKP_Loader().iter_colors(config, filename, fileptr)
+
+
+def skp_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = SKP_Config()
+    config.update(merge_cnf(cnf, kw))
+    return SKP_Writer(config, filename, fileptr, cms)
+
+
 def check_skp(path):
-    fileptr = get_fileptr(path, binary=False)
-    string = fileptr.read(len(SKP_ID))
+    fileptr = get_fileptr(path)
+    string = fileptr.read(len(SKP_ID.encode()))
     fileptr.close()
-    return string == SKP_ID
+    return string == SKP_ID.encode()
@@ -19,8 +19,10 @@ import logging
 import os
 
 from uc2 import cms, uc2const
-from uc2.formats.generic_filters import AbstractLoader, AbstractSaver
+from uc2.formats.generic_filters import AbstractLoader, AbstractSaver, \
+    AbstractPaletteWriter
 from uc2.formats.skp.skp_const import SKP_ID
+from uc2.formats.skp.skp_model import SK1Palette
 
 LOG = logging.getLogger(__name__)
 
@@ -31,6 +33,22 @@ class SKP_Loader(AbstractLoader):
     line = None
 
     def do_load(self):
+        for _line in self.parse_lines():
+            pass
+
+    def do_iter_colors(self):
+        self.model = SK1Palette()
+        colors = self.model.colors
+        for _line in self.parse_lines():
+            for color in colors:
+                yield color
+            del colors[:]
+
+    def parse_lines(self):
+        """Executes palette file lines one by one.
+        Generator yields after each line.
+        """
+        self.stop_flag = False
         self.readln()
         while True:
             self.line = self.readln()
@@ -46,6 +64,7 @@ class SKP_Loader(AbstractLoader):
                 except Exception as e:
                     LOG.error('Parsing error in "%s"', self.line)
                     LOG.exception('Error traceback: %s', e)
+                yield self.line
                 if self.stop_flag:
                     break
 
@@ -95,3 +114,22 @@ class SKP_Saver(AbstractSaver):
         for item in self.model.colors:
             self.writeln('color(%s)' % self.field_to_str(item))
         self.writeln('palette_end()')
+
+
+class SKP_Writer(AbstractPaletteWriter):
+    name = 'SKP_Writer'
+
+    def write_header(self):
+        self.writeln(SKP_ID)
+        self.writeln('palette()')
+        self.writeln('set_name(%s)' % self.field_to_str(self.palette_name))
+        self.writeln('set_source(%s)' % self.field_to_str(self.source))
+        for item in self.comments.splitlines():
+            self.writeln('add_comments(%s)' % self.field_to_str(item))
+        self.writeln('set_columns(%s)' % self.field_to_str(self.columns))
+
+    def write_item(self, color):
+        self.writeln('color(%s)' % self.field_to_str(color))
+
+    def write_footer(self):
+        self.writeln('palette_end()')
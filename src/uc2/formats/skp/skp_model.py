@@ -24,6 +24,8 @@ class SK1Palette(TextModelObject):
     Represents sK1 palette object.
     This is a single and root DOM instance of SKP file format.
     All palette colors are members of colors field list.
+    Colors can be packed into compact ColorArray container
+    for large palettes (requires NumPy).
     """
 
     name = ''
@@ -44,3 +46,17 @@ class SK1Palette(TextModelObject):
         info = '%d' % (len(self.colors))
         name = 'SK1Palette'
         return is_leaf, name, info
+
+    def is_packed(self):
+        return not isinstance(self.colors, list)
+
+    def pack(self):
+        """Replaces colors list by ColorArray container."""
+        if not self.is_packed():
+            from uc2.cms.color_array import ColorArray
+            self.colors = ColorArray(self.colors)
+
+    def unpack(self):
+        """Replaces ColorArray container by colors list."""
+        if self.is_packed():
+            self.colors = self.colors.to_list()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2026 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+File format detection by signatures. File header is read once
+and matched against table of format signatures. Each match has
+confidence score; short signatures are weak ones and are confirmed
+by file extension. Format checkers are used by get_loader() only
+if detection is not confident.
+"""
+
+from collections import namedtuple
+
+from uc2 import uc2const
+from uc2.formats.registry import LOADER, get_registry
+from uc2.utils.fs import get_file_extension
+from uc2.utils.fsutils import get_fileptr
+
+SNIFF_SIZE = 4096
+
+CERTAIN = 1.0
+CONFIDENT = 0.8
+EXTENSION_BONUS = 0.3
+
+# Signature is matched at offset or anywhere in header if offset is None
+Signature = namedtuple('Signature', 'magic offset confidence')
+
+SIGNATURES = {}
+
+
+def get_signatures():
+    """Returns {format id: list of signatures} table of built-in
+    formats. Table is built on first call from format constants.
+    Signatures of plugin formats are provided by their FormatSpec.
+    """
+    if not SIGNATURES:
+        from uc2.formats.aco.aco_const import ACO1_VER, ACO2_VER
+        from uc2.formats.ase.ase_const import ASEF
+        from uc2.formats.cpl.cpl_const import CPL_IDs
+        from uc2.formats.gpl.gpl_const import GPL_HEADER
+        from uc2.formats.jcw.jcw_const import JCW_ID
+        from uc2.formats.scribus_pal.scribus_pal_model import SP_TAG
+        from uc2.formats.skp.skp_const import SKP_ID
+        from uc2.formats.soc.soc_const import SOC_PAL_TAG, SOC_PAL_OO_TAG
+
+        SIGNATURES.update({
+            uc2const.SKP: [Signature(SKP_ID.encode(), 0, CERTAIN)],
+            uc2const.GPL: [Signature(GPL_HEADER.encode(), 0, CERTAIN)],
+            uc2const.SCRIBUS_PAL: [Signature(SP_TAG.encode(), None, 0.9)],
+            uc2const.SOC: [Signature(SOC_PAL_TAG.encode(), None, 0.9),
+                           Signature(SOC_PAL_OO_TAG.encode(), None, 0.9)],
+            uc2const.CPL: [Signature(item, 0, 0.6) for item in CPL_IDs],
+            uc2const.COREL_PAL: [Signature(b'<palette', None, CONFIDENT)],
+            uc2const.ASE: [Signature(ASEF, 0, CERTAIN)],
+            uc2const.ACO: [Signature(ACO1_VER, 0, 0.5),
+                           Signature(ACO2_VER, 0, 0.5)],
+            uc2const.JCW: [Signature(JCW_ID, 0, CERTAIN)],
+            uc2const.XML: [Signature(b'<?xml ', None, 0.3)],
+        })
+    return SIGNATURES
+
+
+def match(data, signature):
+    if signature.offset is None:
+        return signature.magic in data
+    end = signature.offset + len(signature.magic)
+    return data[signature.offset:end] == signature.magic
+
+
+def sniff(data, ext='', formats=None):
+    """Matches file header against format signatures.
+    Returns list of (format id, confidence) tuples sorted
+    by confidence.
+
+    :param data: file header bytes
+    :param ext: file extension
+    :param formats: list of format ids, all loaders if None
+    """
+    signatures = get_signatures()
+    registry = get_registry()
+    formats = registry.get_formats(LOADER) if formats is None else formats
+    result = []
+    for fid in formats:
+        spec = registry.get_spec(fid)
+        items = signatures.get(fid, []) + list(spec.signatures if spec else ())
+        confidence = max([item.confidence for item in items
+                          if match(data, item)], default=0.0)
+        if not confidence:
+            continue
+        if ext and ext in registry.get_extensions(fid):
+            confidence = min(CERTAIN, confidence + EXTENSION_BONUS)
+        result.append((fid, confidence))
+    result.sort(key=lambda x: -x[1])
+    return result
+
+
+def sniff_file(path, formats=None, size=SNIFF_SIZE):
+    """Reads file header once and matches it against format signatures.
+    Returns list of (format id, confidence) tuples sorted
+    by confidence.
+    """
+    fileptr = get_fileptr(path)
+    try:
+        data = fileptr.read(size)
+    finally:
+        fileptr.close()
+    return sniff(data, get_file_extension(path), formats)
+
+
+def get_confident(candidates):
+    """Returns (format id, confidence) tuple of the best candidate
+    if it is confident and unambiguous, otherwise returns None.
+    """
+    if not candidates or candidates[0][1] < CONFIDENT:
+        return None
+    if len(candidates) > 1 and candidates[1][1] == candidates[0][1]:
+        return None
+    return candidates[0]
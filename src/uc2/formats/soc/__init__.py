@@ -16,7 +16,9 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from uc2.formats.skp.skp_presenter import SKP_Presenter
+from uc2.formats.soc.soc_config import SOC_Config
 from uc2.formats.soc.soc_const import SOC_PAL_TAG, SOC_PAL_OO_TAG
+from uc2.formats.soc.soc_filters import SOC_Loader, SOC_Writer
 from uc2.formats.soc.soc_presenter import SOC_Presenter
 from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
@@ -48,6 +50,18 @@ def soc_saver(doc, filename=None, fileptr=None, translate=True,
         doc.save(filename, fileptr)
 
 
+def soc_iter_colors(filename=None, fileptr=None, cnf=None, **kw):
+    config = SOC_Config()
+    config.update(merge_cnf(cnf, kw))
+    return SOC_Loader().iter_colors(config, filename, fileptr)
+
+
+def soc_writer(filename=None, fileptr=None, cnf=None, cms=None, **kw):
+    config = SOC_Config()
+    config.update(merge_cnf(cnf, kw))
+    return SOC_Writer(config, filename, fileptr, cms)
+
+
 def check_soc(path):
     fileptr = get_fileptr(path, binary=False)
     ret = False
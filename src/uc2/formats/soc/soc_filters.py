@@ -15,10 +15,13 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from uc2.formats.generic_filters import AbstractXMLLoader, AbstractSaver
+from uc2 import cms
+from uc2.formats.generic_filters import AbstractXMLLoader, AbstractSaver, \
+    AbstractPaletteWriter
 from uc2.formats.soc.soc_const import SOC_COLOR_TAG, SOC_COLOR_NAME_ATTR, \
     SOC_COLOR_VAL_ATTR, SOC_PAL_TAG, SOC_PAL_ATTRS, SOC_PAL_OO_TAG, SOURCE_LO, \
     SOC_PAL_OO_ATTRS, SOURCE_OO
+from uc2.formats.soc.soc_model import SOC_Palette, soc_item2color
 
 
 class SOC_Loader(AbstractXMLLoader):
@@ -27,6 +30,14 @@ class SOC_Loader(AbstractXMLLoader):
     def do_load(self):
         self.start_parsing()
 
+    def do_iter_colors(self):
+        self.model = SOC_Palette()
+        colors = self.model.colors
+        for _step in self.feed_parsing():
+            for item in colors:
+                yield soc_item2color(item)
+            del colors[:]
+
     def start_element(self, name, attrs):
         if name == SOC_PAL_OO_TAG:
             self.model.source = SOURCE_OO
@@ -65,3 +76,39 @@ class SOC_Saver(AbstractSaver):
                                                      item[0]))
 
         self.writeln('</%s>' % pal_tag)
+
+
+class SOC_Writer(AbstractPaletteWriter):
+    name = 'SOC_Writer'
+    pal_tag = SOC_PAL_TAG
+
+    def write_header(self):
+        self.writeln('<?xml version="1.0" encoding="UTF-8"?>')
+        comments = self.get_comments()
+        if comments:
+            self.writeln('<!--')
+            self.writeln(comments)
+            self.writeln('-->')
+
+        if self.config.source == SOURCE_LO:
+            self.pal_tag = SOC_PAL_TAG
+            pal_attr = SOC_PAL_ATTRS
+        else:
+            self.pal_tag = SOC_PAL_OO_TAG
+            pal_attr = SOC_PAL_OO_ATTRS
+
+        line = '<%s' % self.pal_tag
+        for item in pal_attr.keys():
+            line += ' %s="%s"' % (item, pal_attr[item])
+        self.writeln(line + '>')
+
+    def write_item(self, color):
+        rgb = cms.rgb_to_hexcolor(self.get_cms().get_rgb_color(color)[1])
+        self.writeln(' <%s %s="%s" %s="%s"/>' % (SOC_COLOR_TAG,
+                                                 SOC_COLOR_NAME_ATTR,
+                                                 color[3],
+                                                 SOC_COLOR_VAL_ATTR,
+                                                 rgb))
+
+    def write_footer(self):
+        self.writeln('</%s>' % self.pal_tag)
@@ -16,8 +16,15 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from uc2 import cms
 from uc2.formats.generic import TextModelObject
 from uc2.formats.soc.soc_const import SOURCE_LO
+from uc2.uc2const import COLOR_RGB
+
+
+def soc_item2color(item):
+    rgb, name = item
+    return [COLOR_RGB, cms.hexcolor_to_rgb(rgb), 1.0, name]
 
 
 class SOC_Palette(TextModelObject):
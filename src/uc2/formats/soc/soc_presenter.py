@@ -21,8 +21,7 @@ from uc2 import uc2const, cms
 from uc2.formats.generic import TextModelPresenter
 from uc2.formats.soc.soc_config import SOC_Config
 from uc2.formats.soc.soc_filters import SOC_Loader, SOC_Saver
-from uc2.formats.soc.soc_model import SOC_Palette
-from uc2.uc2const import COLOR_RGB
+from uc2.formats.soc.soc_model import SOC_Palette, soc_item2color
 
 
 class SOC_Presenter(TextModelPresenter):
@@ -85,6 +84,4 @@ class SOC_Presenter(TextModelPresenter):
             skp_model.comments += 'Converted from %s' % filename
 
         for item in self.model.colors:
-            rgb, name = item
-            clr = cms.hexcolor_to_rgb(rgb)
-            skp_model.colors.append([COLOR_RGB, clr, 1.0, name])
+            skp_model.colors.append(soc_item2color(item))
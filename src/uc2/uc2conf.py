@@ -60,14 +60,6 @@ class UCData:
         if not fsutils.exists(self.app_color_profile_dir):
             fsutils.makedirs(self.app_color_profile_dir)
 
-        from uc2.cms import libcms
-
-        for item in uc2const.COLORSPACES + [uc2const.COLOR_DISPLAY, ]:
-            filename = 'built-in_%s.icm' % item
-            path = os.path.join(self.app_color_profile_dir, filename)
-            if not fsutils.exists(path):
-                libcms.cms_save_default_profile(path, item)
-
 
 class UCConfig(SerializedConfig):
     # ============== GENERIC SECTION ===================
@@ -100,6 +92,14 @@ class UCConfig(SerializedConfig):
     cms_proof_for_spot = False
     cms_bpc_flag = False
     cms_bpt_flag = False
+    cms_bitmap_workers = 1
+    cms_precision = uc2const.CMS_PRECISION_8
+    cms_transform_cache_size = 64
+    cms_devicelink_cache = False
+    cms_devicelink_cache_size = 256
+    # scan system ICC directories on start (see uc2.cms.catalog)
+    cms_profile_catalog = False
+    cms_catalog_profiles = []
 
     def __init__(self): pass
 
@@ -273,6 +273,8 @@ EXPERIMENTAL_LOADERS = [MD, RIFF, XML, ]
 MODEL_SAVERS = [SK2, SVG, SVGZ, PLT, PDF, CDR, CMX, CCX, SK1, SK, CGM, FIG, DST]
 BITMAP_SAVERS = [PNG, ]
 PALETTE_SAVERS = [SKP, GPL, SCRIBUS_PAL, SOC, CPL, COREL_PAL, ASE, ACO, JCW]
+# palette formats which don't store palette name, source and comments
+BARE_PALETTES = [ACO, JCW]
 EXPERIMENTAL_SAVERS = [MD, RIFF, XML, WMF, DST, ]
 
 PATTERN_FORMATS = [EPS, PNG, JPG, JP2, TIF, GIF, BMP, PCX, PPM, XBM, XPM]
@@ -584,6 +586,16 @@ TYPE_CMYK_8 = "CMYK"
 TYPE_GRAY_8 = "L"
 TYPE_YCbCr_8 = "YCCA"
 
+CMS_PRECISION_8 = 8
+CMS_PRECISION_16 = 16
+CMS_PRECISION_DBL = 64
+
+CMS_PRECISION_SUFFIX = {
+    CMS_PRECISION_8: '',
+    CMS_PRECISION_16: ';16',
+    CMS_PRECISION_DBL: ';DBL',
+}
+
 cmsFLAGS_NOTPRECALC = 0x0100
 cmsFLAGS_GAMUTCHECK = 0x1000
 cmsFLAGS_SOFTPROOFING = 0x4000
@@ -592,3 +604,4 @@ cmsFLAGS_PRESERVEBLACK = 0x8000
 cmsFLAGS_NULLTRANSFORM = 0x0200
 cmsFLAGS_HIGHRESPRECALC = 0x0400
 cmsFLAGS_LOWRESPRECALC = 0x0800
+cmsFLAGS_NOCACHE = 0x0040